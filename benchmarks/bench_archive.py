@@ -0,0 +1,60 @@
+"""
+Benchmark arsip halaman mentah (PageArchive): penulisan, rasio kompresi, baca mmap, dan replay penuh.
+
+Run pertama menulis semua halaman katalog sintetis; run-run berikutnya menulis
+ulang halaman yang sama sehingga hanya menambah baris index (deduplikasi).
+Replay memutar ulang parsing dan transform_data atas setiap run tanpa jaringan.
+
+Contoh:
+    python -m benchmarks.bench_archive
+    python -m benchmarks.bench_archive --pages 1000 --runs 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import build_catalog, synthetic_products
+from utils.archive import PageArchive, replay_runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark arsip halaman mentah dan replay.')
+    parser.add_argument('--pages', type=int, default=500, help='Jumlah halaman katalog sintetis.')
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3, help='Jumlah run yang diarsipkan.')
+    args = parser.parse_args()
+
+    catalog = build_catalog(synthetic_products(args.pages * args.per_page), per_page=args.per_page)
+    pages = [(f'http://bench.test/page{number}.html', html.encode('utf-8')) for number, html in sorted(catalog.items())]
+    raw_bytes = sum(len(content) for _, content in pages)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{len(pages)} halaman x {args.per_page} produk, {raw_bytes / 1e6:.1f} MB mentah per run")
+        for run in range(args.runs):
+            with PageArchive(directory, run_id=f'run-{run:03d}') as archive:
+                start = time.perf_counter()
+                for url, content in pages:
+                    archive.append(url, content, fetched_at=f'2025-05-{run + 1:02d} 10:00:00')
+                seconds = time.perf_counter() - start
+            print(f"tulis run {run}: {len(pages) / seconds:>10.0f} halaman/s "
+                  f"({archive.stats['deduplicated']} tidak berubah)")
+
+        stored = sum(os.path.getsize(os.path.join(directory, name))
+                     for name in os.listdir(directory) if name.endswith('.dat'))
+        print(f"segmen {stored / 1e6:.2f} MB untuk {args.runs} run, rasio {raw_bytes * args.runs / stored:.1f}x")
+
+        with PageArchive(directory) as archive:
+            start = time.perf_counter()
+            read_bytes = sum(len(content) for _, content in archive.iter_pages())
+            seconds = time.perf_counter() - start
+            print(f"baca mmap:   {read_bytes / 1e6 / seconds:>10.1f} MB/s")
+
+            start = time.perf_counter()
+            rows = sum(len(data) for _, data in replay_runs(archive, exchange_rate=16000))
+            seconds = time.perf_counter() - start
+            print(f"replay:      {len(pages) * args.runs / seconds:>10.0f} halaman/s ({rows} baris)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark tahap extract: scraping berurutan, thread pool, dan event loop httpx terhadap FixtureServer lokal.
+
+Server diberi latensi per response sehingga yang terukur adalah berapa banyak
+request yang bisa menunggu bersamaan. Kolom "server" menunjukkan jumlah request
+terbanyak yang benar-benar dilayani bersamaan, dan kolom "thread" jumlah thread
+client terbanyak selama scraping. Semua mode memakai discovery halaman terakhir
+(sekitar log2(halaman) request berurutan, halaman yang ditemukan dipakai ulang),
+sehingga pada latensi tinggi waktu discovery ikut terukur di setiap mode.
+
+Contoh:
+    python -m benchmarks.bench_async
+    python -m benchmarks.bench_async --pages 1000 --latency 0.1 --workers 4 16 --in-flight 100 300 500
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from benchmarks.fixture_server import FixtureServer
+from utils.async_extract import scrape_product_async
+from utils.extract import configure_session, scrape_product, scrape_product_concurrent
+
+
+# Thread milik FixtureServer (accept loop dan satu thread per request) tidak dihitung sebagai thread client
+SERVER_THREADS = ('(serve_forever)', '(process_request_thread)')
+
+
+class ThreadSampler:
+    """Mencatat jumlah thread client terbanyak di proses ini selama blok with berjalan."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.max_threads = 0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            threads = [thread for thread in threading.enumerate()
+                       if thread is not self._thread and not thread.name.endswith(SERVER_THREADS)]
+            self.max_threads = max(self.max_threads, len(threads))
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+
+def bench_mode(server, func, *args, **kwargs):
+    """Menjalankan satu mode scraping; mengembalikan produk, durasi, thread client, dan konkurensi server."""
+    server.stats['max_in_flight'] = 0
+    with ThreadSampler() as sampler:
+        start = time.perf_counter()
+        products = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+    return products, seconds, sampler.max_threads, server.stats['max_in_flight']
+
+
+def _without_timestamp(products):
+    return [dict(product, Timestamp=None) for product in products]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scraping berurutan, thread pool, dan async.')
+    parser.add_argument('--pages', type=int, default=500, help='Jumlah halaman katalog sintetis.')
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05, help='Jeda per response dalam detik.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[4, 16], help='Ukuran thread pool.')
+    parser.add_argument('--in-flight', type=int, nargs='+', default=[100, 300],
+                        help='Batas request bersamaan jalur async.')
+    parser.add_argument('--skip-sequential', action='store_true', help='Lewati scraping berurutan (lambat).')
+    args = parser.parse_args()
+
+    configure_session(backoff_factor=0.01)
+    with FixtureServer.synthetic(args.pages, args.per_page, latency=args.latency) as server:
+        modes = []
+        if not args.skip_sequential:
+            modes.append(('berurutan', scrape_product, {'delay': 0}))
+        for workers in args.workers:
+            modes.append((f'{workers} thread', scrape_product_concurrent,
+                          {'max_workers': workers, 'rate_limit': None, 'discover': True}))
+        for in_flight in args.in_flight:
+            modes.append((f'async {in_flight}',
+                          lambda *urls, **options: asyncio.run(scrape_product_async(*urls, **options)),
+                          {'max_in_flight': in_flight, 'discover': True}))
+
+        print(f"{args.pages} halaman x {args.per_page} produk, latensi {args.latency * 1000:.0f} ms")
+        print(f"{'mode':<14} {'detik':>8} {'halaman/s':>10} {'thread':>7} {'server':>7}")
+        expected = None
+        for name, func, options in modes:
+            products, seconds, threads, in_flight = bench_mode(server, func, server.base_url, server.page_url,
+                                                               **options)
+            # Setiap mode harus menghasilkan produk yang sama dengan urutan yang sama
+            if expected is None:
+                expected = _without_timestamp(products)
+            assert _without_timestamp(products) == expected, f"hasil mode {name} berbeda"
+            print(f"{name:<14} {seconds:>8.3f} {args.pages / seconds:>10.1f} {threads:>7} {in_flight:>7}")
+
+
+if __name__ == '__main__':
+    main()
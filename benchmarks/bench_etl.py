@@ -0,0 +1,251 @@
+"""
+Benchmark ETL lengkap secara offline: scraping dari FixtureServer lokal, transform, lalu setiap sink store_to_*.
+
+PostgreSQL diganti SQLite sementara kecuali --db-url diberikan (misal
+PostgreSQL lokal untuk mengukur jalur COPY), dan Google Sheets diganti service
+tiruan di memori sehingga yang terukur hanya penyusunan request di pipeline.
+Hasil ditulis ke JSON beserta commit git agar bisa dibandingkan antar commit.
+
+Contoh:
+    python -m benchmarks.bench_etl --output bench_baseline.json
+    python -m benchmarks.bench_etl --pages 200 --latency 0.02 --error-rate 0.05 --output bench_new.json \\
+        --compare bench_baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+from datetime import datetime
+from unittest import mock
+
+from benchmarks.fixture_server import FixtureServer
+from utils.extract import configure_session, scrape_product, scrape_product_concurrent
+from utils.load import (
+    PYARROW_AVAILABLE,
+    dispose_engines,
+    store_to_columnar,
+    store_to_csv,
+    store_to_google_sheets,
+    store_to_postgre,
+    store_to_postgre_upsert,
+)
+from utils.transform import compact_dtypes, transform_data, transform_to_DataFrame
+
+EXCHANGE_RATE = 16000
+
+
+class FakeSheetsRequest:
+    def __init__(self, result, latency):
+        self.result = result
+        self.latency = latency
+
+    def execute(self):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.result
+
+
+class FakeSheetsValues:
+    """Pengganti spreadsheets().values() yang menyimpan isi sheet di memori dan menghitung request."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.rows = []
+        self.requests = 0
+
+    def _request(self, result):
+        self.requests += 1
+        return FakeSheetsRequest(result, self.latency)
+
+    def get(self, spreadsheetId, range):
+        return self._request({'values': [list(row) for row in self.rows]})
+
+    def batchUpdate(self, spreadsheetId, body):
+        cells = 0
+        for entry in body['data']:
+            start = int(''.join(ch for ch in entry['range'].split('!')[-1] if ch.isdigit())) - 1
+            for offset, row in enumerate(entry['values']):
+                while len(self.rows) <= start + offset:
+                    self.rows.append([])
+                self.rows[start + offset] = list(row)
+                cells += len(row)
+        return self._request({'totalUpdatedCells': cells})
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        self.rows.extend(list(row) for row in body['values'])
+        return self._request({'updates': {'updatedCells': sum(len(row) for row in body['values'])}})
+
+    def batchClear(self, spreadsheetId, body):
+        return self._request({})
+
+
+def fake_sheets_service(values):
+    service = mock.MagicMock()
+    service.spreadsheets.return_value.values.return_value = values
+    return service
+
+
+def git_commit():
+    """Hash commit HEAD beserta penanda perubahan yang belum di-commit, None di luar repo git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_scrape(server, workers):
+    """Mengukur scrape_product (berurutan, tanpa jeda) dan scrape_product_concurrent terhadap server lokal."""
+    results = {}
+    products, seconds = timed(scrape_product, server.base_url, server.page_url, delay=0)
+    results['scrape_product'] = {'seconds': seconds, 'rows': len(products)}
+
+    products_concurrent, seconds = timed(scrape_product_concurrent, server.base_url, server.page_url,
+                                         max_workers=workers, rate_limit=None, discover=True)
+    results['scrape_product_concurrent'] = {'seconds': seconds, 'rows': len(products_concurrent), 'workers': workers}
+    return products, results
+
+
+def bench_transform(products):
+    """Mengukur transform_to_DataFrame, transform_data, dan compact_dtypes."""
+    results = {}
+    frame, seconds = timed(transform_to_DataFrame, products)
+    results['transform_to_DataFrame'] = {'seconds': seconds, 'rows': len(frame)}
+
+    transformed, seconds = timed(transform_data, frame, EXCHANGE_RATE)
+    results['transform_data'] = {'seconds': seconds, 'rows': len(transformed)}
+
+    compact, seconds = timed(compact_dtypes, transformed)
+    results['compact_dtypes'] = {'seconds': seconds, 'rows': len(compact)}
+    return compact, results
+
+
+def bench_sinks(data, workdir, db_url, sheets_latency=0.0):
+    """Mengukur setiap sink store_to_* ke tujuan lokal."""
+    results = {}
+
+    def record(name, func, *args, **kwargs):
+        result, seconds = timed(func, *args, **kwargs)
+        results[name] = {'seconds': seconds, 'rows': len(data), 'ok': result is not None}
+        return results[name]
+
+    record('store_to_postgre', store_to_postgre, data, db_url)
+    # Putaran pertama menyisipkan semua baris, putaran kedua hanya menemukan baris yang tidak berubah
+    record('store_to_postgre_upsert', store_to_postgre_upsert, data, db_url, table='fashionstudio_upsert')
+    record('store_to_postgre_upsert_unchanged', store_to_postgre_upsert, data, db_url, table='fashionstudio_upsert')
+    dispose_engines()
+
+    record('store_to_csv', store_to_csv, data, os.path.join(workdir, 'bench.csv'))
+
+    if PYARROW_AVAILABLE:
+        record('store_to_columnar_parquet', store_to_columnar, data, os.path.join(workdir, 'bench.parquet'))
+        record('store_to_columnar_feather', store_to_columnar, data, os.path.join(workdir, 'bench.feather'),
+               format='feather')
+
+    values = FakeSheetsValues(latency=sheets_latency)
+    with mock.patch('utils.load.get_sheets_service', return_value=fake_sheets_service(values)):
+        entry = record('store_to_google_sheets', store_to_google_sheets, data, 'bench', 'Sheet1!A1', 'bench.json')
+        entry['requests'] = values.requests
+        values.requests = 0
+        entry = record('store_to_google_sheets_diff', store_to_google_sheets, data, 'bench', 'Sheet1!A1',
+                       'bench.json', diff=True)
+        entry['requests'] = values.requests
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Mencetak perbandingan durasi per tahap terhadap hasil JSON sebelumnya; tahap yang melambat ditandai."""
+    print(f"\nDibanding {baseline.get('commit') or '?'}:")
+    print(f"{'tahap':<36} {'lama':>9} {'baru':>9} {'rasio':>7}")
+    regressions = 0
+    for stage, entry in results['stages'].items():
+        old = baseline.get('stages', {}).get(stage)
+        if old is None or not old.get('seconds'):
+            continue
+        ratio = entry['seconds'] / old['seconds']
+        flag = ''
+        if ratio > threshold:
+            flag = '  <-- lebih lambat'
+            regressions += 1
+        print(f"{stage:<36} {old['seconds']:>9.4f} {entry['seconds']:>9.4f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ETL offline dengan server katalog lokal.')
+    parser.add_argument('--pages', type=int, default=50, help='Jumlah halaman katalog.')
+    parser.add_argument('--per-page', type=int, default=20, help='Jumlah produk per halaman.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Jeda per response server dalam detik.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Peluang response 503 (0-1).')
+    parser.add_argument('--seed', type=int, default=0, help='Seed acak untuk error rate.')
+    parser.add_argument('--workers', type=int, default=8, help='Jumlah thread untuk scrape_product_concurrent.')
+    parser.add_argument('--db-url', default=None,
+                        help='URL database tujuan; default SQLite sementara sebagai pengganti PostgreSQL.')
+    parser.add_argument('--sheets-latency', type=float, default=0.0,
+                        help='Jeda tiruan per request Google Sheets dalam detik.')
+    parser.add_argument('--output', default=None, help='Path file JSON hasil benchmark.')
+    parser.add_argument('--compare', default=None, help='File JSON hasil sebelumnya sebagai pembanding.')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Rasio durasi yang dianggap regresi saat --compare.')
+    args = parser.parse_args()
+
+    # Benchmark harus bisa diulang: retry cepat supaya error rate tidak didominasi backoff
+    configure_session(backoff_factor=0.01)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_url = args.db_url or f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+        server = FixtureServer.synthetic(args.pages, args.per_page, latency=args.latency,
+                                         error_rate=args.error_rate, seed=args.seed)
+        with server:
+            products, stages = bench_scrape(server, args.workers)
+        data, transform_stages = bench_transform(products)
+        stages.update(transform_stages)
+        stages.update(bench_sinks(data, workdir, db_url, args.sheets_latency))
+
+    results = {
+        'commit': git_commit(),
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'config': {
+            'pages': args.pages,
+            'per_page': args.per_page,
+            'latency': args.latency,
+            'error_rate': args.error_rate,
+            'seed': args.seed,
+            'workers': args.workers,
+            'db': 'sqlite' if args.db_url is None else args.db_url.split(':', 1)[0],
+        },
+        'server': dict(server.stats),
+        'stages': stages,
+    }
+
+    print(f"{'tahap':<36} {'detik':>9} {'baris':>8}")
+    for stage, entry in stages.items():
+        status = '' if entry.get('ok', True) else '  GAGAL'
+        print(f"{stage:<36} {entry['seconds']:>9.4f} {entry['rows']:>8}{status}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nHasil ditulis ke {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        compare(results, baseline, args.threshold)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Mengukur waktu cold start import pipeline dengan laporan ala `python -X importtime`.
+
+Setiap skenario dijalankan di interpreter baru. Skenario "main" hanya
+meng-import main.py (backend sink dimuat saat dipakai), sedangkan
+"main + semua backend" ikut memuat SQLAlchemy, Google API client, dan pyarrow
+seperti run yang memakai semua sink, sehingga selisihnya menunjukkan waktu yang
+dihemat run yang tidak memakai sink tersebut.
+
+Contoh:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --repeat 10 --top 20 --output import_time.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modul backend yang di-import utils.load di dalam fungsi sink
+BACKEND_MODULES = [
+    'google.oauth2.service_account', 'googleapiclient.discovery', 'googleapiclient.errors',
+    'pyarrow', 'pyarrow.dataset', 'pyarrow.feather', 'pyarrow.parquet', 'sqlalchemy',
+]
+
+SCENARIOS = {
+    'main': 'import main',
+    'main + semua backend': 'import main\nimport ' + ', '.join(BACKEND_MODULES),
+}
+
+# Paket yang dilaporkan tersendiri bila ikut ter-import
+WATCHED = ('pandas', 'numpy', 'pyarrow', 'sqlalchemy', 'googleapiclient.discovery', 'google.oauth2.service_account',
+           'requests', 'bs4', 'lxml')
+
+
+def parse_importtime(stderr):
+    """
+    Membaca keluaran -X importtime menjadi {modul: (self_us, cumulative_us)} beserta total waktu import.
+
+    Total dihitung dari modul tingkat teratas (yang di-import langsung oleh skrip).
+    """
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        stripped = name.strip()
+        modules[stripped] = (int(self_us), int(cumulative_us))
+        # Indentasi nama modul menunjukkan kedalaman import; satu spasi berarti tingkat teratas
+        if len(name) - len(name.lstrip()) == 1:
+            total += int(cumulative_us)
+    return modules, total
+
+
+def run_scenario(code):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def bench_scenario(code, repeat):
+    """Median total import (ms) dari beberapa run beserta rincian modul dari run dengan total median."""
+    runs = sorted((run_scenario(code) for _ in range(repeat)), key=lambda run: run[1])
+    modules, _ = runs[len(runs) // 2]
+    return {
+        'median_ms': statistics.median(run[1] for run in runs) / 1000,
+        'min_ms': runs[0][1] / 1000,
+        'modules': modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Laporan waktu import (cold start) main.py.')
+    parser.add_argument('--repeat', type=int, default=5, help='Jumlah interpreter baru per skenario.')
+    parser.add_argument('--top', type=int, default=10, help='Jumlah modul terlama yang ditampilkan.')
+    parser.add_argument('--output', default=None, help='Path file JSON hasil pengukuran.')
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        result = bench_scenario(code, args.repeat)
+        results[name] = result
+        modules = result['modules']
+
+        print(f"\n== {name}: median {result['median_ms']:.1f} ms, min {result['min_ms']:.1f} ms ({args.repeat} run)")
+        print(f"{'paket':<32} {'kumulatif ms':>13}")
+        for package in WATCHED:
+            if package in modules:
+                print(f"{package:<32} {modules[package][1] / 1000:>13.1f}")
+            else:
+                print(f"{package:<32} {'-':>13}")
+
+        print(f"\n{'modul (self terlama)':<48} {'self ms':>9}")
+        for module, (self_us, _) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+            print(f"{module:<48} {self_us / 1000:>9.1f}")
+
+    lazy, eager = results['main'], results['main + semua backend']
+    print(f"\nBackend yang tidak dimuat menghemat {eager['median_ms'] - lazy['median_ms']:.1f} ms per run.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                name: {key: value for key, value in result.items() if key != 'modules'}
+                | {'watched_ms': {package: result['modules'][package][1] / 1000
+                                  for package in WATCHED if package in result['modules']}}
+                for name, result in results.items()
+            }, f, indent=2)
+        print(f"Hasil ditulis ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark backend parser halaman katalog.
+
+Selain kecepatan, hasil setiap backend dibandingkan dengan bs4 per halaman
+(tanpa Timestamp). Jalankan dengan --pages-dir berisi halaman asli yang
+tersimpan untuk memastikan lxml memberi hasil yang sama pada markup situs.
+
+Contoh:
+    python -m benchmarks.bench_parser
+    python -m benchmarks.bench_parser --pages-dir saved_pages --repeat 5
+"""
+import argparse
+import glob
+import os
+import time
+
+from benchmarks.fixtures import build_catalog, load_seed_products
+from utils.extract import PARSER_BACKENDS
+
+
+def load_pages(pages_dir=None, save_dir=None):
+    """Membaca halaman HTML tersimpan, atau membuatnya dari scraped_products_raw.csv bila tidak ada."""
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        return pages
+
+    catalog = build_catalog(load_seed_products(), per_page=20)
+    pages = [html.encode('utf-8') for _, html in sorted(catalog.items())]
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+        for page_number, content in enumerate(pages, start=1):
+            with open(os.path.join(save_dir, f'page{page_number}.html'), 'wb') as f:
+                f.write(content)
+    return pages
+
+
+def bench_backend(parse, pages, repeat=3):
+    """Mengukur waktu terbaik dari beberapa putaran parsing seluruh halaman."""
+    best = float('inf')
+    cards = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cards = sum(len(parse(content)[0]) for content in pages)
+        best = min(best, time.perf_counter() - start)
+    return {'seconds': best, 'pages_per_sec': len(pages) / best, 'cards_per_sec': cards / best, 'cards': cards}
+
+
+def _without_timestamp(products):
+    return [dict(product, Timestamp=None) for product in products]
+
+
+def count_mismatches(parse, reference, pages):
+    """Jumlah halaman yang hasil parse-nya berbeda dari parser referensi."""
+    return sum(
+        _without_timestamp(parse(content)[0]) != _without_timestamp(reference(content)[0]) for content in pages
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark backend parser halaman katalog.')
+    parser.add_argument('--pages-dir', help='Folder berisi halaman HTML tersimpan (*.html).')
+    parser.add_argument('--save-dir', help='Simpan halaman hasil render ke folder ini.')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.save_dir)
+    print(f"{len(pages)} halaman, {args.repeat} putaran per backend")
+    print(f"{'backend':<8} {'detik':>8} {'halaman/s':>10} {'kartu/s':>10}")
+
+    results = {name: bench_backend(parse, pages, args.repeat) for name, parse in PARSER_BACKENDS.items()}
+    for name, result in results.items():
+        print(f"{name:<8} {result['seconds']:>8.3f} {result['pages_per_sec']:>10.1f} {result['cards_per_sec']:>10.0f}")
+
+    if 'lxml' in results:
+        print(f"lxml {results['bs4']['seconds'] / results['lxml']['seconds']:.1f}x lebih cepat dari bs4")
+        mismatches = count_mismatches(PARSER_BACKENDS['lxml'], PARSER_BACKENDS['bs4'], pages)
+        print(f"hasil lxml berbeda dari bs4 di {mismatches} dari {len(pages)} halaman")
+
+
+if __name__ == '__main__':
+    main()
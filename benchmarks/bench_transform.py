@@ -0,0 +1,56 @@
+"""
+Benchmark transform_data pada data sintetis dengan scraped_products_raw.csv sebagai seed.
+
+Contoh:
+    python -m benchmarks.bench_transform
+    python -m benchmarks.bench_transform --sizes 1000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import SEED_CSV
+from utils.transform import transform_data
+
+
+def synthetic_frame(rows, seed_path=SEED_CSV):
+    """Mengulang data seed hingga sejumlah baris; judul diberi nomor agar baris tidak terhapus sebagai duplikat."""
+    seed = pd.read_csv(seed_path, dtype=str, keep_default_na=False)
+    repeats = -(-rows // len(seed))
+    frame = pd.concat([seed] * repeats, ignore_index=True).iloc[:rows].copy()
+    frame['Title'] = frame['Title'] + ' #' + pd.Series(np.arange(rows)).astype(str)
+    return frame
+
+
+def bench_transform(rows, repeat=1, exchange_rate=16000):
+    """Mengukur waktu terbaik transform_data untuk sejumlah baris."""
+    frame = synthetic_frame(rows)
+    best = float('inf')
+    output_rows = 0
+    for _ in range(repeat):
+        data = frame.copy()
+        start = time.perf_counter()
+        result = transform_data(data, exchange_rate)
+        best = min(best, time.perf_counter() - start)
+        output_rows = len(result)
+    return {'rows': rows, 'output_rows': output_rows, 'seconds': best, 'rows_per_sec': rows / best}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark transform_data.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'baris':>12} {'keluaran':>12} {'detik':>9} {'baris/s':>12}")
+    for rows in args.sizes:
+        # Ukuran besar cukup diukur sekali
+        repeat = args.repeat if rows <= 100_000 else 1
+        result = bench_transform(rows, repeat)
+        print(f"{result['rows']:>12,} {result['output_rows']:>12,} {result['seconds']:>9.3f} {result['rows_per_sec']:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
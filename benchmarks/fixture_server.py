@@ -0,0 +1,180 @@
+"""
+Server HTTP lokal yang menyajikan katalog tiruan dengan markup situs Fashion Studio.
+
+Contoh:
+    python -m benchmarks.fixture_server --pages 50 --port 8000 --latency 0.05 --error-rate 0.02
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import build_catalog, synthetic_products
+
+
+class _Server(ThreadingHTTPServer):
+    # Antrean listen besar agar ratusan koneksi async bersamaan tidak ditolak
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class FixtureServer:
+    """
+    Server katalog tiruan untuk benchmark dan test, berjalan di thread latar belakang.
+
+    Halaman 1 disajikan di '/', halaman berikutnya di '/page{N}.html'. Setiap
+    response membawa ETag dan menjawab 304 untuk If-None-Match yang cocok.
+    stats['max_in_flight'] mencatat jumlah request terbanyak yang dilayani bersamaan.
+
+    Args:
+        pages (dict): {nomor_halaman: html}.
+        latency (float): Jeda (detik) sebelum setiap response.
+        error_rate (float): Peluang response 503 untuk setiap request halaman.
+        unavailable (set): Nomor halaman yang selalu dijawab 503; boleh diubah saat server berjalan.
+        requests_log (list): Bila diberikan, path setiap request ditambahkan ke list ini.
+        seed (int): Seed acak untuk error_rate agar hasil benchmark bisa diulang.
+        port (int): Port lokal, 0 untuk port bebas.
+    """
+
+    def __init__(self, pages, latency=0.0, error_rate=0.0, unavailable=None, requests_log=None, seed=0, port=0):
+        self.pages = {number: html.encode("utf-8") for number, html in pages.items()}
+        self.etags = {number: '"%s"' % hashlib.md5(body).hexdigest() for number, body in self.pages.items()}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.unavailable = unavailable if unavailable is not None else set()
+        self.requests_log = requests_log
+        self.port = port
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @classmethod
+    def synthetic(cls, total_pages, per_page=20, **options):
+        """Server dengan total_pages halaman berisi produk sintetis (lihat benchmarks.fixtures)."""
+        catalog = build_catalog(synthetic_products(total_pages * per_page), per_page=per_page)
+        return cls(catalog, **options)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    @property
+    def page_url(self):
+        return self.base_url + "page{}.html"
+
+    def _page_number(self, path):
+        if path == "/":
+            return 1
+        if path.startswith("/page") and path.endswith(".html"):
+            try:
+                return int(path[len("/page"):-len(".html")])
+            except ValueError:
+                return 0
+        return 0
+
+    def _should_fail(self, page_number):
+        with self._lock:
+            self.stats["requests"] += 1
+            failed = page_number in self.unavailable or (
+                self.error_rate and self._random.random() < self.error_rate
+            )
+            if failed:
+                self.stats["errors"] += 1
+            return failed
+
+    def _make_handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fixture._lock:
+                    fixture._in_flight += 1
+                    fixture.stats["max_in_flight"] = max(fixture.stats["max_in_flight"], fixture._in_flight)
+                try:
+                    self._respond()
+                finally:
+                    with fixture._lock:
+                        fixture._in_flight -= 1
+
+            def _respond(self):
+                if fixture.requests_log is not None:
+                    fixture.requests_log.append(self.path)
+                page_number = fixture._page_number(self.path)
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+
+                if page_number not in fixture.pages:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if fixture._should_fail(page_number):
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                body = fixture.pages[page_number]
+                etag = fixture.etags[page_number]
+                if self.headers.get("If-None-Match") == etag:
+                    with fixture._lock:
+                        fixture.stats["not_modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = _Server(("127.0.0.1", self.port), self._make_handler())
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Server katalog tiruan untuk benchmark offline.')
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='Jeda per response dalam detik.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Peluang response 503 (0-1).')
+    args = parser.parse_args()
+
+    server = FixtureServer.synthetic(args.pages, args.per_page, latency=args.latency,
+                                     error_rate=args.error_rate, port=args.port).start()
+    print(f"Katalog {args.pages} halaman tersedia di {server.base_url} (Ctrl+C untuk berhenti)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
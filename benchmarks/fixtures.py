@@ -0,0 +1,103 @@
+import csv
+import os
+
+SEED_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_products_raw.csv')
+
+CARD_TEMPLATE = """
+<div class="collection-card">
+    <div style="position: relative;">
+        <img src="https://picsum.photos/280/350?random={index}" class="collection-image" alt="{title}">
+    </div>
+    <div class="product-details">
+        <h3 class="product-title">{title}</h3>
+        {price_html}
+        <p style="font-size: 14px; color: #777;">Rating: {rating}</p>
+        <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+        <p style="font-size: 14px; color: #777;">Size: {size}</p>
+        <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+    </div>
+</div>
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Fashion Studio</title>
+</head>
+<body>
+    <div class="container">
+        <div id="collectionList" class="collection-grid">{cards}</div>
+        <ul class="pagination">{pagination}</ul>
+    </div>
+</body>
+</html>
+"""
+
+
+def load_seed_products(path=SEED_CSV):
+    """Membaca data mentah hasil scraping sebagai seed katalog tiruan."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def synthetic_products(count, seed_products=None):
+    """Membuat sejumlah produk dengan mengulang seed; judul diberi nomor agar tetap unik."""
+    seed_products = seed_products or load_seed_products()
+    products = []
+    for i in range(count):
+        product = dict(seed_products[i % len(seed_products)])
+        if product['Title'] != 'Unknown Product':
+            product['Title'] = f"{product['Title'].rsplit(' ', 1)[0]} {i + 1}"
+        products.append(product)
+    return products
+
+
+def render_card(product, index=0):
+    """Membuat HTML satu kartu produk dengan markup situs Fashion Studio."""
+    price = product['Price']
+    if price.startswith('$'):
+        price_html = f'<div class="price-container"><span class="price">{price}</span></div>'
+    else:
+        price_html = f'<p class="price">{price}</p>'
+    return CARD_TEMPLATE.format(
+        index=index,
+        title=product['Title'],
+        price_html=price_html,
+        rating=product['Rating'],
+        colors=product['Colors'],
+        size=product['Size'],
+        gender=product['Gender'],
+    )
+
+
+def render_pagination(page_number, total_pages):
+    """Membuat widget pagination berisi tombol previous, nomor halaman di sekitar halaman aktif, dan next."""
+    items = []
+    if page_number > 1:
+        previous = '/' if page_number == 2 else f'/page{page_number - 1}.html'
+        items.append(f'<li class="page-item previous"><a class="page-link" href="{previous}">Previous</a></li>')
+    for number in range(max(1, page_number - 2), min(total_pages, page_number + 2) + 1):
+        href = '/' if number == 1 else f'/page{number}.html'
+        active = ' active' if number == page_number else ''
+        items.append(f'<li class="page-item{active}"><a class="page-link" href="{href}">{number}</a></li>')
+    if page_number < total_pages:
+        items.append(f'<li class="page-item next"><a class="page-link" href="/page{page_number + 1}.html">Next</a></li>')
+    return ''.join(items)
+
+
+def render_catalog_page(products, page_number, total_pages):
+    """Membuat HTML satu halaman katalog dari daftar produk halaman tersebut."""
+    cards = ''.join(render_card(product, index) for index, product in enumerate(products))
+    return PAGE_TEMPLATE.format(cards=cards, pagination=render_pagination(page_number, total_pages))
+
+
+def build_catalog(products, per_page=20):
+    """Membagi produk menjadi halaman katalog; hasilnya {nomor_halaman: html}."""
+    total_pages = max(1, -(-len(products) // per_page))
+    return {
+        page_number: render_catalog_page(
+            products[(page_number - 1) * per_page:page_number * per_page], page_number, total_pages
+        )
+        for page_number in range(1, total_pages + 1)
+    }
@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.fixtures import render_catalog_page
+
+
+def render_test_page(page_number, total_pages, products_per_page=3):
+    """Membuat halaman katalog tiruan berisi produk 'T-shirt N' dengan nomor berurutan."""
+    products = []
+    for i in range(products_per_page):
+        index = (page_number - 1) * products_per_page + i + 1
+        products.append({
+            "Title": f"T-shirt {index}",
+            "Price": f"${index * 10:.2f}",
+            "Rating": f"⭐ {(index % 5) + 0.5} / 5",
+            "Colors": str((index % 5) + 1),
+            "Size": "M",
+            "Gender": "Unisex",
+        })
+    return render_catalog_page(products, page_number, total_pages)
+
+
+@pytest.fixture
+def catalog_server():
+    """Menjalankan server HTTP lokal yang menyajikan katalog tiruan sebanyak total_pages halaman."""
+    servers = []
+
+    def start(total_pages=5, products_per_page=3, unavailable=None, requests_log=None):
+        # Halaman di dalam set unavailable dijawab 503; set boleh diubah selama test
+        pages = {
+            page_number: render_test_page(page_number, total_pages, products_per_page)
+            for page_number in range(1, total_pages + 1)
+        }
+        server = FixtureServer(pages, unavailable=unavailable, requests_log=requests_log).start()
+        servers.append(server)
+        return server.base_url, server.page_url
+
+    yield start
+
+    for server in servers:
+        server.stop()
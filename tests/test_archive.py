@@ -0,0 +1,193 @@
+import json
+import os
+import sqlite3
+import time
+
+import main
+from tests.conftest import render_test_page
+from utils.archive import PageArchive, replay_runs
+from utils.extract import iter_scrape_pages_concurrent, scrape_product_concurrent
+from utils.history import latest_snapshot, price_history, store_to_history
+from utils.load import dispose_engines
+from utils.parse_pool import ParsePool
+from utils.transform import transform_data, transform_to_DataFrame
+from utils.scheduler import CatalogJob
+
+
+def test_append_and_read_round_trip_compressed(tmp_path):
+    pages = {f'http://test/page{n}': render_test_page(n, 5).encode('utf-8') for n in range(1, 6)}
+    with PageArchive(str(tmp_path), run_id='run-1') as archive:
+        for url, content in pages.items():
+            archive.append(url, content, fetched_at='2025-05-20 10:00:00')
+
+    with PageArchive(str(tmp_path)) as archive:
+        restored = {entry['url']: content for entry, content in archive.iter_pages()}
+
+    assert restored == pages
+    raw = sum(len(content) for content in pages.values())
+    assert os.path.getsize(tmp_path / 'pages-2025-05.dat') < raw / 3
+
+
+def test_unchanged_pages_are_stored_once(tmp_path):
+    content = render_test_page(1, 1)
+    with PageArchive(str(tmp_path), run_id='run-1') as archive:
+        first = archive.append('http://test/', content)
+    size = os.path.getsize(tmp_path / first['segment'])
+
+    # Arsip yang dibuka ulang tetap mengenali blok yang sudah ada
+    with PageArchive(str(tmp_path), run_id='run-2') as archive:
+        second = archive.append('http://test/', content)
+        assert archive.stats == {'pages': 1, 'deduplicated': 1, 'raw_bytes': len(content.encode('utf-8')),
+                                 'stored_bytes': 0}
+
+    assert os.path.getsize(tmp_path / first['segment']) == size
+    assert (second['offset'], second['run']) == (first['offset'], 'run-2')
+    assert [entry['run'] for entry in PageArchive(str(tmp_path)).entries()] == ['run-1', 'run-2']
+
+
+def test_dedup_reads_block_index_instead_of_page_index(tmp_path, monkeypatch):
+    with PageArchive(str(tmp_path), run_id='run-1') as archive:
+        for n in range(1, 4):
+            archive.append(f'http://test/page{n}', render_test_page(n, 2))
+            archive.append(f'http://test/page{n}?again', render_test_page(n, 2))
+    assert len(open(tmp_path / PageArchive.BLOCKS_FILE).readlines()) == 3
+
+    monkeypatch.setattr(PageArchive, 'entries', lambda self, *args, **kwargs: iter(()))
+    with PageArchive(str(tmp_path), run_id='run-2') as archive:
+        archive.append('http://test/page2', render_test_page(2, 2))
+        assert archive.stats['deduplicated'] == 1
+
+
+def test_block_index_is_rebuilt_for_older_archives(tmp_path):
+    content = render_test_page(1, 1)
+    with PageArchive(str(tmp_path), run_id='run-1') as archive:
+        first = archive.append('http://test/', content)
+    os.remove(tmp_path / PageArchive.BLOCKS_FILE)
+
+    with PageArchive(str(tmp_path), run_id='run-2') as archive:
+        second = archive.append('http://test/', content)
+        assert archive.stats['deduplicated'] == 1
+
+    assert second['offset'] == first['offset']
+    assert os.path.exists(tmp_path / PageArchive.BLOCKS_FILE)
+
+
+def test_segments_are_monthly_and_entries_filter_by_time(tmp_path):
+    with PageArchive(str(tmp_path), run_id='r') as archive:
+        archive.append('http://test/a', 'a', fetched_at='2025-04-30 23:59:59')
+        archive.append('http://test/b', 'b', fetched_at='2025-05-01 00:00:00')
+        archive.append('http://test/c', 'c', fetched_at='2025-06-02 08:00:00')
+
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith('.dat')) == [
+        'pages-2025-04.dat', 'pages-2025-05.dat', 'pages-2025-06.dat',
+    ]
+    archive = PageArchive(str(tmp_path))
+    assert [entry['url'] for entry in archive.entries(since='2025-05', until='2025-06')] == ['http://test/b']
+
+
+def test_truncated_index_and_missing_blocks_are_skipped(tmp_path):
+    with PageArchive(str(tmp_path), run_id='r') as archive:
+        archive.append('http://test/a', 'halaman a', fetched_at='2025-05-20 10:00:00')
+        archive.append('http://test/b', 'halaman b', fetched_at='2025-05-20 10:00:01')
+
+    index = tmp_path / PageArchive.INDEX_FILE
+    lines = index.read_text(encoding='utf-8').splitlines()
+    # Baris index yang menunjuk blok di luar segmen, lalu baris terakhir yang terpotong
+    broken = dict(json.loads(lines[1]), url='http://test/hilang', offset=10 ** 6)
+    index.write_text('\n'.join(lines + [json.dumps(broken), lines[0][:20]]), encoding='utf-8')
+
+    with PageArchive(str(tmp_path)) as archive:
+        pages = [(entry['url'], content) for entry, content in archive.iter_pages()]
+
+    assert pages == [('http://test/a', b'halaman a'), ('http://test/b', b'halaman b')]
+
+
+def test_replay_runs_uses_current_rules_and_original_timestamps(tmp_path):
+    with PageArchive(str(tmp_path), run_id='2025-05-20 10:00:00') as archive:
+        archive.append('http://test/', render_test_page(1, 2), fetched_at='2025-05-20 10:00:01')
+        archive.append('http://test/page2.html', render_test_page(2, 2), fetched_at='2025-05-20 10:00:02')
+    with PageArchive(str(tmp_path), run_id='2025-05-21 10:00:00') as archive:
+        archive.append('http://test/', render_test_page(1, 1), fetched_at='2025-05-21 10:00:01')
+
+    with PageArchive(str(tmp_path)) as archive:
+        runs = list(replay_runs(archive, exchange_rate=15000))
+
+    assert [run_id for run_id, _ in runs] == ['2025-05-20 10:00:00', '2025-05-21 10:00:00']
+    first, second = runs[0][1], runs[1][1]
+    assert len(first) == 6 and len(second) == 3
+    assert first['Price'].iloc[0] == 150000.0
+    assert set(first['Timestamp'].astype(str)) == {'2025-05-20 10:00:01', '2025-05-20 10:00:02'}
+
+
+def test_scrape_archives_every_page(catalog_server, tmp_path):
+    base_url, page_url = catalog_server(total_pages=4)
+    with PageArchive(str(tmp_path), run_id='r') as archive:
+        products = scrape_product_concurrent(base_url, page_url, max_workers=2, rate_limit=None, archive=archive)
+
+    with PageArchive(str(tmp_path)) as archive:
+        urls = sorted(entry['url'] for entry in archive.entries())
+        runs = list(replay_runs(archive, exchange_rate=16000))
+
+    assert urls == sorted([base_url] + [page_url.format(n) for n in range(2, 5)])
+    assert len(products) == 12 and len(runs[0][1]) == 12
+
+
+def test_default_run_ids_are_unique_within_a_second(tmp_path):
+    run_ids = []
+    for run in range(3):
+        with PageArchive(str(tmp_path)) as archive:
+            archive.append('http://test/', render_test_page(1, 1, products_per_page=run + 1),
+                           fetched_at='2025-05-20 10:00:00')
+            run_ids.append(archive.run_id)
+
+    with PageArchive(str(tmp_path)) as archive:
+        runs = list(replay_runs(archive, exchange_rate=16000))
+
+    assert len(set(run_ids)) == 3
+    assert [run_id for run_id, _ in runs] == run_ids
+    assert [len(data) for _, data in runs] == [1, 2, 3]
+
+
+def test_replay_matches_live_timestamps_with_busy_consumer(catalog_server, tmp_path):
+    base_url, page_url = catalog_server(total_pages=3)
+    db_url = f"sqlite:///{tmp_path / 'history.db'}"
+    products = []
+    # Halaman 2 dan 3 sudah diparsing di thread fetch saat konsumen masih sibuk dengan halaman 1
+    with ParsePool(workers=1) as pool, PageArchive(str(tmp_path / 'archive')) as archive:
+        for page in iter_scrape_pages_concurrent(base_url, page_url, max_workers=3, rate_limit=None,
+                                                 parse_pool=pool, archive=archive):
+            products.extend(page)
+            time.sleep(1.1 if len(products) == 3 else 0)
+
+    try:
+        store_to_history(transform_data(transform_to_DataFrame(products), 16000), db_url)
+        with PageArchive(str(tmp_path / 'archive')) as archive:
+            entries = list(archive.entries())
+            for _, data in replay_runs(archive, exchange_rate=16000):
+                store_to_history(data, db_url, replace=True)
+    finally:
+        dispose_engines()
+
+    assert [product['Timestamp'] for product in products[::3]] == [entry['fetched_at'] for entry in entries]
+    # Replay menimpa observasi run asli, tidak menambah titik history baru
+    with sqlite3.connect(tmp_path / 'history.db') as conn:
+        assert conn.execute('SELECT COUNT(*) FROM observations').fetchone()[0] == 9
+
+
+def test_main_replay_overwrites_history(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'history.db'}"
+    job = CatalogJob('site', 'http://test/', 'http://test/page{}.html', db_url=db_url,
+                     archive_dir=str(tmp_path / 'archive'))
+    with PageArchive(job.archive_dir, run_id='2025-05-20 10:00:00') as archive:
+        archive.append(job.base_url, render_test_page(1, 1), fetched_at='2025-05-20 10:00:01')
+
+    try:
+        assert main.main_replay([job]) == 0
+        snapshot = latest_snapshot(db_url)
+        assert len(snapshot) == 3
+        assert set(snapshot['Timestamp'].astype(str)) == {'2025-05-20 10:00:01'}
+        # Replay kedua menimpa observasi yang sama, bukan menambah baris
+        assert main.main_replay([job]) == 0
+        assert price_history('T-shirt 1', db_url)['Price'].tolist() == [160000.0]
+    finally:
+        dispose_engines()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from benchmarks.fixture_server import FixtureServer
+from utils.async_extract import aiter_scrape_pages, create_async_client, fetching_content_async, scrape_product_async
+from utils.cache import PageCache
+from utils.checkpoint import ScrapeCheckpoint
+from utils.extract import SESSION_CONFIG, configure_session, scrape_product
+from utils.ratelimit import AdaptiveRateLimiter
+
+
+@pytest.fixture
+def fast_retries():
+    # Backoff singkat agar halaman 503 cepat diulang atau dianggap gagal
+    configure_session(backoff_factor=0.01)
+    yield
+    configure_session(backoff_factor=SESSION_CONFIG["backoff_factor"])
+
+
+def _without_timestamp(products):
+    return [{k: v for k, v in p.items() if k != "Timestamp"} for p in products]
+
+
+def _fetch(url, **kwargs):
+    async def run():
+        async with create_async_client() as client:
+            return await fetching_content_async(url, client, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_scrape_product_async_matches_sequential(catalog_server):
+    base_url, page_url = catalog_server(total_pages=7, products_per_page=3)
+
+    sequential = scrape_product(base_url, page_url, delay=0)
+    data = asyncio.run(scrape_product_async(base_url, page_url, max_in_flight=4))
+
+    assert len(data) == 21
+    assert _without_timestamp(data) == _without_timestamp(sequential)
+
+
+def test_scrape_product_async_with_discovery_stops_at_last_page(catalog_server):
+    requests_log = []
+    base_url, page_url = catalog_server(total_pages=9, products_per_page=2, requests_log=requests_log)
+
+    data = asyncio.run(scrape_product_async(base_url, page_url, max_in_flight=50, discover=True))
+
+    assert [product["Title"] for product in data] == [f"T-shirt {i}" for i in range(1, 19)]
+    # Setelah discovery jendela tidak menjadwalkan halaman melewati halaman terakhir
+    assert "/page10.html" not in requests_log[-9:]
+
+
+def test_scrape_product_async_holds_many_requests_on_one_thread():
+    pages = 150
+    with FixtureServer.synthetic(pages, per_page=2, latency=0.3) as server:
+        threads_before = {thread.ident for thread in threading.enumerate()}
+        client_threads = []
+
+        async def scrape():
+            task = asyncio.ensure_future(scrape_product_async(server.base_url, server.page_url, max_in_flight=200))
+            await asyncio.sleep(0.15)
+            client_threads.extend(thread for thread in threading.enumerate()
+                                  if thread.ident not in threads_before and "process_request_thread" not in thread.name)
+            return await task
+
+        data = asyncio.run(scrape())
+
+    assert len(data) == pages * 2
+    # Seluruh halaman (dan halaman spekulatif sesudahnya) diminta bersamaan dari satu thread
+    assert server.stats["max_in_flight"] >= pages
+    assert client_threads == []
+
+
+def test_scrape_product_async_stops_on_failed_page(catalog_server, fast_retries):
+    base_url, page_url = catalog_server(total_pages=5, products_per_page=2, unavailable={3})
+
+    data = asyncio.run(scrape_product_async(base_url, page_url, max_in_flight=4))
+
+    assert [product["Title"] for product in data] == ["T-shirt 1", "T-shirt 2", "T-shirt 3", "T-shirt 4"]
+
+
+def test_fetching_content_async_retries_unavailable_page(catalog_server, fast_retries):
+    unavailable = {2}
+    requests_log = []
+    _, page_url = catalog_server(total_pages=3, unavailable=unavailable, requests_log=requests_log)
+
+    # Halaman tetap 503: dicoba ulang sebanyak konfigurasi retries lalu menyerah
+    assert _fetch(page_url.format(2)) is None
+    assert len(requests_log) == SESSION_CONFIG["retries"] + 1
+
+    unavailable.clear()
+    assert b"T-shirt 4" in _fetch(page_url.format(2))
+
+
+def test_fetching_content_async_revalidates_cached_page(catalog_server, tmp_path):
+    _, page_url = catalog_server(total_pages=2)
+    cache = PageCache(str(tmp_path / "cache"))
+    limiter = AdaptiveRateLimiter(rate=None)
+
+    first = _fetch(page_url.format(2), cache=cache, limiter=limiter)
+    second = _fetch(page_url.format(2), cache=cache, limiter=limiter)
+
+    assert first == second
+    assert cache.stats["hits"] == 1
+    assert limiter.stats()["requests"] == 2
+
+
+def test_fetching_content_async_refetches_when_cached_body_is_gone(catalog_server, tmp_path):
+    requests_log = []
+    _, page_url = catalog_server(total_pages=2, requests_log=requests_log)
+    cache = PageCache(str(tmp_path / "cache"))
+    first = _fetch(page_url.format(2), cache=cache)
+
+    # Body terhapus setelah conditional header dibuat: 304 diulang sebagai GET biasa
+    os.remove(cache._path(page_url.format(2), ".html"))
+
+    assert _fetch(page_url.format(2), cache=cache) == first
+    assert len(requests_log) == 3
+    assert cache.stats["hits"] == 0
+
+
+def test_async_scrape_resumes_from_checkpoint(catalog_server, tmp_path, fast_retries):
+    unavailable = {4}
+    base_url, page_url = catalog_server(total_pages=6, products_per_page=2, unavailable=unavailable)
+    path = str(tmp_path / "checkpoint.jsonl")
+
+    checkpoint = ScrapeCheckpoint(path, base_url)
+    partial = asyncio.run(scrape_product_async(base_url, page_url, max_in_flight=3, checkpoint=checkpoint))
+    checkpoint.close()
+    assert len(partial) == 6
+    assert not checkpoint.complete
+
+    unavailable.clear()
+    resumed = ScrapeCheckpoint(path, base_url, resume=True)
+    data = asyncio.run(scrape_product_async(base_url, page_url, max_in_flight=3, checkpoint=resumed))
+
+    assert [product["Title"] for product in data] == [f"T-shirt {i}" for i in range(1, 13)]
+    assert resumed.complete
+    resumed.close()
+
+
+def test_aiter_scrape_pages_yields_pages_in_order(catalog_server):
+    base_url, page_url = catalog_server(total_pages=4, products_per_page=1)
+
+    async def collect():
+        return [[p["Title"] for p in products] async for products in aiter_scrape_pages(base_url, page_url)]
+
+    assert asyncio.run(collect()) == [["T-shirt 1"], ["T-shirt 2"], ["T-shirt 3"], ["T-shirt 4"]]
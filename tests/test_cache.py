@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+
+from utils.cache import PageCache
+from utils.extract import fetching_content, scrape_product
+
+
+def test_second_run_is_served_from_cache(catalog_server, tmp_path):
+    base_url, page_url = catalog_server(total_pages=4)
+
+    first_cache = PageCache(str(tmp_path))
+    first = scrape_product(base_url, page_url, delay=0, cache=first_cache)
+    first_cache.save()
+    assert first_cache.stats["misses"] == 4
+    assert first_cache.stats["hits"] == 0
+
+    # Run berikutnya memakai index yang sudah tersimpan di disk
+    second_cache = PageCache(str(tmp_path))
+    second = scrape_product(base_url, page_url, delay=0, cache=second_cache)
+
+    assert second_cache.stats["hits"] == 4
+    assert second_cache.stats["parse_skipped"] == 4
+    assert second_cache.stats["misses"] == 0
+    assert [p["Title"] for p in second] == [p["Title"] for p in first]
+
+
+def test_conditional_headers_use_stored_validators(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.store("http://mocksite.com/", b"<html></html>", etag='"abc"', last_modified="Tue, 20 May 2025 07:00:00 GMT")
+
+    headers = cache.conditional_headers("http://mocksite.com/")
+
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Tue, 20 May 2025 07:00:00 GMT"
+    assert cache.conditional_headers("http://mocksite.com/page2.html") == {}
+
+
+def test_unchanged_content_skips_parsing(tmp_path):
+    cache = PageCache(str(tmp_path))
+    url = "http://mocksite.com/"
+    content = b"<html>same</html>"
+    products = [{"Title": "T-shirt 1", "Timestamp": "2025-05-20 14:57:43"}]
+
+    cache.store(url, content)
+    cache.store_parsed(url, content, products, True)
+    # Server tanpa validator mengirim body yang sama
+    cache.store(url, content)
+
+    parsed_products, has_next = cache.get_parsed(url, content)
+    assert cache.stats["unchanged"] == 1
+    assert parsed_products[0]["Title"] == "T-shirt 1"
+    assert has_next is True
+    assert cache.get_parsed(url, b"<html>changed</html>") is None
+
+
+def test_lru_eviction_respects_max_bytes(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=250)
+    cache.store("http://mocksite.com/page1.html", b"a" * 100)
+    cache.store("http://mocksite.com/page2.html", b"b" * 100)
+    # Akses page1 agar page2 menjadi entri yang paling lama tidak dipakai
+    cache.revalidated("http://mocksite.com/page1.html")
+    cache.store("http://mocksite.com/page3.html", b"c" * 100)
+
+    assert "http://mocksite.com/page2.html" not in cache.entries
+    assert "http://mocksite.com/page1.html" in cache.entries
+    assert cache.stats["evictions"] == 1
+    assert cache.total_bytes <= 250
+
+
+def test_rewriting_parsed_result_does_not_grow_size(tmp_path):
+    cache = PageCache(str(tmp_path))
+    url = "http://mocksite.com/"
+    content = b"<html>same</html>"
+    products = [{"Title": "T-shirt 1", "Timestamp": "2025-05-20 14:57:43"}]
+
+    cache.store(url, content)
+    cache.store_parsed(url, content, products, True)
+    size = cache.total_bytes
+    for _ in range(3):
+        cache.store_parsed(url, content, products, True)
+
+    assert cache.total_bytes == size
+
+
+def test_not_modified_after_eviction_falls_back_to_full_get(tmp_path):
+    cache = PageCache(str(tmp_path))
+    url = "http://mocksite.com/"
+    cache.store(url, b"<html>old</html>", etag='"v1"')
+
+    def get(url, headers=None, timeout=None):
+        if headers:
+            # Entri dibuang oleh thread lain sebelum jawaban 304 tiba
+            cache.entries.clear()
+            return MagicMock(status_code=304)
+        return MagicMock(status_code=200, content=b"<html>new</html>", headers={"ETag": '"v2"'})
+
+    session = MagicMock()
+    session.get.side_effect = get
+
+    assert fetching_content(url, session=session, cache=cache) == b"<html>new</html>"
+    assert session.get.call_count == 2
+    assert cache.conditional_headers(url) == {"If-None-Match": '"v2"'}
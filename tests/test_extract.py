@@ -2,7 +2,20 @@ import pytest
 from bs4 import BeautifulSoup
 from unittest.mock import patch, Mock
 
-from utils.extract import extract_product_data, fetching_content, scrape_product
+from utils.extract import (
+    SESSION_CONFIG,
+    close_session,
+    configure_session,
+    connection_stats,
+    create_session,
+    discover_last_page,
+    extract_product_data,
+    fetching_content,
+    iter_scrape_pages,
+    pagination_numbers,
+    scrape_product,
+    scrape_product_concurrent,
+)
 
 
 def test_extract_product_data():
@@ -32,7 +45,7 @@ def test_extract_product_data():
     assert result["Gender"] == "Women"
 
 
-@patch("utils.extract.requests.Session")
+@patch("utils.extract.get_session")
 def test_fetching_content(mock_session):
     # Setup response
     mock_response = Mock()
@@ -76,4 +89,159 @@ def test_scrape_product(mock_fetching_content):
     data = scrape_product(base_url, page_url)
 
     assert len(data) == 1
-    assert data[0]["Title"] == "T-shirt 2"
\ No newline at end of file
+    assert data[0]["Title"] == "T-shirt 2"
+
+
+def _without_timestamp(products):
+    return [{k: v for k, v in p.items() if k != "Timestamp"} for p in products]
+
+
+def test_scrape_product_concurrent_matches_sequential(catalog_server):
+    base_url, page_url = catalog_server(total_pages=7, products_per_page=3)
+
+    sequential = scrape_product(base_url, page_url, delay=0)
+    concurrent = scrape_product_concurrent(base_url, page_url, max_workers=4, rate_limit=None)
+
+    assert len(concurrent) == 21
+    # Urutan hasil harus tetap sesuai nomor halaman
+    assert _without_timestamp(concurrent) == _without_timestamp(sequential)
+    assert concurrent[0]["Title"] == "T-shirt 1"
+    assert concurrent[-1]["Title"] == "T-shirt 21"
+
+
+@patch("utils.extract.fetching_content")
+def test_scrape_product_concurrent_stops_on_failed_page(mock_fetching_content):
+    html_with_next = """
+    <div class="collection-card"><h3 class="product-title">Jacket</h3></div>
+    <li class="next"><a href="#">Next</a></li>
+    """
+    pages = {
+        "http://mocksite.com/": html_with_next,
+        "http://mocksite.com/page2.html": html_with_next,
+    }
+    mock_fetching_content.side_effect = lambda url, **kwargs: pages.get(url)
+
+    data = scrape_product_concurrent(
+        "http://mocksite.com/", "http://mocksite.com/page{}.html", max_workers=3, rate_limit=None
+    )
+
+    # Halaman 3 gagal diambil, jadi hanya data halaman 1 dan 2 yang dikembalikan
+    assert len(data) == 2
+
+
+def test_fetching_content_reuses_pooled_connection(catalog_server):
+    base_url, page_url = catalog_server(total_pages=3)
+    session = create_session(pool_size=2, retries=0)
+
+    for page_number in (2, 3):
+        assert fetching_content(page_url.format(page_number), session=session)
+    assert fetching_content(base_url, session=session)
+
+    stats = connection_stats(session)
+    session.close()
+
+    assert stats["requests"] == 3
+    assert stats["new"] == 1
+    assert stats["reused"] == 2
+
+
+def test_create_session_mounts_retry_adapter():
+    session = create_session(pool_size=4, retries=5, backoff_factor=1)
+    adapter = session.get_adapter("https://fashion-studio.dicoding.dev/")
+
+    assert adapter.max_retries.total == 5
+    assert 429 in adapter.max_retries.status_forcelist
+    assert adapter._pool_maxsize == 4
+    assert "gzip" in session.headers["Accept-Encoding"]
+    session.close()
+
+
+def test_configure_session_rejects_unknown_option():
+    with pytest.raises(ValueError):
+        configure_session(pool_sizes=3)
+    close_session()
+
+
+def test_iter_scrape_pages_yields_each_page(catalog_server):
+    base_url, page_url = catalog_server(total_pages=3, products_per_page=2)
+
+    pages = iter_scrape_pages(base_url, page_url, delay=0)
+    first_page = next(pages)
+
+    # Halaman pertama tersedia sebelum halaman berikutnya diambil
+    assert [p["Title"] for p in first_page] == ["T-shirt 1", "T-shirt 2"]
+    assert [len(products) for products in pages] == [2, 2]
+
+
+@pytest.mark.parametrize("total_pages", [1, 2, 3, 7, 16, 50])
+def test_discover_last_page(catalog_server, total_pages):
+    requests_log = []
+    base_url, page_url = catalog_server(total_pages=total_pages, products_per_page=1, requests_log=requests_log)
+
+    assert discover_last_page(base_url, page_url) == total_pages
+    # Probing eksponensial + binary search, bukan penelusuran halaman satu per satu
+    assert len(requests_log) <= 2 + 2 * max(1, total_pages).bit_length()
+
+
+def test_discover_last_page_fails_when_probe_is_inconclusive(catalog_server):
+    base_url, page_url = catalog_server(total_pages=10, products_per_page=1, unavailable={6})
+    configure_session(retries=0)
+    try:
+        assert discover_last_page(base_url, page_url) is None
+    finally:
+        configure_session(retries=SESSION_CONFIG["retries"])
+
+
+def test_pagination_numbers_follow_url_template():
+    html = '<a href="/">1</a><a href="/page2.html">2</a><a href="https://x.test/page13.html">Next</a>'
+    assert pagination_numbers(html, "https://x.test/page{}.html") == {2, 13}
+    assert pagination_numbers(html.encode("utf-8"), "https://x.test/p-{}.htm") == set()
+
+
+def test_concurrent_scrape_with_discovery_skips_speculative_requests(catalog_server):
+    def beyond_last_page(requests_log):
+        return sorted(path for path in requests_log if path != "/" and int(path[5:-5]) > 9)
+
+    probe_log = []
+    base_url, page_url = catalog_server(total_pages=9, products_per_page=2, requests_log=probe_log)
+    discover_last_page(base_url, page_url)
+
+    requests_log = []
+    base_url, page_url = catalog_server(total_pages=9, products_per_page=2, requests_log=requests_log)
+    data = scrape_product_concurrent(base_url, page_url, max_workers=4, rate_limit=None, discover=True)
+
+    assert [product["Title"] for product in data] == [f"T-shirt {i}" for i in range(1, 19)]
+    # Setelah halaman terakhir hanya ada request probe dari discovery, tanpa request spekulatif
+    assert beyond_last_page(requests_log) == beyond_last_page(probe_log)
+
+
+@pytest.mark.parametrize("total_pages", [1, 3, 12])
+def test_concurrent_scrape_reuses_discovered_pages(catalog_server, total_pages):
+    requests_log = []
+    base_url, page_url = catalog_server(total_pages=total_pages, products_per_page=1, requests_log=requests_log)
+
+    data = scrape_product_concurrent(base_url, page_url, max_workers=4, rate_limit=None, discover=True)
+
+    assert len(data) == total_pages
+    # Halaman yang diambil discovery tidak diminta ulang; katalog ini berakhir tepat di halaman probe
+    assert sorted(requests_log) == sorted(set(requests_log))
+    assert len(requests_log) == total_pages
+
+
+def test_concurrent_scrape_falls_back_to_next_walk_when_discovery_fails(catalog_server):
+    base_url, page_url = catalog_server(total_pages=4, products_per_page=1)
+
+    with patch("utils.extract.discover_last_page", return_value=None):
+        data = scrape_product_concurrent(base_url, page_url, max_workers=2, rate_limit=None, discover=True)
+
+    assert len(data) == 4
+
+
+def test_concurrent_scrape_continues_past_stale_discovery(catalog_server):
+    base_url, page_url = catalog_server(total_pages=6, products_per_page=1)
+
+    # Discovery melaporkan katalog lebih pendek, tombol next tetap diikuti
+    with patch("utils.extract.discover_last_page", return_value=3):
+        data = scrape_product_concurrent(base_url, page_url, max_workers=2, rate_limit=None, discover=True)
+
+    assert len(data) == 6
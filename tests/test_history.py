@@ -0,0 +1,107 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utils.history import latest_snapshot, normalize_key, price_history, store_to_history
+from utils.load import dispose_engines
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / 'history.sqlite'
+    yield path, f"sqlite:///{path}"
+    dispose_engines()
+
+
+def _catalog(prices, timestamp, titles=None):
+    titles = titles or [f"T-shirt {i}" for i in range(1, len(prices) + 1)]
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': prices,
+        'Rating': [4.5] * len(prices),
+        'Colors': [3] * len(prices),
+        'Size': ['M'] * len(prices),
+        'Gender': ['Men'] * len(prices),
+        'Timestamp': [timestamp] * len(prices),
+    })
+
+
+def test_normalize_key():
+    assert normalize_key('  T-Shirt   2 ') == normalize_key('t-shirt 2') == 't-shirt 2'
+    assert normalize_key(None) == ''
+
+
+def test_runs_accumulate_observations_per_product(db):
+    _, url = db
+    assert store_to_history(_catalog([100.0, 200.0], '2025-05-20 10:00:00'), url) == 2
+    assert store_to_history(_catalog([110.0, 200.0], '2025-05-21 10:00:00'), url) == 2
+
+    history = price_history('T-shirt 1', url)
+    assert history['Price'].tolist() == [100.0, 110.0]
+    assert history['Timestamp'].tolist() == [pd.Timestamp('2025-05-20 10:00:00'), pd.Timestamp('2025-05-21 10:00:00')]
+
+
+def test_rerun_with_same_timestamp_is_ignored(db):
+    _, url = db
+    catalog = _catalog([100.0, 200.0], '2025-05-20 10:00:00')
+    store_to_history(catalog, url)
+
+    assert store_to_history(catalog, url) == 0
+    assert len(price_history('T-shirt 2', url)) == 1
+
+
+def test_identity_is_normalized(db):
+    _, url = db
+    store_to_history(_catalog([100.0], '2025-05-20 10:00:00', titles=['T-shirt 1']), url)
+    store_to_history(_catalog([120.0], '2025-05-21 10:00:00', titles=['t-shirt  1']), url)
+
+    assert price_history('T-SHIRT 1', url)['Price'].tolist() == [100.0, 120.0]
+    assert len(latest_snapshot(url)) == 1
+
+
+def test_latest_snapshot_returns_newest_observation(db):
+    _, url = db
+    store_to_history(_catalog([100.0, 200.0], '2025-05-21 10:00:00'), url)
+    # Data lama yang dimuat belakangan tidak menggeser snapshot terbaru
+    store_to_history(_catalog([90.0, 190.0, 50.0], '2025-05-19 10:00:00'), url)
+
+    snapshot = latest_snapshot(url)
+    assert snapshot['Title'].tolist() == ['T-shirt 1', 'T-shirt 2', 'T-shirt 3']
+    assert snapshot['Price'].tolist() == [100.0, 200.0, 50.0]
+    assert list(snapshot.columns) == ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp']
+
+
+def test_replace_overwrites_existing_observations(db):
+    _, url = db
+    store_to_history(_catalog([100.0, 200.0], '2025-05-21 10:00:00'), url)
+
+    assert store_to_history(_catalog([105.0, 200.0], '2025-05-21 10:00:00'), url, replace=True) == 2
+    assert price_history('T-shirt 1', url)['Price'].tolist() == [105.0]
+
+
+def test_backfill_moves_first_seen_back(db):
+    path, url = db
+    store_to_history(_catalog([100.0], '2025-05-21 10:00:00'), url)
+    store_to_history(_catalog([90.0], '2025-05-01 10:00:00'), url)
+
+    with sqlite3.connect(path) as conn:
+        first_seen, last_seen = conn.execute("SELECT first_seen, last_seen FROM products").fetchone()
+    assert (first_seen, last_seen) == ('2025-05-01 10:00:00', '2025-05-21 10:00:00')
+
+
+def test_queries_use_indexes(db):
+    path, url = db
+    store_to_history(_catalog([100.0, 200.0], '2025-05-20 10:00:00'), url)
+
+    with sqlite3.connect(path) as conn:
+        plan = ' '.join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT o.price FROM products p JOIN observations o ON o.product_id = p.product_id "
+            "WHERE p.title_key = 't-shirt 1' ORDER BY o.observed_at"
+        ))
+    assert 'products_identity' in plan
+    assert 'SCAN o' not in plan
+
+
+def test_store_to_history_error_returns_none():
+    assert store_to_history(_catalog([100.0], '2025-05-20 10:00:00'), 'invalid://url') is None
@@ -0,0 +1,76 @@
+import pandas as pd
+
+import main
+from utils.incremental import commit_state, detect_changes, fingerprint_rows
+
+
+def _catalog(prices, titles=None, timestamp='2025-05-20 14:57:43'):
+    titles = titles or [f"T-shirt {i}" for i in range(1, len(prices) + 1)]
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': prices,
+        'Rating': [4.5] * len(prices),
+        'Colors': [3] * len(prices),
+        'Size': ['M'] * len(prices),
+        'Gender': ['Men'] * len(prices),
+        'Timestamp': [timestamp] * len(prices),
+    })
+
+
+def test_first_run_marks_everything_new(tmp_path):
+    changes = detect_changes(_catalog([100.0, 200.0]), str(tmp_path / 'state.sqlite'))
+
+    assert changes.summary() == {'new': 2, 'changed': 0, 'removed': 0, 'unchanged': 0}
+    assert len(changes.upserts) == 2
+
+
+def test_only_churn_is_reported_after_commit(tmp_path):
+    state_path = str(tmp_path / 'state.sqlite')
+    commit_state(detect_changes(_catalog([100.0, 200.0, 300.0]), state_path), state_path)
+
+    # Harga T-shirt 2 berubah, T-shirt 3 hilang, T-shirt 4 baru; Timestamp berbeda diabaikan
+    current = _catalog([100.0, 250.0, 400.0], titles=['T-shirt 1', 'T-shirt 2', 'T-shirt 4'], timestamp='later')
+    changes = detect_changes(current, state_path)
+
+    assert changes.summary() == {'new': 1, 'changed': 1, 'removed': 1, 'unchanged': 1}
+    assert changes.new['Title'].tolist() == ['T-shirt 4']
+    assert changes.changed['Title'].tolist() == ['T-shirt 2']
+    assert changes.removed.to_dict('records') == [{'Title': 'T-shirt 3', 'Size': 'M', 'Gender': 'Men'}]
+
+    commit_state(changes, state_path)
+    assert detect_changes(current, state_path).is_empty
+
+
+def test_mass_removal_is_ignored_as_partial_scrape(tmp_path):
+    state_path = str(tmp_path / 'state.sqlite')
+    commit_state(detect_changes(_catalog([1.0, 2.0, 3.0, 4.0]), state_path), state_path)
+
+    changes = detect_changes(_catalog([1.0]), state_path)
+
+    assert changes.removed.empty
+    assert changes.is_empty
+
+
+def test_fingerprint_ignores_column_order_and_dtype():
+    data = _catalog([100.0])
+    reordered = data[list(reversed(data.columns))].astype({'Colors': 'int32'})
+
+    assert fingerprint_rows(data)['fingerprint'].tolist() == fingerprint_rows(reordered)['fingerprint'].tolist()
+
+
+def test_failing_non_critical_sink_does_not_block_state(tmp_path):
+    state_path = str(tmp_path / 'state.sqlite')
+    # Google Sheets gagal karena file kredensial tidak ada, CSV berhasil
+    job = main.CatalogJob('site', 'http://test/', '', csv_file=str(tmp_path / 'out.csv'), spreadsheet_id='sheet',
+                          creds_path=str(tmp_path / 'missing.json'), state_path=state_path)
+    current = _catalog([100.0, 200.0])
+
+    results = main.store_changes(current, critical_sinks=('csv',), job=job)
+
+    assert {report['name']: report['status'] for report in results} == {'csv': 'ok', 'google_sheets': 'failed'}
+    assert detect_changes(current, state_path).is_empty
+
+    # Sink kritis yang gagal tetap menahan state
+    changed = _catalog([100.0, 250.0])
+    main.store_changes(changed, critical_sinks=('google_sheets',), job=job)
+    assert detect_changes(changed, state_path).summary()['changed'] == 1
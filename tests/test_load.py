@@ -1,8 +1,34 @@
+import os
+import subprocess
+import sys
+
 import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock
 
-from utils.load import store_to_postgre, store_to_csv, store_to_google_sheets
+import httplib2
+from googleapiclient.errors import HttpError
+from sqlalchemy import create_engine
+
+from utils.transform import compact_dtypes
+
+from utils.load import (
+    clear_sheets_services,
+    delete_from_postgre,
+    dispose_engines,
+    engine_pool_stats,
+    get_engine,
+    get_sheets_service,
+    pooled_connection,
+    read_columnar,
+    store_to_columnar,
+    store_to_postgre,
+    store_to_postgre_upsert,
+    store_to_csv,
+    store_to_google_sheets,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 df_sample = pd.DataFrame({
     'name': ['T-shirt', 'Jacket'],
@@ -10,45 +36,348 @@ df_sample = pd.DataFrame({
     'rating': [4.5, 4.8]
 })
 
+
+@pytest.fixture(autouse=True)
+def clean_engine_registry():
+    # Engine dan service Sheets (termasuk mock) tidak boleh terbawa antar test
+    dispose_engines()
+    clear_sheets_services()
+    yield
+    dispose_engines()
+    clear_sheets_services()
+
+
+class FakeRequest:
+    def __init__(self, func):
+        self.func = func
+
+    def execute(self):
+        return self.func()
+
+
+class FakeSheetsValues:
+    """Tiruan spreadsheets().values() yang menyimpan grid 'Sheet1' mulai dari A1."""
+
+    def __init__(self, grid=None, failures=0):
+        self.grid = [list(row) for row in grid or []]
+        self.failures = failures
+        self.batch_updates = []
+        self.cleared = []
+
+    def _row(self, a1):
+        return int(''.join(ch for ch in a1.split('!')[-1].split(':')[0] if ch.isdigit()))
+
+    def get(self, spreadsheetId, range):
+        return FakeRequest(lambda: {'values': [list(row) for row in self.grid]})
+
+    def batchUpdate(self, spreadsheetId, body):
+        def execute():
+            if self.failures:
+                self.failures -= 1
+                raise HttpError(httplib2.Response({'status': '429'}), b'Rate limit')
+            self.batch_updates.append(body['data'])
+            cells = 0
+            for entry in body['data']:
+                start = self._row(entry['range']) - 1
+                for offset, row in enumerate(entry['values']):
+                    while len(self.grid) <= start + offset:
+                        self.grid.append([])
+                    self.grid[start + offset] = list(row)
+                    cells += len(row)
+            return {'totalUpdatedCells': cells}
+        return FakeRequest(execute)
+
+    def batchClear(self, spreadsheetId, body):
+        def execute():
+            self.cleared.extend(body['ranges'])
+            del self.grid[self._row(body['ranges'][0]) - 1:]
+            return {}
+        return FakeRequest(execute)
+
+
+def fake_service(values):
+    service = MagicMock()
+    service.spreadsheets.return_value.values.return_value = values
+    return service
+
+
 def test_store_to_postgre_success():
-    with patch('utils.load.create_engine') as mock_engine, \
+    with patch('sqlalchemy.create_engine') as mock_engine, \
          patch.object(df_sample, 'to_sql') as mock_to_sql:  # Mock to_sql method dari DataFrame
          
         mock_conn = MagicMock()
         mock_engine.return_value.connect.return_value.__enter__.return_value = mock_conn
+        mock_engine.return_value.pool.checkedout.return_value = 0
         
         store_to_postgre(df_sample, 'postgresql://dummy_url')
         
         mock_to_sql.assert_called_once()
+    dispose_engines()
 
 def test_store_to_postgre_error():
-    with patch('utils.load.create_engine', side_effect=Exception("DB error")):
+    with patch('sqlalchemy.create_engine', side_effect=Exception("DB error")):
         store_to_postgre(df_sample, 'postgresql://invalid_url')
 
+def _products(titles, prices, timestamp):
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': prices,
+        'Rating': [4.5] * len(titles),
+        'Colors': [3] * len(titles),
+        'Size': ['M'] * len(titles),
+        'Gender': ['Men'] * len(titles),
+        'Timestamp': [timestamp] * len(titles),
+    })
+
+
+def test_store_to_postgre_upsert_inserts_then_updates(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+
+    first = store_to_postgre_upsert(_products(['T-shirt', 'Jacket'], [20000.0, 35000.0], 't1'), db_url)
+    second = store_to_postgre_upsert(
+        _products(['T-shirt', 'Jacket', 'Hoodie'], [20000.0, 40000.0, 50000.0], 't2'), db_url
+    )
+
+    assert first == {'inserted': 2, 'updated': 0, 'unchanged': 0}
+    assert second == {'inserted': 1, 'updated': 1, 'unchanged': 1}
+
+    stored = pd.read_sql('SELECT * FROM fashionstudio ORDER BY "Title"', create_engine(db_url))
+    # Tidak ada duplikat katalog, harga dan Timestamp mengikuti run terakhir
+    assert stored['Title'].tolist() == ['Hoodie', 'Jacket', 'T-shirt']
+    assert stored.loc[stored['Title'] == 'Jacket', 'Price'].item() == 40000.0
+    assert set(stored['Timestamp']) == {'t2'}
+
+
+def test_store_to_postgre_upsert_accepts_compact_frame(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'products.db'}"
+    data = _products(['T-shirt', 'Jacket'], [20000.0, 35000.0], '2026-10-18 09:00:00')
+    compact = compact_dtypes(data)
+
+    assert store_to_postgre_upsert(compact, db_url) == {'inserted': 2, 'updated': 0, 'unchanged': 0}
+    # Frame compact dan frame biasa dengan nilai sama dianggap tidak berubah
+    assert store_to_postgre_upsert(data, db_url) == {'inserted': 0, 'updated': 0, 'unchanged': 2}
+
+    stored = pd.read_sql('SELECT * FROM fashionstudio', create_engine(db_url))
+    assert set(stored['Timestamp']) == {'2026-10-18 09:00:00'}
+
+
+def test_store_to_postgre_upsert_keeps_last_duplicate_key(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+
+    result = store_to_postgre_upsert(_products(['T-shirt', 'T-shirt'], [1.0, 2.0], 't1'), db_url)
+
+    assert result == {'inserted': 1, 'updated': 0, 'unchanged': 0}
+    stored = pd.read_sql('SELECT * FROM fashionstudio', create_engine(db_url))
+    assert stored['Price'].tolist() == [2.0]
+
+
+def test_store_to_postgre_upsert_deduplicates_legacy_appended_table(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+    engine = create_engine(db_url)
+    # Tabel dari loader append lama berisi salinan katalog setiap run, plus tabel permanen bernama *_staging
+    pd.concat([_products(['T-shirt', 'Jacket'], [1.0, 2.0], 't1'),
+               _products(['T-shirt', 'Jacket'], [1.5, 2.0], 't2')]).to_sql('fashionstudio', engine, index=False)
+    _products(['Hat'], [9.0], 't0').to_sql('fashionstudio_staging', engine, index=False)
+
+    first = store_to_postgre_upsert(_products(['T-shirt', 'Jacket'], [1.5, 2.0], 't3'), db_url)
+    second = store_to_postgre_upsert(_products(['T-shirt', 'Jacket'], [1.5, 2.5], 't4'), db_url)
+
+    assert first == {'inserted': 0, 'updated': 0, 'unchanged': 2}
+    assert second == {'inserted': 0, 'updated': 1, 'unchanged': 1}
+    stored = pd.read_sql('SELECT * FROM fashionstudio ORDER BY "Title"', engine)
+    assert stored['Price'].tolist() == [2.5, 1.5]
+    assert pd.read_sql('SELECT "Title" FROM fashionstudio_staging', engine)['Title'].tolist() == ['Hat']
+
+
+def test_store_to_postgre_upsert_error():
+    with patch('sqlalchemy.create_engine', side_effect=Exception("DB error")):
+        assert store_to_postgre_upsert(df_sample, 'postgresql://invalid_url') is None
+
+
+def test_delete_from_postgre_removes_by_natural_key(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+    store_to_postgre_upsert(_products(['T-shirt', 'Jacket'], [1.0, 2.0], 't1'), db_url)
+
+    deleted = delete_from_postgre(pd.DataFrame({'Title': ['Jacket'], 'Size': ['M'], 'Gender': ['Men']}), db_url)
+
+    assert deleted == 1
+    stored = pd.read_sql('SELECT "Title" FROM fashionstudio', create_engine(db_url))
+    assert stored['Title'].tolist() == ['T-shirt']
+
+
+def test_get_engine_reuses_pooled_engine(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+
+    engine = get_engine(db_url, pool_size=2)
+
+    assert get_engine(db_url) is engine
+    assert engine.pool.size() == 2
+    assert engine.pool._pre_ping is True
+
+
+def test_get_engine_in_memory_sqlite_without_pool_sizing():
+    engine = get_engine("sqlite://")
+    with pooled_connection("sqlite://") as conn:
+        assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+    assert get_engine("sqlite://") is engine
+
+
+def test_dispose_engines_skips_engine_in_use(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+
+    with pooled_connection(db_url) as conn:
+        engine = get_engine(db_url)
+        dispose_engines()
+        # Koneksi yang masih dipinjam tetap bisa dipakai
+        assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+        assert get_engine(db_url) is engine
+
+    dispose_engines()
+    assert get_engine(db_url) is not engine
+
+
+def test_pooled_connection_records_checkout_stats(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+
+    for _ in range(3):
+        store_to_postgre_upsert(_products(['T-shirt'], [1.0], 't1'), db_url)
+
+    stats = next(iter(engine_pool_stats().values()))
+    assert stats['checkouts'] == 3
+    assert stats['max_wait_seconds'] >= 0
+    assert stats['checkedout'] == 0
+
+
+def test_dispose_engines_clears_registry(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'fashion.db'}"
+    engine = get_engine(db_url)
+
+    dispose_engines()
+
+    assert engine_pool_stats() == {}
+    assert get_engine(db_url) is not engine
+
+
 def test_store_to_csv_success(tmp_path):
     file_path = tmp_path / "test.csv"
-    store_to_csv(df_sample, file_path)
+    assert store_to_csv(df_sample, file_path) == file_path
     
     # Validasi hasil file
     df_loaded = pd.read_csv(file_path)
     assert df_loaded.equals(df_sample)
 
 
+def test_store_to_csv_append(tmp_path):
+    file_path = tmp_path / "test.csv"
+    store_to_csv(df_sample.iloc[:1], file_path, append=True)
+    store_to_csv(df_sample.iloc[1:], file_path, append=True)
+
+    # Header hanya ditulis sekali
+    df_loaded = pd.read_csv(file_path)
+    assert df_loaded.equals(df_sample)
+
+
 def test_store_to_csv_error(monkeypatch):
     def raise_error(*args, **kwargs):
         raise Exception("CSV error")
 
     monkeypatch.setattr("pandas.DataFrame.to_csv", raise_error)
-    store_to_csv(df_sample, "fake.csv")
+    assert store_to_csv(df_sample, "fake.csv") is None
+
+
+def test_store_to_csv_interrupted_write_keeps_previous_file(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "test.csv")
+    store_to_csv(df_sample, file_path)
+    original = open(file_path).read()
+
+    def write_partially(self, path, *args, **kwargs):
+        with open(path, 'a') as f:
+            f.write("T-shirt 9,10")
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr("pandas.DataFrame.to_csv", write_partially)
+    assert store_to_csv(df_sample, file_path, append=True) is None
+    assert store_to_csv(df_sample, file_path) is None
+
+    assert open(file_path).read() == original
+    assert os.listdir(tmp_path) == ["test.csv"]
+
+
+def _products_frame():
+    return pd.DataFrame({
+        'Title': ['T-shirt 1', 'Jacket 2', 'Pants 3'],
+        'Price': [160000.0, 320000.0, 480000.0],
+        'Rating': [4.5, 3.8, 4.9],
+        'Colors': [3, 5, 8],
+        'Size': ['M', 'L', 'M'],
+        'Gender': ['Men', 'Women', 'Unisex'],
+        'Timestamp': ['2026-10-17 10:00:00', '2026-10-18 09:00:00', '2026-10-18 09:00:01'],
+    })
+
+
+@pytest.mark.parametrize("file_format, compression", [
+    ('parquet', 'zstd'), ('parquet', 'snappy'), ('feather', 'zstd'), ('feather', 'none'),
+])
+def test_store_to_columnar_roundtrip_with_schema(tmp_path, file_format, compression):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"products.{file_format}")
+
+    assert store_to_columnar(_products_frame(), path, file_format, compression) == path
+
+    loaded = read_columnar(path, file_format)
+    assert loaded['Price'].dtype == 'float64'
+    assert loaded['Colors'].dtype == 'int64'
+    assert isinstance(loaded['Size'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(loaded['Timestamp'])
+    assert loaded['Title'].tolist() == ['T-shirt 1', 'Jacket 2', 'Pants 3']
+
+
+def test_store_to_columnar_accepts_compact_frame(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "products.parquet")
+
+    assert store_to_columnar(compact_dtypes(_products_frame(), float32_rating=True), path) == path
+
+    loaded = read_columnar(path)
+    assert loaded['Title'].tolist() == ['T-shirt 1', 'Jacket 2', 'Pants 3']
+    assert loaded['Rating'].dtype == 'float32'
+    assert loaded['Colors'].tolist() == [3, 5, 8]
+
+
+def test_store_to_columnar_partitions_by_scrape_date(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "dataset")
+    data = _products_frame()
+
+    store_to_columnar(data, path, partition_by_date=True)
+    assert sorted(p.name for p in (tmp_path / "dataset").iterdir()) == [
+        'scrape_date=2026-10-17', 'scrape_date=2026-10-18'
+    ]
+
+    # Append menambah file ke partisi yang ada
+    store_to_columnar(data.iloc[2:], path, partition_by_date=True, append=True)
+    assert len(read_columnar(path)) == 4
+
+    # Tanpa append, hanya partisi tanggal yang ditulis yang diganti
+    store_to_columnar(data.iloc[1:2], path, partition_by_date=True)
+    loaded = read_columnar(path).sort_values('Title')
+    assert loaded['Title'].tolist() == ['Jacket 2', 'T-shirt 1']
+    assert sorted(loaded['scrape_date'].astype(str)) == ['2026-10-17', '2026-10-18']
+
 
+def test_store_to_columnar_rejects_invalid_options(tmp_path):
+    pytest.importorskip("pyarrow")
+    assert store_to_columnar(_products_frame(), str(tmp_path / "x.feather"), 'feather', 'snappy') is None
+    assert store_to_columnar(_products_frame(), str(tmp_path / "x.parquet"), append=True) is None
 
-@patch("utils.load.service_account.Credentials")
-@patch("utils.load.build")
+
+@patch("google.oauth2.service_account.Credentials")
+@patch("googleapiclient.discovery.build")
 def test_store_to_google_sheets_success(mock_build, mock_creds):
     mock_service = MagicMock()
     mock_build.return_value = mock_service
-    mock_service.spreadsheets.return_value.values.return_value.update.return_value.execute.return_value = {
-        'updatedCells': 6
+    mock_service.spreadsheets.return_value.values.return_value.batchUpdate.return_value.execute.return_value = {
+        'totalUpdatedCells': 9
     }
 
     store_to_google_sheets(
@@ -62,7 +391,86 @@ def test_store_to_google_sheets_success(mock_build, mock_creds):
     mock_creds.from_service_account_file.assert_called_once()
 
 
-@patch("utils.load.service_account.Credentials.from_service_account_file", side_effect=Exception("Auth error"))
+@patch("google.oauth2.service_account.Credentials")
+@patch("googleapiclient.discovery.build")
+def test_store_to_google_sheets_append(mock_build, mock_creds):
+    mock_service = MagicMock()
+    mock_build.return_value = mock_service
+    values = mock_service.spreadsheets.return_value.values.return_value
+    values.append.return_value.execute.return_value = {'updates': {'updatedCells': 6}}
+
+    store_to_google_sheets(df_sample, "spreadsheet123", "Sheet1!A1", "fake.json", append=True)
+
+    body = values.append.call_args.kwargs['body']
+    # Mode append tidak mengirim baris header
+    assert body['values'][0] == ['T-shirt', '20000', '4.5']
+    values.batchUpdate.assert_not_called()
+
+
+@patch("google.oauth2.service_account.Credentials")
+@patch("googleapiclient.discovery.build")
+def test_get_sheets_service_built_once_per_creds(mock_build, mock_creds):
+    assert get_sheets_service("fake.json") is get_sheets_service("fake.json")
+    mock_build.assert_called_once()
+    mock_creds.from_service_account_file.assert_called_once()
+
+
+def test_store_to_google_sheets_batches_rows():
+    values = FakeSheetsValues()
+    data = pd.DataFrame({'name': [f'P{i}' for i in range(5)], 'price': range(5)})
+
+    with patch("utils.load.get_sheets_service", return_value=fake_service(values)):
+        store_to_google_sheets(data, "spreadsheet123", "Sheet1!A1", "fake.json", batch_rows=2)
+
+    # Header + 5 baris dibagi menjadi request berisi paling banyak 2 baris
+    assert [sum(len(entry['values']) for entry in batch) for batch in values.batch_updates] == [2, 2, 2]
+    assert values.grid[0] == ['name', 'price']
+    assert values.grid[5] == ['P4', '4']
+
+
+def test_store_to_google_sheets_diff_writes_only_changed_rows():
+    values = FakeSheetsValues([
+        ['name', 'price', 'rating'],
+        ['T-shirt', '20000', '4.5'],
+        ['Jacket', '30000', '4.8'],
+        ['Hat', '10000', '4.0'],
+    ])
+
+    with patch("utils.load.get_sheets_service", return_value=fake_service(values)):
+        store_to_google_sheets(df_sample, "spreadsheet123", "Sheet1!A1", "fake.json", diff=True)
+
+    assert values.batch_updates == [[{'range': 'Sheet1!A3', 'values': [['Jacket', '35000', '4.8']]}]]
+    # Baris lama di bawah data baru dikosongkan
+    assert values.cleared == ['Sheet1!A4:C']
+    assert values.grid == [
+        ['name', 'price', 'rating'],
+        ['T-shirt', '20000', '4.5'],
+        ['Jacket', '35000', '4.8'],
+    ]
+
+
+def test_store_to_google_sheets_diff_without_changes_writes_nothing():
+    values = FakeSheetsValues([['name', 'price', 'rating'], ['T-shirt', '20000', '4.5'], ['Jacket', '35000', '4.8']])
+
+    with patch("utils.load.get_sheets_service", return_value=fake_service(values)):
+        store_to_google_sheets(df_sample, "spreadsheet123", "Sheet1!A1", "fake.json", diff=True)
+
+    assert values.batch_updates == []
+    assert values.cleared == []
+
+
+def test_store_to_google_sheets_retries_rate_limit():
+    values = FakeSheetsValues(failures=2)
+
+    with patch("utils.load.get_sheets_service", return_value=fake_service(values)), \
+         patch("utils.load.time.sleep") as mock_sleep:
+        store_to_google_sheets(df_sample, "spreadsheet123", "Sheet1!A1", "fake.json")
+
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [1.0, 2.0]
+    assert len(values.batch_updates) == 1
+
+
+@patch("google.oauth2.service_account.Credentials.from_service_account_file", side_effect=Exception("Auth error"))
 def test_store_to_google_sheets_error(mock_creds):
     with pytest.raises(Exception) as exc_info:
         store_to_google_sheets(
@@ -72,4 +480,15 @@ def test_store_to_google_sheets_error(mock_creds):
             creds_path="wrong.json"
         )
     # Opsional: cek pesan error
-    assert "Auth error" in str(exc_info.value)
\ No newline at end of file
+    assert "Auth error" in str(exc_info.value)
+
+def test_import_main_does_not_load_sink_backends():
+    # Interpreter baru karena test lain di sesi ini sudah meng-import backend-nya
+    code = (
+        "import sys, main\n"
+        "print(','.join(m for m in ('sqlalchemy', 'googleapiclient.discovery', 'google.oauth2.service_account')"
+        " if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
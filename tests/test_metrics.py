@@ -0,0 +1,39 @@
+import json
+
+from utils.metrics import Metrics
+
+
+def test_timer_accumulates_per_stage():
+    metrics = Metrics()
+    with metrics.timer("fetch"):
+        pass
+    with metrics.timer("fetch"):
+        pass
+
+    timing = metrics.to_dict()["timings"]["fetch"]
+    assert timing["calls"] == 2
+    assert timing["seconds"] >= 0
+
+
+def test_timed_decorator_returns_result():
+    metrics = Metrics()
+
+    @metrics.timed("transform")
+    def double(x):
+        return x * 2
+
+    assert double(3) == 6
+    assert metrics.to_dict()["timings"]["transform"]["calls"] == 1
+
+
+def test_dump_json_writes_rows_and_values(tmp_path):
+    metrics = Metrics()
+    metrics.record_rows("rating", 10, 7)
+    metrics.set_value("cache", {"hits": 3})
+    path = tmp_path / "metrics.json"
+
+    metrics.dump_json(path)
+
+    data = json.loads(path.read_text())
+    assert data["rows"] == [{"step": "rating", "rows_in": 10, "rows_out": 7}]
+    assert data["values"]["cache"] == {"hits": 3}
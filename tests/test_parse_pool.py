@@ -0,0 +1,91 @@
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.fixtures import build_catalog, synthetic_products
+from utils.extract import parse_page, scrape_product_concurrent
+from utils.parse_pool import ParsePool, parse_page_columns, rows_from_columns
+
+
+CATALOG = build_catalog(synthetic_products(24), per_page=2)
+
+
+def _without_timestamp(products):
+    return [dict(product, Timestamp=None) for product in products]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ParsePool(workers=2) as parse_pool:
+        yield parse_pool
+
+
+def test_parse_page_columns_roundtrip():
+    content = CATALOG[1]
+
+    columns, has_next = parse_page_columns(content)
+    products, expected_next = parse_page(content)
+
+    assert has_next == expected_next
+    assert len(columns["Title"]) == 2
+    assert _without_timestamp(rows_from_columns(columns)) == _without_timestamp(products)
+
+
+def test_parse_pool_matches_in_process_parse(pool):
+    content = CATALOG[2].encode("utf-8")
+
+    products, has_next = pool.parse(content)
+    expected, expected_next = parse_page(content)
+
+    assert has_next == expected_next
+    assert _without_timestamp(products) == _without_timestamp(expected)
+
+
+def test_parse_pool_map_keeps_input_order(pool):
+    pages = [CATALOG[page] for page in sorted(CATALOG)]
+
+    results = list(pool.map(pages, chunksize=3))
+
+    expected = [parse_page(content) for content in pages]
+    assert [_without_timestamp(products) for products, _ in results] == [
+        _without_timestamp(products) for products, _ in expected
+    ]
+    assert [has_next for _, has_next in results] == [True] * 11 + [False]
+
+
+def test_parse_pool_reuses_worker_processes(pool):
+    executor = pool._executor
+    pids = {executor.submit(os.getpid).result() for _ in range(10)}
+
+    assert len(pids) <= 2
+
+
+def test_parse_pool_shared_by_many_threads(pool):
+    executor = pool._executor
+    content = CATALOG[3]
+    barrier = threading.Barrier(4)
+
+    def parse():
+        barrier.wait()
+        return pool.parse(content)
+
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        results = list(threads.map(lambda _: parse(), range(4)))
+
+    expected = _without_timestamp(parse_page(content)[0])
+    assert all(_without_timestamp(products) == expected for products, _ in results)
+    # Satu executor untuk semua thread, dan worker tidak di-fork dari proses berthread
+    assert pool._executor is executor
+    assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+
+
+def test_concurrent_scrape_with_parse_pool_matches_in_process(catalog_server, pool):
+    base_url, page_url = catalog_server(total_pages=6, products_per_page=3)
+
+    expected = scrape_product_concurrent(base_url, page_url, max_workers=3, rate_limit=None)
+    data = scrape_product_concurrent(base_url, page_url, max_workers=3, rate_limit=None, parse_pool=pool)
+
+    assert _without_timestamp(data) == _without_timestamp(expected)
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import patch
+
+from benchmarks.fixtures import build_catalog, load_seed_products
+from utils.extract import get_parser, parse_page_bs4
+
+pytest.importorskip("lxml")
+from utils.parser import parse_page_lxml  # noqa: E402
+
+FIXED_TIMESTAMP = "2025-05-20 14:57:43"
+
+
+def _parse_with_fixed_time(parse, content):
+    with patch("utils.extract.datetime") as mock_bs4_time, patch("utils.parser.datetime") as mock_lxml_time:
+        mock_bs4_time.now.return_value.strftime.return_value = FIXED_TIMESTAMP
+        mock_lxml_time.now.return_value.strftime.return_value = FIXED_TIMESTAMP
+        return parse(content)
+
+
+def test_lxml_backend_matches_bs4_on_catalog_pages():
+    catalog = build_catalog(load_seed_products(), per_page=20)
+
+    for html in catalog.values():
+        content = html.encode("utf-8")
+        assert _parse_with_fixed_time(parse_page_lxml, content) == _parse_with_fixed_time(parse_page_bs4, content)
+
+
+@pytest.mark.parametrize("card_html", [
+    # Harga tidak tersedia memakai <p class="price">
+    '<div class="collection-card"><h3 class="product-title">Unknown Product</h3>'
+    '<p class="price">Price Unavailable</p><p>Rating: Not Rated</p><p>5 Colors</p></div>',
+    # Field hilang dan teks bersarang
+    '<div class="collection-card extra"><div class="price-container"></div>'
+    '<p> Size: <b>XL</b> </p><p>Gender:<!-- x --> Men</p></div>',
+    # Entity dan spasi berlebih
+    '<div class="collection-card"><h3 class="product-title big">  Hoodie&amp;Co  </h3>'
+    '<div class="price-container"><span class="price sale"> $1,200.50 </span></div></div>',
+])
+def test_lxml_backend_matches_bs4_on_edge_cases(card_html):
+    content = f"<html><body>{card_html}<ul><li class='page-item next'>Next</li></ul></body></html>".encode("utf-8")
+
+    assert _parse_with_fixed_time(parse_page_lxml, content) == _parse_with_fixed_time(parse_page_bs4, content)
+
+
+@pytest.mark.parametrize("content", [
+    # Span harga tidak ditutup
+    b'<div class="collection-card"><h3 class="product-title">Tee</h3><div class="price-container">'
+    b'<span class="price">$10.00</div><p>Rating: 4.5</p></div>',
+    # Kartu terakhir tanpa penutup dan tag penutup tanpa pasangan
+    b'<div class="collection-card"><h3 class="product-title">Tee</h3></b></i><p>Size: L</p></span></div>'
+    b'<div class="collection-card"><h3 class="product-title">Pants</h3><p>Gender: Women</p>',
+    # Atribut tanpa kutip, entity tanpa titik koma, dan penutup berlebih
+    b'<div class="collection-card"><h3 class=product-title>Tee &amp Co</h3><p>Rating: 4.8 / 5</p>'
+    b'<p>Gender: Men</div></div></div>',
+    # Link halaman berikutnya yang <li> dan <a>-nya tidak ditutup
+    b'<html><body><div class="collection-card"><h3 class="product-title">Tee</h3></div>'
+    b'<ul><li class="page-item next"><a href="/page2">Next</ul>',
+])
+def test_lxml_backend_matches_bs4_on_malformed_markup(content):
+    assert _parse_with_fixed_time(parse_page_lxml, content) == _parse_with_fixed_time(parse_page_bs4, content)
+
+
+def test_lxml_backend_honours_declared_charset():
+    content = (
+        '<html><head><meta charset="iso-8859-1"></head><body><div class="collection-card">'
+        '<h3 class="product-title">Caf\xe9 Tee</h3></div></body></html>'
+    ).encode("latin-1")
+
+    lxml_products, _ = _parse_with_fixed_time(parse_page_lxml, content)
+
+    assert lxml_products[0]["Title"] == "Caf\xe9 Tee"
+    assert lxml_products == _parse_with_fixed_time(parse_page_bs4, content)[0]
+
+
+def test_lxml_backend_closes_unclosed_paragraphs_unlike_bs4():
+    # Perbedaan yang diketahui pada markup rusak (lihat docstring parse_page_lxml)
+    content = (b'<div class="collection-card"><h3 class="product-title">Tee</h3>'
+               b'<p>Size: M<p>Gender: Men</p></div>')
+
+    lxml_product = _parse_with_fixed_time(parse_page_lxml, content)[0][0]
+    bs4_product = _parse_with_fixed_time(parse_page_bs4, content)[0][0]
+
+    assert (lxml_product["Size"], lxml_product["Gender"]) == ("M", "Men")
+    assert (bs4_product["Size"], bs4_product["Gender"]) == ("MGender: Men", "Men")
+
+
+def test_lxml_backend_handles_empty_content():
+    assert parse_page_lxml(b"") == ([], False)
+
+
+def test_get_parser_defaults_to_bs4_and_lxml_is_opt_in():
+    assert get_parser() is parse_page_bs4
+    assert get_parser("auto") is parse_page_bs4
+    assert get_parser("lxml") is parse_page_lxml
+
+
+def test_get_parser_falls_back_to_bs4_without_lxml():
+    with patch("utils.extract.LXML_AVAILABLE", False):
+        assert get_parser("auto") is parse_page_bs4
+        assert get_parser("lxml") is parse_page_bs4
+
+
+def test_get_parser_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        get_parser("regex")
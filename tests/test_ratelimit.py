@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from utils.extract import SESSION_CONFIG, configure_session, scrape_product
+from utils.ratelimit import AdaptiveRateLimiter, parse_retry_after
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = AdaptiveRateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # 5 request pada 50 req/detik membutuhkan minimal 4 interval x 0.02 detik
+    assert time.monotonic() - start >= 0.08
+    assert limiter.stats()['throttled_seconds'] >= 0.07
+
+
+def test_rate_limiter_shared_between_threads():
+    limiter = AdaptiveRateLimiter(rate=100)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 0.05
+    assert limiter.stats()['requests'] == 6
+
+
+def test_rate_limiter_reserve_returns_wait_without_sleeping():
+    limiter = AdaptiveRateLimiter(rate=10)
+    start = time.monotonic()
+    waits = [limiter.reserve() for _ in range(3)]
+
+    # Token dipesan berurutan, tetapi reserve sendiri tidak pernah tidur
+    assert time.monotonic() - start < 0.05
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(0.1, abs=0.02)
+    assert waits[2] == pytest.approx(0.2, abs=0.02)
+
+
+def test_rate_limiter_speeds_up_when_healthy_and_backs_off_when_throttled():
+    limiter = AdaptiveRateLimiter(rate=2, max_rate=4, min_rate=1)
+    for _ in range(20):
+        limiter.record(0.05)
+    assert limiter.rate == 4
+
+    limiter.record(0.05, status=429)
+    assert limiter.rate == 2
+    limiter.record(0.05, throttled=True)
+    limiter.record(0.05, status=503)
+    assert limiter.rate == 1
+    assert limiter.stats()['backoffs'] == 3
+
+    limiter.record(5.0)
+    assert limiter.rate == 1
+
+
+def test_rate_limiter_slows_down_on_high_latency():
+    limiter = AdaptiveRateLimiter(rate=2, target_latency=0.5)
+    limiter.record(2.0)
+    assert limiter.rate == pytest.approx(1.6)
+
+
+def test_rate_limiter_honours_retry_after_without_rate_limit():
+    limiter = AdaptiveRateLimiter(rate=None)
+    limiter.acquire()
+    limiter.record(0.01, status=429, retry_after=0.1)
+
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+    assert limiter.rate is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_scrape_reports_throttled_pages_to_limiter(catalog_server):
+    unavailable = {2}
+    base_url, page_url = catalog_server(total_pages=3, products_per_page=1, unavailable=unavailable)
+    configure_session(retries=0)
+    try:
+        limiter = AdaptiveRateLimiter(rate=100)
+        data = scrape_product(base_url, page_url, limiter=limiter)
+    finally:
+        configure_session(retries=SESSION_CONFIG["retries"])
+
+    # Halaman 2 dijawab 503 sehingga scraping berhenti dan laju diturunkan
+    assert len(data) == 1
+    stats = limiter.stats()
+    assert stats['requests'] == 2
+    assert stats['backoffs'] == 1
+    assert limiter.rate < 100 * 1.1
@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import main
+from benchmarks.fixture_server import FixtureServer
+from utils.extract import scrape_product_concurrent
+from utils.scheduler import CatalogJob, load_jobs, run_jobs
+
+
+def _write_config(tmp_path, config):
+    path = tmp_path / 'jobs.json'
+    path.write_text(json.dumps(config), encoding='utf-8')
+    return str(path)
+
+
+def test_load_jobs_applies_defaults(tmp_path):
+    path = _write_config(tmp_path, {
+        'max_workers': 8,
+        'defaults': {'exchange_rate': 15000, 'concurrency': 2},
+        'jobs': [
+            {'name': 'a', 'base_url': 'http://a.test/', 'page_url': 'http://a.test/page{}.html'},
+            {'name': 'b', 'base_url': 'http://b.test/', 'page_url': 'http://b.test/p{}', 'concurrency': 6},
+        ],
+    })
+
+    jobs, options = load_jobs(path)
+
+    assert options == {'max_workers': 8, 'stagger': 0.0}
+    assert [(job.name, job.exchange_rate, job.concurrency) for job in jobs] == [('a', 15000, 2), ('b', 15000, 6)]
+    assert jobs[0].state_path == '.etl_state.a.sqlite'
+    assert jobs[1].checkpoint_path == '.scrape_checkpoint.b.jsonl'
+
+
+@pytest.mark.parametrize('config', [
+    {'jobs': []},
+    {'jobs': [{'name': 'a', 'base_url': 'x', 'page_url': 'y', 'workers': 3}]},
+    {'jobs': [{'name': 'a', 'base_url': 'x', 'page_url': 'y'}, {'name': 'a', 'base_url': 'z', 'page_url': 'w'}]},
+    {'job': []},
+])
+def test_load_jobs_rejects_invalid_config(tmp_path, config):
+    with pytest.raises(ValueError):
+        load_jobs(_write_config(tmp_path, config))
+
+
+@pytest.mark.parametrize('shared, tables, message', [
+    # Tabel upsert default 'fashionstudio' di database yang sama
+    ({'db_url': 'sqlite:///x.db'}, (None, None), 'table'),
+    # Tabel upsert berbeda, tetapi tabel history tetap satu per database
+    ({'db_url': 'sqlite:///x.db', 'history': True}, ('site_a', 'site_b'), 'history'),
+    ({'csv_file': 'data.csv'}, (None, None), 'csv_file'),
+    ({'spreadsheet_id': 'sheet'}, (None, None), 'google_sheets'),
+])
+def test_load_jobs_rejects_shared_destinations(tmp_path, shared, tables, message):
+    jobs = []
+    for name, table in zip(('a', 'b'), tables):
+        job = {'name': name, 'base_url': f'http://{name}.test/', 'page_url': f'http://{name}.test/p{{}}'}
+        if table:
+            job['table'] = table
+        jobs.append(job)
+
+    with pytest.raises(ValueError, match=message):
+        load_jobs(_write_config(tmp_path, {'defaults': shared, 'jobs': jobs}))
+
+
+def test_load_jobs_accepts_separate_tables_in_one_database(tmp_path):
+    path = _write_config(tmp_path, {
+        'defaults': {'db_url': 'sqlite:///x.db', 'spreadsheet_id': 'sheet'},
+        'jobs': [
+            {'name': 'a', 'base_url': 'x', 'page_url': 'y', 'table': 'site_a', 'history': True,
+             'range_name': 'A!A1'},
+            {'name': 'b', 'base_url': 'z', 'page_url': 'w', 'table': 'site_b', 'range_name': 'B!A1'},
+        ],
+    })
+
+    jobs, _ = load_jobs(path)
+
+    assert [job.table for job in jobs] == ['site_a', 'site_b']
+
+
+def test_run_jobs_overlaps_jobs_and_staggers_starts():
+    jobs = [CatalogJob(name, f'http://{name}.test/', '') for name in ('a', 'b', 'c')]
+
+    def pipeline(job, executor, job_metrics):
+        with job_metrics.timer('scrape'):
+            time.sleep(0.3)
+        job_metrics.set_value('rows', 10)
+        return []
+
+    start = time.perf_counter()
+    reports = run_jobs(jobs, pipeline, max_workers=4, stagger=0.05)
+    wall = time.perf_counter() - start
+
+    assert [report['name'] for report in reports] == ['a', 'b', 'c']
+    assert [report['status'] for report in reports] == ['ok'] * 3
+    # Job dimulai bertahap, dan total waktu mengikuti job terlama, bukan jumlah ketiganya
+    assert reports[1]['started'] >= 0.05 and reports[2]['started'] >= 0.1
+    assert wall < 0.3 * 2
+    assert reports[0]['stages']['scrape'] >= 0.3
+    assert reports[0]['values'] == {'rows': 10}
+
+
+def test_run_jobs_isolates_failed_job():
+    jobs = [CatalogJob('ok', '', ''), CatalogJob('error', '', ''), CatalogJob('empty', '', '')]
+
+    def pipeline(job, executor, job_metrics):
+        if job.name == 'error':
+            raise RuntimeError('situs tidak bisa dihubungi')
+        return None if job.name == 'empty' else [{'name': 'csv', 'status': 'ok'}]
+
+    reports = run_jobs(jobs, pipeline)
+
+    assert [report['status'] for report in reports] == ['ok', 'failed', 'failed']
+    assert reports[1]['error'] == 'situs tidak bisa dihubungi'
+    assert reports[0]['result'] == [{'name': 'csv', 'status': 'ok'}]
+
+
+def test_shared_executor_respects_per_site_concurrency():
+    servers = [FixtureServer.synthetic(12, per_page=2, latency=0.05).start() for _ in range(2)]
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = {}
+
+            def scrape(index, max_workers):
+                server = servers[index]
+                results[index] = scrape_product_concurrent(server.base_url, server.page_url, max_workers=max_workers,
+                                                           rate_limit=None, executor=executor)
+
+            threads = [threading.Thread(target=scrape, args=(0, 2)), threading.Thread(target=scrape, args=(1, 5))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            # Pool bersama tetap bisa dipakai setelah scraping selesai
+            assert executor.submit(lambda: 'ok').result() == 'ok'
+    finally:
+        for server in servers:
+            server.stop()
+
+    assert len(results[0]) == len(results[1]) == 24
+    assert servers[0].stats['max_in_flight'] <= 2
+    assert 2 < servers[1].stats['max_in_flight'] <= 5
+
+
+def test_main_jobs_runs_each_catalog_into_its_own_sinks(catalog_server, tmp_path, monkeypatch):
+    # Cache halaman main_jobs ditulis ke direktori kerja
+    monkeypatch.chdir(tmp_path)
+    sites = [catalog_server(total_pages=pages, products_per_page=3) for pages in (2, 4)]
+    jobs = [
+        CatalogJob(f'site{index}', base_url, page_url, rate=None, exchange_rate=exchange_rate,
+                   csv_file=str(tmp_path / f'site{index}.csv'), checkpoint_path=str(tmp_path / f'site{index}.jsonl'))
+        for index, ((base_url, page_url), exchange_rate) in enumerate(zip(sites, (16000, 15000)))
+    ]
+    metrics_json = str(tmp_path / 'metrics.json')
+
+    assert main.main_jobs(jobs, max_workers=4, metrics_json=metrics_json) == 0
+
+    site0, site1 = pd.read_csv(tmp_path / 'site0.csv'), pd.read_csv(tmp_path / 'site1.csv')
+    assert (len(site0), len(site1)) == (6, 12)
+    # Setiap job memakai kurs miliknya sendiri ($10 untuk T-shirt 1)
+    assert (site0['Price'][0], site1['Price'][0]) == (160000.0, 150000.0)
+    with open(metrics_json, encoding='utf-8') as f:
+        reports = json.load(f)['values']['jobs']
+    assert [(report['name'], report['status'], report['values']['rows']) for report in reports] == [
+        ('site0', 'ok', 6), ('site1', 'ok', 12),
+    ]
+    assert set(reports[0]['stages']) == {'scrape', 'transform', 'load'}
+
+
+def test_parquet_sink_without_pyarrow_is_reported(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(main, 'PYARROW_AVAILABLE', False)
+    job = CatalogJob('site', '', '', csv_file=str(tmp_path / 'out.csv'), parquet_dir=str(tmp_path / 'dataset'))
+
+    sinks = main._snapshot_sinks(pd.DataFrame(), job)
+
+    assert [sink.name for sink in sinks] == ['csv']
+    assert 'pyarrow belum terpasang' in caplog.text
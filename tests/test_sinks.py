@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from utils.sinks import Sink, run_sinks, failed_critical
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_run_sinks_runs_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def wait_for_others(name):
+        # Hanya lolos bila ketiga sink berjalan bersamaan
+        barrier.wait()
+        return name
+
+    results = run_sinks([Sink(name, wait_for_others, name) for name in ('a', 'b', 'c')])
+
+    assert [report['status'] for report in results] == ['ok', 'ok', 'ok']
+
+
+def test_run_sinks_isolates_failures():
+    def broken():
+        raise RuntimeError("Sheets error")
+
+    results = run_sinks([
+        Sink('postgre', lambda: {'inserted': 1}, critical=True),
+        Sink('csv', lambda: None),
+        Sink('google_sheets', broken),
+    ])
+
+    assert [report['status'] for report in results] == ['ok', 'failed', 'failed']
+    assert results[2]['error'] == 'Sheets error'
+    assert failed_critical(results) == []
+
+
+def test_run_sinks_timeout_marks_sink():
+    release = threading.Event()
+    results = run_sinks([
+        Sink('slow', release.wait, 5, critical=True, timeout=0.1),
+        Sink('fast', lambda: 'ok'),
+    ])
+    release.set()
+
+    assert results[0]['status'] == 'timeout'
+    assert results[1]['status'] == 'ok'
+    assert failed_critical(results) == ['slow']
+
+
+def test_next_run_waits_for_timed_out_sink_with_same_key():
+    release = threading.Event()
+    order = []
+
+    def slow_write():
+        release.wait(5)
+        order.append('chunk 1')
+        return True
+
+    first = run_sinks([Sink('csv', slow_write, timeout=0.05)])
+    threading.Timer(0.2, release.set).start()
+    second = run_sinks([
+        Sink('csv', lambda: order.append('chunk 2') or True, timeout=5),
+        Sink('csv', lambda: order.append('other job') or True, key=('other', 'csv'), timeout=5),
+    ])
+
+    assert first[0]['status'] == 'timeout'
+    assert [report['status'] for report in second] == ['ok', 'ok']
+    # Sink dengan key lain tidak ikut menunggu
+    assert order == ['other job', 'chunk 1', 'chunk 2']
+
+
+def test_timed_out_sink_does_not_block_exit():
+    code = (
+        "import sys, time\n"
+        "from utils.sinks import Sink, run_sinks\n"
+        "results = run_sinks([Sink('hung', time.sleep, 30, timeout=0.1)])\n"
+        "sys.exit(1 if results[0]['status'] == 'timeout' else 2)\n"
+    )
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, timeout=20)
+
+    assert result.returncode == 1
+    assert time.perf_counter() - start < 10
+
+
+def test_run_sinks_reports_duration():
+    results = run_sinks([Sink('sleepy', lambda: time.sleep(0.05) or True)])
+
+    assert results[0]['seconds'] >= 0.05
+    assert run_sinks([]) == []
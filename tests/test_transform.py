@@ -1,6 +1,18 @@
 import pytest
 import pandas as pd
-from utils.transform import transform_to_DataFrame, clean_rating, transform_data
+from utils.metrics import metrics
+from utils.transform import (
+    CLEANING_RULES,
+    transform_to_DataFrame,
+    clean_rating,
+    clean_rating_series,
+    compact_dtypes,
+    compile_rules,
+    extract_colors_series,
+    map_unique,
+    transform_data,
+    transform_stream,
+)
 
 sample_data = [
     {
@@ -45,6 +57,35 @@ def test_transform_to_DataFrame_invalid():
 def test_clean_rating(input_value, expected):
     assert clean_rating(input_value) == expected
     
+def test_clean_rating_series_matches_clean_rating():
+    values = ["⭐ 4.5 / 5", "⭐ 3.9 / 5", "Not Rated", "⭐ Invalid Rating / 5", None, 5, "No rating", "⭐ 7 / 5"]
+    result = clean_rating_series(pd.Series(values, dtype=object))
+
+    for value, cleaned in zip(values, result):
+        expected = clean_rating(value)
+        if expected is None:
+            assert pd.isna(cleaned)
+        else:
+            assert cleaned == expected
+
+
+def test_extract_colors_series_mixed_values():
+    series = pd.Series(["3 Colors", "Colors: 12", 5, 3.7, None, "No color info", float("inf")], dtype=object)
+    result = extract_colors_series(series)
+
+    assert result.iloc[:4].tolist() == [3, 12, 5, 3]
+    assert result.iloc[4:].isna().all()
+
+
+def test_map_unique_matches_full_column_transform():
+    series = pd.Series(["Size: M", None, "L", "Size: M", "L"], dtype=object)
+
+    def strip_size(s):
+        return s.astype(str).str.replace(r'^Size:\s*', '', regex=True)
+
+    assert map_unique(series, strip_size).tolist() == strip_size(series).tolist()
+
+
 def test_transform_data_basic():
     raw_data = pd.DataFrame({
         'Title': ['T-shirt 2', 'Unknown Product', 'Hoodie 3', 'T-shirt 2'],
@@ -177,4 +218,129 @@ def test_transform_data_duplicate_rows_removed():
     exchange_rate = 16000
     result = transform_data(raw_data, exchange_rate)
     # Duplikat harus dihapus, jadi hanya 1 baris tersisa
-    assert result.shape[0] == 1
\ No newline at end of file
+    assert result.shape[0] == 1
+
+
+def test_transform_stream_matches_transform_data():
+    raw = pd.read_csv('scraped_products_raw.csv', dtype=str, keep_default_na=False)
+    records = raw.to_dict('records')
+    pages = [records[i:i + 20] for i in range(0, len(records), 20)]
+
+    expected = transform_data(transform_to_DataFrame(records), 16000)
+    chunks = list(transform_stream(iter(pages), 16000, chunk_size=100))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) > 0 for chunk in chunks)
+    streamed = pd.concat(chunks, ignore_index=True)
+    # Duplikat lintas chunk juga harus terhapus
+    assert streamed.duplicated().sum() == 0
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_transform_data_records_row_counts_without_printing(capsys):
+    raw_data = pd.DataFrame({
+        'Title': ['Product A', 'Unknown Product', 'Product C'],
+        'Rating': ['⭐ 4.5 / 5', '⭐ 4.5 / 5', 'Not Rated'],
+        'Price': ['$100', '$100', '$100'],
+        'Colors': ['5', '3', '3'],
+        'Size': ['M', 'L', 'S'],
+        'Gender': ['Men', 'Women', 'Men'],
+    })
+    metrics.reset()
+
+    transform_data(raw_data, 16000)
+
+    rows = {entry['step']: (entry['rows_in'], entry['rows_out']) for entry in metrics.to_dict()['rows']}
+    assert rows['invalid_title'] == (3, 2)
+    assert rows['invalid_rating'] == (2, 1)
+    assert rows['duplicates'] == (1, 1)
+    assert metrics.to_dict()['timings']['transform']['calls'] == 1
+    # DataFrame tidak lagi dicetak ke stdout
+    assert capsys.readouterr().out == ''
+
+
+def test_transform_data_reports_rejections_per_rule():
+    raw_data = pd.DataFrame({
+        'Title': ['Product A', 'Product B', 'Product C', 'Product D', 'Unknown Product'],
+        'Rating': ['⭐ 4.5 / 5', '⭐ 9 / 5', '⭐ 4.0 / 5', '⭐ 4.0 / 5', '⭐ 4.0 / 5'],
+        'Price': ['$100', '$100', '$100', '$100', '$100'],
+        'Colors': ['5', '3', 'No color info', '3', '3'],
+        'Size': ['Size: M', 'Size: L', 'Size: S', 'Size: None', 'Size: M'],
+        'Gender': ['Gender: Men', 'Gender: Women', 'Gender: Men', 'Gender: Men', 'Gender: Men'],
+    })
+    metrics.reset()
+
+    result = transform_data(raw_data, 16000)
+
+    rows = {entry['step']: (entry['rows_in'], entry['rows_out']) for entry in metrics.to_dict()['rows']}
+    # Penolakan dihitung berurutan seperti aturan diterapkan satu per satu
+    assert rows['invalid_title'] == (5, 4)
+    assert rows['rating'] == (4, 3)
+    assert rows['colors'] == (3, 2)
+    assert rows['size'] == (2, 1)
+    assert result['Title'].tolist() == ['Product A']
+    assert result['Colors'].dtype == 'int64'
+
+
+def test_transform_data_with_custom_rules():
+    rules = dict(CLEANING_RULES, Size=dict(CLEANING_RULES['Size'], valid={'S', 'M', 'L'}))
+    raw_data = pd.DataFrame({
+        'Title': ['Product A', 'Product B'],
+        'Rating': ['⭐ 4.5 / 5', '⭐ 3.5 / 5'],
+        'Price': ['$100', '$150'],
+        'Colors': ['5', '3'],
+        'Size': ['Size: M', 'Size: XXXL'],
+        'Gender': ['Men', 'Women'],
+    })
+
+    result = transform_data(raw_data, 1, rules=compile_rules(rules))
+
+    assert result['Title'].tolist() == ['Product A']
+
+
+def test_transform_data_parses_numeric_values_left_after_filtering():
+    # Setelah baris invalid dibuang, Colors/Rating yang tersisa tidak lagi berisi teks
+    raw_data = pd.DataFrame({
+        'Title': ['Product A', 'Unknown Product', 'Product C'],
+        'Rating': ['⭐ 4.5 / 5', '⭐ 4.5 / 5', 5],
+        'Price': ['$100', '$100', '$100'],
+        'Colors': [3.7, '3 Colors', float('inf')],
+        'Size': ['M', 'M', 'L'],
+        'Gender': ['Men', 'Men', 'Women'],
+    })
+
+    result = transform_data(raw_data, 1)
+
+    assert result['Title'].tolist() == ['Product A']
+    assert result['Colors'].tolist() == [3]
+
+
+def test_compact_dtypes_applies_output_schema():
+    raw = pd.read_csv('scraped_products_raw.csv', dtype=str, keep_default_na=False)
+    data = transform_data(raw, 16000)
+    metrics.reset()
+
+    compact = compact_dtypes(data)
+
+    assert isinstance(compact['Title'].dtype, pd.CategoricalDtype)
+    assert isinstance(compact['Size'].dtype, pd.CategoricalDtype)
+    assert isinstance(compact['Gender'].dtype, pd.CategoricalDtype)
+    assert compact['Colors'].dtype == 'Int16'
+    assert compact['Rating'].dtype == 'float64'
+    assert pd.api.types.is_datetime64_any_dtype(compact['Timestamp'])
+    # Nilai tidak berubah, hanya representasinya
+    pd.testing.assert_frame_equal(compact.astype(str), data.astype(str))
+
+    memory = metrics.to_dict()['values']['memory']
+    assert memory['after_bytes'] < memory['before_bytes']
+
+
+def test_compact_dtypes_float32_rating():
+    data = pd.DataFrame({'Rating': [4.5, 3.9], 'Colors': [3, 5]})
+
+    compact = compact_dtypes(data, float32_rating=True)
+
+    assert compact['Rating'].dtype == 'float32'
+    assert compact['Colors'].tolist() == [3, 5]
+    # Data asli tidak diubah
+    assert data['Rating'].dtype == 'float64'
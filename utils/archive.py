@@ -0,0 +1,300 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+import zlib
+
+from datetime import datetime
+
+from utils.extract import parse_page
+from utils.metrics import metrics
+from utils.transform import transform_data, transform_to_DataFrame
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Level kompresi zlib; HTML katalog yang berulang menyusut jauh pada level menengah
+COMPRESSION_LEVEL = 6
+
+
+class PageArchive:
+    """
+    Arsip body halaman mentah yang hanya ditambah (append-only), terkompresi zlib, dengan index offset.
+
+    Body halaman ditulis sebagai blok zlib berurutan ke file segmen bulanan
+    (pages-YYYY-MM.dat), dan setiap halaman dicatat satu baris JSON di
+    index.jsonl berisi run, URL, waktu fetch, segmen, offset, panjang blok, dan
+    hash konten. Halaman dengan hash yang sudah pernah diarsipkan tidak ditulis
+    ulang; baris index-nya menunjuk blok yang sudah ada, sehingga halaman yang
+    tidak berubah antar run hanya menambah satu baris index. Deduplikasi memakai
+    blocks.idx, index ringkas berisi satu baris per blok unik (hash, segmen,
+    offset, panjang, ukuran), sehingga membuka arsip untuk menulis tidak perlu
+    membaca seluruh index.jsonl.
+
+    Saat dibaca, segmen dipetakan dengan mmap dan setiap blok didekompresi
+    langsung dari memori yang dipetakan tanpa read() ke buffer perantara.
+    Baris index ditulis setelah bloknya, jadi proses yang mati di tengah
+    penulisan paling banyak meninggalkan blok tanpa index atau baris index
+    terakhir yang terpotong; keduanya diabaikan saat dibaca. Satu arsip hanya
+    boleh ditulis oleh satu proses dalam satu waktu.
+
+    Args:
+        directory (str): Direktori arsip.
+        run_id (str): Penanda unik run yang menulis halaman; default waktu arsip dibuka (hingga mikrodetik)
+            ditambah pid, sehingga urutan teksnya mengikuti urutan run.
+    """
+
+    INDEX_FILE = "index.jsonl"
+    BLOCKS_FILE = "blocks.idx"
+
+    def __init__(self, directory, run_id=None):
+        self.directory = directory
+        if run_id is None:
+            # Mikrodetik dan pid memisahkan run yang dimulai pada detik yang sama
+            now = datetime.now()
+            run_id = f"{now.strftime(TIMESTAMP_FORMAT)}.{now:%f}-{os.getpid()}"
+        self.run_id = run_id
+        self.stats = {"pages": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+        self._lock = threading.Lock()
+        self._blocks = None
+        self._index_file = None
+        self._blocks_file = None
+        self._segments = {}
+        self._maps = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, self.INDEX_FILE)
+
+    @property
+    def blocks_path(self):
+        return os.path.join(self.directory, self.BLOCKS_FILE)
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, segment)
+
+    def entries(self, since=None, until=None, run=None):
+        """
+        Baris index sesuai urutan penulisan, opsional difilter waktu fetch (since <= fetched_at < until) atau run.
+
+        since dan until berupa teks yang dibandingkan dengan format '%Y-%m-%d %H:%M:%S', misal '2025-05'.
+        """
+        try:
+            f = open(self.index_path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Baris terakhir bisa terpotong bila proses mati saat menulis
+                    logger.warning("Baris index arsip rusak diabaikan: %s", self.index_path)
+                    continue
+                if since is not None and entry["fetched_at"] < since:
+                    continue
+                if until is not None and entry["fetched_at"] >= until:
+                    continue
+                if run is not None and entry["run"] != run:
+                    continue
+                yield entry
+
+    def _load_blocks(self):
+        """
+        Peta hash konten ke blok yang sudah ada, dipakai untuk deduplikasi saat menulis.
+
+        Dibaca dari blocks.idx; arsip lama tanpa file itu dibangun sekali dari index.jsonl.
+        """
+        if self._blocks is not None:
+            return self._blocks
+        blocks = {}
+        try:
+            with open(self.blocks_path, encoding="utf-8") as f:
+                for line in f:
+                    fields = line.split()
+                    # Baris terakhir bisa terpotong bila proses mati saat menulis
+                    if len(fields) == 5 and line.endswith("\n"):
+                        content_hash, segment, offset, length, size = fields
+                        blocks[content_hash] = (segment, int(offset), int(length), int(size))
+        except FileNotFoundError:
+            for entry in self.entries():
+                blocks[entry["hash"]] = (entry["segment"], entry["offset"], entry["length"], entry["size"])
+            tmp_path = self.blocks_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(self._block_line(content_hash, block) for content_hash, block in blocks.items())
+            os.replace(tmp_path, self.blocks_path)
+        self._blocks = blocks
+        return blocks
+
+    @staticmethod
+    def _block_line(content_hash, block):
+        return " ".join([content_hash, *map(str, block)]) + "\n"
+
+    def _segment_file(self, segment):
+        handle = self._segments.get(segment)
+        if handle is None:
+            handle = open(self._segment_path(segment), "ab")
+            self._segments[segment] = handle
+        return handle
+
+    def append(self, url, content, fetched_at=None):
+        """
+        Mengarsipkan body satu halaman; mengembalikan baris index-nya.
+
+        Args:
+            url (str): URL halaman.
+            content (bytes | str): Body halaman apa adanya.
+            fetched_at (str): Waktu fetch ('%Y-%m-%d %H:%M:%S'), default sekarang; menentukan segmen bulanan.
+                Scraper memakai nilai yang sama dengan Timestamp produk halaman ini (lihat
+                utils.extract.archive_page).
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        fetched_at = fetched_at or datetime.now().strftime(TIMESTAMP_FORMAT)
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        with metrics.timer("archive.write"), self._lock:
+            blocks = self._load_blocks()
+            block = blocks.get(content_hash)
+            if block is None:
+                segment = f"pages-{fetched_at[:7]}.dat"
+                compressed = zlib.compress(content, COMPRESSION_LEVEL)
+                handle = self._segment_file(segment)
+                offset = os.fstat(handle.fileno()).st_size
+                handle.write(compressed)
+                handle.flush()
+                block = blocks[content_hash] = (segment, offset, len(compressed), len(content))
+                if self._blocks_file is None:
+                    self._blocks_file = open(self.blocks_path, "a", encoding="utf-8")
+                self._blocks_file.write(self._block_line(content_hash, block))
+                self._blocks_file.flush()
+                self.stats["stored_bytes"] += len(compressed)
+            else:
+                self.stats["deduplicated"] += 1
+
+            segment, offset, length, size = block
+            entry = {"run": self.run_id, "url": url, "fetched_at": fetched_at, "segment": segment,
+                     "offset": offset, "length": length, "size": size, "hash": content_hash}
+            if self._index_file is None:
+                self._index_file = open(self.index_path, "a", encoding="utf-8")
+            self._index_file.write(json.dumps(entry) + "\n")
+            self._index_file.flush()
+            self.stats["pages"] += 1
+            self.stats["raw_bytes"] += len(content)
+        return entry
+
+    def _map(self, segment, end):
+        """mmap segmen (dibaca saja), dipetakan ulang bila segmen sudah bertambah sejak terakhir dipetakan."""
+        mm = self._maps.get(segment)
+        if mm is not None and len(mm) >= end:
+            return mm
+        if mm is not None:
+            mm.close()
+        with open(self._segment_path(segment), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segment] = mm
+        return mm
+
+    def read(self, entry):
+        """Body halaman dari satu baris index, didekompresi langsung dari segmen yang dipetakan mmap."""
+        end = entry["offset"] + entry["length"]
+        with self._lock:
+            mm = self._map(entry["segment"], end)
+            if len(mm) < end:
+                raise ValueError(f"Blok {entry['segment']}@{entry['offset']} melewati akhir segmen")
+            with memoryview(mm) as view, view[entry["offset"]:end] as block:
+                return zlib.decompress(block)
+
+    def iter_pages(self, since=None, until=None, run=None):
+        """Pasangan (baris index, body halaman) sesuai urutan arsip (lihat entries)."""
+        return self.iter_contents(self.entries(since, until, run))
+
+    def iter_contents(self, entries):
+        """Pasangan (baris index, body halaman) untuk baris index yang diberikan; blok yang tidak lengkap dilewati."""
+        for entry in entries:
+            try:
+                with metrics.timer("archive.read"):
+                    content = self.read(entry)
+            except (OSError, ValueError, zlib.error) as e:
+                logger.warning("Halaman arsip %s (%s) dilewati: %s", entry["url"], entry["fetched_at"], e)
+                continue
+            yield entry, content
+
+    def close(self):
+        """Menutup file segmen dan index (di-fsync) serta semua mmap."""
+        with self._lock:
+            for handle in list(self._segments.values()) + [self._blocks_file, self._index_file]:
+                if handle is not None:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    handle.close()
+            self._segments = {}
+            self._blocks_file = None
+            self._index_file = None
+            for mm in self._maps.values():
+                mm.close()
+            self._maps = {}
+
+    def summary(self):
+        """Ringkasan penulisan arsip untuk dicetak di akhir run."""
+        s = self.stats
+        return (
+            f"Arsip halaman: {s['pages']} halaman ({s['deduplicated']} tidak berubah), "
+            f"{s['raw_bytes']} bytes mentah, {s['stored_bytes']} bytes baru tersimpan"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def replay_runs(archive, exchange_rate, since=None, until=None, parser="auto", parse_pool=None):
+    """
+    Memutar ulang parsing dan transform_data atas halaman arsip tanpa request jaringan.
+
+    Halaman dikelompokkan per run (urut run, lalu urutan arsip); URL yang
+    diarsipkan lebih dari sekali dalam satu run memakai body terakhir. Setiap
+    run diparsing dan dibersihkan dengan aturan saat ini, sementara Timestamp
+    produk mengikuti waktu fetch halaman aslinya, yaitu Timestamp yang sama
+    dengan yang disimpan run asli.
+
+    Args:
+        archive (PageArchive): Arsip sumber.
+        exchange_rate (float): Kurs untuk transform_data.
+        since, until (str): Batas waktu fetch (lihat PageArchive.entries).
+        parser (str): Backend parser, "auto", "lxml", atau "bs4".
+        parse_pool (ParsePool): Pool proses opsional untuk parsing paralel.
+
+    Yields:
+        tuple: (run_id, pd.DataFrame hasil transform_data).
+    """
+    runs = {}
+    for entry in archive.entries(since, until):
+        runs.setdefault(entry["run"], {})[entry["url"]] = entry
+
+    for run_id in sorted(runs):
+        pages = list(archive.iter_contents(runs[run_id].values()))
+        contents = [content for _, content in pages]
+        if parse_pool is not None:
+            parsed = parse_pool.map(contents)
+        else:
+            parsed = (parse_page(content, parser) for content in contents)
+
+        products = []
+        for (entry, _), (page_products, _) in zip(pages, parsed):
+            products.extend(dict(product, Timestamp=entry["fetched_at"]) for product in page_products)
+        if not products:
+            logger.info("Run %s tidak berisi produk, dilewati.", run_id)
+            continue
+
+        with metrics.timer("replay.transform"):
+            data = transform_data(transform_to_DataFrame(products), exchange_rate)
+        logger.info("Run %s diputar ulang: %d halaman, %d produk, %d baris bersih.",
+                    run_id, len(pages), len(products), len(data))
+        yield run_id, data
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import time
+
+try:
+    import httpx
+except ImportError:  # httpx opsional, hanya dibutuhkan jalur scraping async
+    httpx = None
+
+from utils.checkpoint import resume_pages
+from utils.extract import (
+    HEADERS,
+    archive_page,
+    build_page_url,
+    discover_last_page,
+    parse_page_cached,
+    session_config,
+)
+from utils.metrics import metrics
+from utils.parse_pool import rows_from_columns
+from utils.ratelimit import AdaptiveRateLimiter, THROTTLE_STATUSES, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+HTTPX_AVAILABLE = httpx is not None
+
+# Jumlah request yang boleh berjalan bersamaan di event loop
+ASYNC_MAX_IN_FLIGHT = 100
+
+
+def create_async_client(max_connections=ASYNC_MAX_IN_FLIGHT):
+    """
+    Membuat httpx.AsyncClient dengan pool koneksi keep-alive bersama untuk semua request di satu event loop.
+
+    Timeout dan jumlah retry koneksi mengikuti konfigurasi session sinkron (lihat configure_session).
+    """
+    if not HTTPX_AVAILABLE:
+        raise RuntimeError("httpx belum terpasang; lihat requirements-optional.txt.")
+    config = session_config()
+    return httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=httpx.Timeout(config["read_timeout"], connect=config["connect_timeout"]),
+        # Limits harus diberikan ke transport; argumen limits milik client diabaikan bila transport diisi
+        transport=httpx.AsyncHTTPTransport(
+            retries=config["retries"],
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        ),
+        follow_redirects=True,
+    )
+
+
+async def fetching_content_async(url, client, cache=None, limiter=None, conditional=True):
+    """
+    Versi async fetching_content: mengambil HTML dari URL tanpa memblokir event loop.
+
+    Status pada status_forcelist session diulang dengan backoff eksponensial
+    seperti adapter retry sinkron, conditional request dan jawaban 304 memakai
+    cache (PageCache), dan token limiter ditunggu dengan asyncio.sleep. Jawaban
+    304 untuk body yang sudah dibuang dari cache diulang tanpa conditional header.
+
+    Returns:
+        bytes | None: Body halaman, atau None bila gagal.
+    """
+    config = session_config()
+    headers = cache.conditional_headers(url) if cache is not None and conditional else None
+    throttled = False
+    start = time.perf_counter()
+    try:
+        for attempt in range(config["retries"] + 1):
+            if limiter is not None:
+                wait = limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            start = time.perf_counter()
+            with metrics.timer("fetch"):
+                response = await client.get(url, headers=headers)
+            if response.status_code not in config["status_forcelist"]:
+                break
+
+            throttled = throttled or response.status_code in THROTTLE_STATUSES
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if attempt == config["retries"]:
+                # Percobaan ulang habis karena server terus menjawab 429/5xx
+                if limiter is not None:
+                    limiter.record(time.perf_counter() - start, status=response.status_code,
+                                   retry_after=retry_after, throttled=True)
+                logger.error("[RETRY ERROR] %s: status %s setelah %d percobaan ulang",
+                             url, response.status_code, config["retries"])
+                return None
+            await asyncio.sleep(max(config["backoff_factor"] * (2 ** attempt), retry_after or 0))
+
+        if limiter is not None:
+            limiter.record(time.perf_counter() - start, status=response.status_code,
+                           retry_after=parse_retry_after(response.headers.get("Retry-After")), throttled=throttled)
+        if cache is not None and response.status_code == 304:
+            content = cache.revalidated(url)
+            if content is not None:
+                return content
+            # Body sudah keluar dari cache sejak header dibuat, ulangi sebagai GET biasa
+            return await fetching_content_async(url, client, cache, limiter, conditional=False)
+        response.raise_for_status()
+        if cache is not None:
+            cache.store(
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return response.content
+    except httpx.HTTPStatusError as e:
+        logger.error("[HTTP ERROR] %s: %s", url, e)
+    except httpx.ConnectError as e:
+        logger.error("[CONNECTION ERROR] %s: %s", url, e)
+    except httpx.TimeoutException as e:
+        logger.error("[TIMEOUT ERROR] %s: %s", url, e)
+    except httpx.HTTPError as e:
+        logger.error("[REQUEST ERROR] %s: %s", url, e)
+    return None
+
+
+async def _parse_async(url, content, cache=None, parser="auto", parse_pool=None):
+    """Parsing halaman begitu body diterima; dengan parse_pool parsing berjalan di proses worker tanpa menahan loop."""
+    if parse_pool is None:
+        return parse_page_cached(url, content, cache, parser)
+    if cache is not None:
+        parsed = cache.get_parsed(url, content)
+        if parsed is not None:
+            return parsed
+    with metrics.timer("parse"):
+        columns, has_next = await asyncio.wrap_future(parse_pool.submit(content))
+    products = rows_from_columns(columns)
+    if cache is not None:
+        cache.store_parsed(url, content, products, has_next)
+    return products, has_next
+
+
+async def aiter_scrape_pages(base_url, base_url_paged, start_page=1, max_in_flight=ASYNC_MAX_IN_FLIGHT,
+                             rate_limit=None, cache=None, parser="auto", checkpoint=None, limiter=None,
+                             discover=False, parse_pool=None, client=None, semaphore=None, archive=None):
+    """
+    Async generator scraping yang menghasilkan daftar produk per halaman sesuai urutan halaman.
+
+    Halaman dijadwalkan sebagai task di satu event loop dalam jendela geser
+    berukuran max_in_flight, dan jumlah request yang berjalan dibatasi
+    semaphore. Setiap halaman langsung diparsing begitu body-nya diterima,
+    sementara hasil tetap dikeluarkan berurutan dan berhenti pada halaman
+    pertama yang gagal, kosong, atau tanpa tombol next, sama seperti
+    iter_scrape_pages_concurrent.
+
+    Args:
+        max_in_flight (int): Jumlah halaman yang dijadwalkan bersamaan.
+        rate_limit (float): Laju awal request per detik bila limiter tidak diberikan, None untuk tanpa batas.
+        client (httpx.AsyncClient): Client bersama; bila None dibuat dan ditutup di sini.
+        semaphore (asyncio.Semaphore): Pembatas request bersama, misal antar beberapa scraping di loop yang sama.
+        archive (PageArchive): Arsip body halaman mentah; halaman diarsipkan sesuai urutan halaman.
+
+    Argumen lain sama dengan iter_scrape_pages_concurrent.
+    """
+    replay = resume_pages(checkpoint, start_page)
+    while True:
+        try:
+            products = next(replay)
+        except StopIteration as stop:
+            start_page = stop.value
+            break
+        yield products
+    if start_page is None:
+        return
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(rate=rate_limit)
+
+    last_page = None
+    prefetched = {}
+    if discover:
+        # Discovery hanya sekitar log2(jumlah halaman) request berurutan, cukup dijalankan di thread
+        last_page = await asyncio.to_thread(discover_last_page, base_url, base_url_paged, cache, limiter, parser,
+                                            start_page=start_page, pages=prefetched)
+        if last_page is None:
+            logger.info("Discovery gagal, halaman ditelusuri lewat tombol next.")
+
+    own_client = client is None
+    if own_client:
+        client = create_async_client(max_in_flight)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def fetch(page_number):
+        url = build_page_url(base_url, base_url_paged, page_number)
+        content = prefetched.pop(page_number, None)
+        if content is None:
+            async with semaphore:
+                logger.info("Scraping halaman: %s", url)
+                content = await fetching_content_async(url, client, cache, limiter)
+        if not content:
+            return None
+        return url, content, await _parse_async(url, content, cache, parser, parse_pool)
+
+    pending = {}
+    next_to_submit = page_number = start_page
+    try:
+        while True:
+            while len(pending) < max_in_flight and (last_page is None or next_to_submit <= last_page):
+                pending[next_to_submit] = asyncio.ensure_future(fetch(next_to_submit))
+                next_to_submit += 1
+
+            try:
+                fetched = await pending.pop(page_number)
+                if fetched is None:
+                    logger.info("Konten kosong atau gagal diambil.")
+                    break
+                url, content, (products, has_next) = fetched
+                if archive is not None:
+                    archive_page(archive, url, content, products)
+
+                if not products:
+                    logger.info("Tidak ada produk ditemukan di halaman ini.")
+                    if checkpoint is not None:
+                        checkpoint.mark_complete()
+                    break
+
+                if checkpoint is not None:
+                    checkpoint.record_page(page_number, products, has_next)
+                yield products
+
+                if last_page is not None and page_number >= last_page and has_next:
+                    logger.info("Halaman %d masih punya tombol next, katalog bertambah sejak discovery.", page_number)
+                    last_page = None
+
+                if has_next:
+                    page_number += 1
+                    continue
+                if checkpoint is not None:
+                    checkpoint.mark_complete()
+                break
+            except Exception as e:
+                logger.error("[ERROR SCRAPING PAGE %s] %s", page_number, e)
+                break
+    finally:
+        # Halaman spekulatif setelah halaman terakhir dibatalkan
+        for task in pending.values():
+            task.cancel()
+        await asyncio.gather(*pending.values(), return_exceptions=True)
+        if own_client:
+            await client.aclose()
+
+
+async def scrape_product_async(base_url, base_url_paged, start_page=1, max_in_flight=ASYNC_MAX_IN_FLIGHT,
+                               rate_limit=None, cache=None, parser="auto", checkpoint=None, limiter=None,
+                               discover=False, parse_pool=None, client=None, semaphore=None, archive=None):
+    """Versi async scrape_product (lihat aiter_scrape_pages); mengembalikan seluruh produk."""
+    data = []
+    async for products in aiter_scrape_pages(
+        base_url, base_url_paged, start_page, max_in_flight, rate_limit, cache, parser, checkpoint, limiter,
+        discover, parse_pool, client, semaphore, archive,
+    ):
+        data.extend(products)
+    return data
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """
+    Cache halaman katalog di disk dengan validator HTTP dan batas ukuran LRU.
+
+    Setiap entri menyimpan body halaman, ETag, Last-Modified, hash konten, serta
+    hasil parsing terakhir. Entri yang paling lama tidak dipakai dibuang ketika
+    total ukuran melebihi max_bytes.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory=".page_cache", max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "unchanged": 0, "parse_skipped": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def content_hash(content):
+        """Menghitung hash SHA-256 dari konten halaman."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def _path(self, url, suffix):
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}{suffix}")
+
+    def _load_index(self):
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                for url, entry in json.load(f):
+                    if os.path.exists(self._path(url, ".html")):
+                        self.entries[url] = entry
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError) as e:
+            logger.warning("Index cache rusak, cache dikosongkan: %s", e)
+            self.entries.clear()
+
+    def save(self):
+        """Menyimpan index cache ke disk dengan urutan LRU."""
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        with self._lock:
+            data = list(self.entries.items())
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @property
+    def total_bytes(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def conditional_headers(self, url):
+        """Header If-None-Match / If-Modified-Since untuk URL yang sudah ada di cache."""
+        with self._lock:
+            entry = self.entries.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, url):
+        """
+        Mengembalikan body dari cache setelah server menjawab 304 Not Modified.
+
+        None bila entri sudah dibuang (eviction) sejak conditional header dibuat;
+        pemanggil harus mengulang dengan GET biasa.
+        """
+        with self._lock:
+            if url not in self.entries:
+                return None
+            try:
+                with open(self._path(url, ".html"), "rb") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                del self.entries[url]
+                return None
+            self.entries.move_to_end(url)
+            self.stats["hits"] += 1
+        return content
+
+    def store(self, url, content, etag=None, last_modified=None):
+        """Menyimpan body halaman beserta validatornya, lalu menjalankan eviction LRU."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        content_hash = self.content_hash(content)
+
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry and entry["hash"] == content_hash:
+                # Konten sama walau server tidak mengirim 304, hasil parsing lama tetap berlaku
+                self.stats["unchanged"] += 1
+                entry["etag"] = etag
+                entry["last_modified"] = last_modified
+                self.entries.move_to_end(url)
+                return
+
+            self.stats["misses"] += 1
+            with open(self._path(url, ".html"), "wb") as f:
+                f.write(content)
+            parsed_path = self._path(url, ".json")
+            if os.path.exists(parsed_path):
+                os.remove(parsed_path)
+
+            self.entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "hash": content_hash,
+                "size": len(content),
+                "parsed": False,
+            }
+            self.entries.move_to_end(url)
+            self._evict()
+
+    def _evict(self):
+        while len(self.entries) > 1 and self.total_bytes > self.max_bytes:
+            url, _ = self.entries.popitem(last=False)
+            for suffix in (".html", ".json"):
+                path = self._path(url, suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+            self.stats["evictions"] += 1
+
+    def get_parsed(self, url, content):
+        """
+        Mengambil hasil parsing tersimpan bila hash konten tidak berubah.
+
+        Timestamp setiap produk diperbarui ke waktu sekarang karena data tetap
+        dianggap hasil scraping run ini.
+        """
+        content_hash = self.content_hash(content)
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or entry["hash"] != content_hash or not entry.get("parsed"):
+                return None
+        try:
+            with open(self._path(url, ".json"), encoding="utf-8") as f:
+                parsed = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        products = [dict(product, Timestamp=timestamp) for product in parsed["products"]]
+        with self._lock:
+            self.stats["parse_skipped"] += 1
+        return products, parsed["has_next"]
+
+    def store_parsed(self, url, content, products, has_next):
+        """Menyimpan hasil parsing halaman agar run berikutnya bisa melewati parsing."""
+        content_hash = self.content_hash(content)
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or entry["hash"] != content_hash:
+                return
+            payload = json.dumps({"products": products, "has_next": has_next})
+            with open(self._path(url, ".json"), "w", encoding="utf-8") as f:
+                f.write(payload)
+            entry["parsed"] = True
+            # Dihitung ulang dari file yang tersimpan agar tidak bertambah pada setiap penulisan ulang
+            entry["size"] = os.path.getsize(self._path(url, ".html")) + len(payload.encode("utf-8"))
+            self._evict()
+
+    def summary(self):
+        """Ringkasan statistik cache untuk dicetak di akhir run."""
+        s = self.stats
+        return (
+            f"Cache halaman: {s['hits']} hit (304), {s['unchanged']} tidak berubah, "
+            f"{s['misses']} miss, {s['parse_skipped']} parsing dilewati, "
+            f"{s['evictions']} eviction, {len(self.entries)} entri ({self.total_bytes} bytes)"
+        )
@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCheckpoint:
+    """
+    Checkpoint scraping berbentuk file JSON Lines yang hanya ditambah (append-only).
+
+    Baris pertama berisi base_url run, lalu satu baris per halaman yang selesai
+    beserta produk hasil ekstraksinya, dan baris penutup saat halaman terakhir
+    tercapai. Setiap baris di-fsync sehingga run yang terputus di tengah jalan
+    tetap meninggalkan checkpoint yang valid; baris terakhir yang terpotong
+    diabaikan saat dibaca.
+
+    Args:
+        path (str): Path file checkpoint.
+        base_url (str): URL halaman pertama; checkpoint milik URL lain tidak dipakai.
+        resume (bool): Lanjutkan checkpoint yang ada; bila False checkpoint lama dihapus.
+    """
+
+    def __init__(self, path, base_url, resume=False):
+        self.path = path
+        self.base_url = base_url
+        self.pages = {}
+        self.complete = False
+        self._file = None
+
+        if resume:
+            self._load()
+        else:
+            self.clear()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Baris terakhir bisa terpotong bila proses mati saat menulis; file ditulis
+                # ulang tanpa baris itu agar record berikutnya tidak tersambung ke sisa tulisan lama
+                logger.warning("Baris checkpoint rusak diabaikan: %s", self.path)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in records)
+                os.replace(tmp_path, self.path)
+                break
+
+        if not records or records[0].get("type") != "run" or records[0].get("base_url") != self.base_url:
+            logger.warning("Checkpoint %s bukan milik %s, scraping dimulai dari awal.", self.path, self.base_url)
+            self.clear()
+            return
+
+        for record in records[1:]:
+            if record.get("type") == "page":
+                self.pages[record["page"]] = (record["products"], record["has_next"])
+            elif record.get("type") == "complete":
+                self.complete = True
+        logger.info("Checkpoint dimuat: %d halaman selesai%s.", len(self.pages),
+                    ", scraping sudah lengkap" if self.complete else "")
+
+    def _append(self, record):
+        if self._file is None:
+            new_file = not os.path.exists(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            if new_file:
+                self._write({
+                    "type": "run",
+                    "base_url": self.base_url,
+                    "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                })
+        self._write(record)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def completed_pages(self, start_page=1):
+        """
+        Halaman berurutan mulai start_page yang sudah selesai, sebagai (nomor, produk, ada_halaman_berikutnya).
+
+        Berhenti pada celah pertama karena halaman setelahnya harus di-scrape ulang.
+        """
+        page_number = start_page
+        while page_number in self.pages:
+            products, has_next = self.pages[page_number]
+            yield page_number, products, has_next
+            page_number += 1
+
+    def record_page(self, page_number, products, has_next):
+        """Mencatat halaman yang selesai beserta produknya."""
+        self.pages[page_number] = (products, has_next)
+        self._append({"type": "page", "page": page_number, "has_next": has_next, "products": products})
+
+    def mark_complete(self):
+        """Mencatat bahwa halaman terakhir sudah tercapai."""
+        self.complete = True
+        self._append({"type": "complete"})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """Menghapus checkpoint, misal setelah run selesai dan semua sink berhasil."""
+        self.close()
+        self.pages = {}
+        self.complete = False
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def resume_pages(checkpoint, start_page=1):
+    """
+    Memutar ulang halaman dari checkpoint di dalam generator scraping.
+
+    Dipakai dengan ``page_number = yield from resume_pages(...)``: produk setiap
+    halaman tersimpan di-yield, lalu mengembalikan nomor halaman berikutnya yang
+    harus di-scrape, atau None bila checkpoint sudah mencapai halaman terakhir.
+    """
+    page_number = start_page
+    if checkpoint is None:
+        return page_number
+    for page_number, products, has_next in checkpoint.completed_pages(start_page):
+        yield products
+        if not has_next:
+            return None
+        page_number += 1
+    if checkpoint.complete:
+        return None
+    return page_number
@@ -1,8 +1,22 @@
+import logging
+import re
 import time
+import threading
 import requests
 
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from utils.checkpoint import resume_pages
+from utils.metrics import metrics
+from utils.ratelimit import AdaptiveRateLimiter, THROTTLE_STATUSES, parse_retry_after
+from utils.parser import LXML_AVAILABLE, parse_page_lxml
+
+logger = logging.getLogger(__name__)
 
 HEADERS = {
     "User-Agent": (
@@ -10,23 +24,183 @@ HEADERS = {
         "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
     )
 }
- 
- 
-def fetching_content(url):
-    """Mengambil konten HTML dari URL yang diberikan dengan error handling."""
+
+# Konfigurasi default session HTTP bersama
+SESSION_CONFIG = {
+    "pool_size": 10,
+    "retries": 3,
+    "backoff_factor": 0.5,
+    "status_forcelist": (429, 500, 502, 503, 504),
+    "connect_timeout": 5,
+    "read_timeout": 10,
+}
+
+_session = None
+_session_config = dict(SESSION_CONFIG)
+_session_lock = threading.Lock()
+
+
+def create_session(pool_size=10, retries=3, backoff_factor=0.5,
+                   status_forcelist=(429, 500, 502, 503, 504)):
+    """
+    Membuat requests.Session dengan connection pool keep-alive dan retry otomatis.
+
+    Args:
+        pool_size (int): Jumlah koneksi keep-alive yang disimpan per host.
+        retries (int): Jumlah percobaan ulang untuk error koneksi dan status pada status_forcelist.
+        backoff_factor (float): Faktor jeda eksponensial antar percobaan ulang.
+        status_forcelist (tuple): Kode status HTTP yang memicu percobaan ulang.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    # gzip/deflate selalu didukung, br ikut ditambahkan oleh urllib3 bila brotli terpasang
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+def configure_session(**config):
+    """Mengubah konfigurasi session bersama; session lama ditutup dan dibuat ulang saat dipakai."""
+    global _session
+    unknown = set(config) - set(SESSION_CONFIG)
+    if unknown:
+        raise ValueError(f"Opsi session tidak dikenal: {', '.join(sorted(unknown))}")
+    with _session_lock:
+        _session_config.update(config)
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_session():
+    """Mengembalikan session HTTP bersama yang dipakai oleh semua fungsi extract."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session(
+                pool_size=_session_config["pool_size"],
+                retries=_session_config["retries"],
+                backoff_factor=_session_config["backoff_factor"],
+                status_forcelist=_session_config["status_forcelist"],
+            )
+        return _session
+
+
+def session_config():
+    """Salinan konfigurasi session aktif (lihat SESSION_CONFIG), misal untuk client async."""
+    with _session_lock:
+        return dict(_session_config)
+
+
+def get_timeout():
+    """Mengembalikan timeout (connect, read) untuk setiap request."""
+    return (_session_config["connect_timeout"], _session_config["read_timeout"])
+
+
+def close_session():
+    """Menutup session bersama beserta seluruh koneksi di dalam pool."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def connection_stats(session=None):
+    """
+    Menghitung jumlah koneksi baru dan koneksi yang dipakai ulang oleh session.
+
+    Returns:
+        dict: {'requests': total request, 'new': koneksi baru, 'reused': request lewat koneksi lama}
+    """
+    session = session or _session
+    stats = {"requests": 0, "new": 0, "reused": 0}
+    if session is None:
+        return stats
+
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["requests"] += pool.num_requests
+            stats["new"] += pool.num_connections
+    stats["reused"] = max(stats["requests"] - stats["new"], 0)
+    return stats
+
+
+def _record_response(limiter, response, latency):
+    """Melaporkan status, latensi, dan Retry-After satu response ke rate limiter."""
+    retries = getattr(response.raw, "retries", None)
+    history = getattr(retries, "history", None) or ()
+    limiter.record(
+        latency,
+        status=response.status_code,
+        retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        # Retry adapter session bisa sudah mengulang 429/503 sebelum response akhir diterima
+        throttled=any(entry.status in THROTTLE_STATUSES for entry in history),
+    )
+
+
+def fetching_content(url, session=None, cache=None, limiter=None, conditional=True):
+    """
+    Mengambil konten HTML dari URL yang diberikan dengan error handling.
+
+    Bila cache (PageCache) diberikan, request dikirim sebagai conditional request
+    dan jawaban 304 dilayani dari body yang tersimpan di cache; bila body sudah
+    dibuang dari cache, request diulang tanpa conditional header. Bila limiter
+    (AdaptiveRateLimiter) diberikan, request menunggu token lebih dulu dan
+    hasilnya dilaporkan agar laju bisa menyesuaikan.
+    """
+    start = None
     try:
-        session = requests.Session()
-        response = session.get(url, headers=HEADERS, timeout=10)
+        session = session or get_session()
+        headers = cache.conditional_headers(url) if cache is not None and conditional else None
+        if limiter is not None:
+            limiter.acquire()
+        start = time.perf_counter()
+        with metrics.timer("fetch"):
+            response = session.get(url, headers=headers, timeout=get_timeout())
+        if limiter is not None:
+            _record_response(limiter, response, time.perf_counter() - start)
+        if cache is not None and response.status_code == 304:
+            content = cache.revalidated(url)
+            if content is not None:
+                return content
+            # Body sudah keluar dari cache sejak header dibuat, ulangi sebagai GET biasa
+            return fetching_content(url, session, cache, limiter, conditional=False)
         response.raise_for_status()
+        if cache is not None:
+            cache.store(
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
         return response.content
+    except requests.exceptions.RetryError as e:
+        # Percobaan ulang habis karena server terus menjawab 429/5xx
+        if limiter is not None:
+            limiter.record(time.perf_counter() - start, throttled=True)
+        logger.error("[RETRY ERROR] %s: %s", url, e)
     except requests.exceptions.HTTPError as e:
-        print(f"[HTTP ERROR] {url}: {e}")
+        logger.error("[HTTP ERROR] %s: %s", url, e)
     except requests.exceptions.ConnectionError as e:
-        print(f"[CONNECTION ERROR] {url}: {e}")
+        logger.error("[CONNECTION ERROR] %s: %s", url, e)
     except requests.exceptions.Timeout as e:
-        print(f"[TIMEOUT ERROR] {url}: {e}")
+        logger.error("[TIMEOUT ERROR] %s: %s", url, e)
     except requests.exceptions.RequestException as e:
-        print(f"[REQUEST ERROR] {url}: {e}")
+        logger.error("[REQUEST ERROR] %s: %s", url, e)
     return None
 
 
@@ -72,7 +246,7 @@ def extract_product_data(card):
 
         return product
     except Exception as e:
-        print(f"[ERROR EXTRACTING PRODUCT] {e}")
+        logger.error("[ERROR EXTRACTING PRODUCT] %s", e)
         return {
             "Title": "N/A",
             "Price": "N/A",
@@ -84,43 +258,422 @@ def extract_product_data(card):
         }
 
 
-def scrape_product(base_url, base_url_paged, start_page=1, delay=2):
-    """Fungsi utama untuk scraping, dilengkapi dengan error handling tiap tahap."""
-    data = []
-    page_number = start_page
+def build_page_url(base_url, base_url_paged, page_number):
+    """Menentukan URL halaman katalog berdasarkan nomor halaman."""
+    if page_number == 1:
+        return base_url
+    return base_url_paged.format(page_number)
+
+
+def parse_page_bs4(content):
+    """Parsing satu halaman katalog memakai BeautifulSoup ("html.parser")."""
+    soup = BeautifulSoup(content, "html.parser")
+    cards_element = soup.find_all('div', class_='collection-card')
+    products = [extract_product_data(card) for card in cards_element]
+    has_next = soup.find('li', class_='next') is not None
+    return products, has_next
+
+
+PARSER_BACKENDS = {"bs4": parse_page_bs4}
+if LXML_AVAILABLE:
+    PARSER_BACKENDS["lxml"] = parse_page_lxml
+
+
+def get_parser(name="auto"):
+    """
+    Memilih backend parser halaman.
+
+    "auto" memakai BeautifulSoup. lxml lebih cepat tetapi bisa membangun pohon
+    berbeda pada markup rusak (lihat parse_page_lxml), jadi hanya dipakai bila
+    diminta eksplisit dengan "lxml" setelah hasilnya dicek terhadap halaman
+    tersimpan (benchmarks/bench_parser.py). Backend yang diminta tetapi tidak
+    terpasang jatuh kembali ke BeautifulSoup.
+    """
+    if name == "auto":
+        name = "bs4"
+    if name == "lxml" and not LXML_AVAILABLE:
+        logger.warning("lxml tidak terpasang (lihat requirements-optional.txt), memakai parser BeautifulSoup.")
+        name = "bs4"
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Parser tidak dikenal: {name}")
+    return PARSER_BACKENDS[name]
+
+
+def parse_page(content, parser="auto"):
+    """Parsing satu halaman katalog menjadi daftar produk dan penanda halaman berikutnya."""
+    parse = get_parser(parser)
+    with metrics.timer("parse"):
+        return parse(content)
+
+
+def parse_page_cached(url, content, cache=None, parser="auto", pool=None):
+    """
+    Parsing halaman, dilewati bila hash konten sama dengan hasil parsing yang tersimpan di cache.
+
+    Bila pool (ParsePool) diberikan, parsing dijalankan di proses worker dan
+    backend parser mengikuti konfigurasi pool.
+    """
+    if cache is not None:
+        parsed = cache.get_parsed(url, content)
+        if parsed is not None:
+            return parsed
+    if pool is not None:
+        with metrics.timer("parse"):
+            products, has_next = pool.parse(content)
+    else:
+        products, has_next = parse_page(content, parser)
+    if cache is not None:
+        cache.store_parsed(url, content, products, has_next)
+    return products, has_next
+
+
+def archive_page(archive, url, content, products):
+    """
+    Mengarsipkan body halaman dengan satu waktu fetch yang sekaligus menjadi Timestamp semua produknya.
+
+    Produk diberi Timestamp saat diparsing, yang bisa terjadi di thread fetch
+    atau proses worker jauh sebelum halaman sampai ke sini. Dengan menyamakan
+    keduanya, replay (utils.archive.replay_runs) menghasilkan Timestamp yang
+    sama persis dengan run aslinya.
+    """
+    fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for product in products:
+        product["Timestamp"] = fetched_at
+    archive.append(url, content, fetched_at)
+
+
+def pagination_numbers(content, base_url_paged):
+    """Nomor halaman yang ditautkan di halaman, dicocokkan dengan nama file template URL (misal 'page{}.html')."""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    prefix, _, suffix = base_url_paged.rsplit("/", 1)[-1].partition("{}")
+    pattern = re.compile(re.escape(prefix) + r"(\d+)" + re.escape(suffix))
+    return {int(number) for number in pattern.findall(content)}
+
+
+def _probe_page(url, cache=None, limiter=None, parser="auto"):
+    """
+    Mengambil halaman katalog untuk discovery tanpa mencatat 404 sebagai error.
 
+    Request dikirim sebagai conditional request bila cache diberikan, sehingga
+    halaman yang tidak berubah cukup dijawab 304.
+
+    Returns:
+        tuple: (ada, body, ada_halaman_berikutnya); ada bernilai None bila tidak bisa
+            dipastikan (error jaringan, status 5xx) dan False bila halaman tidak ada atau kosong.
+    """
+    headers = cache.conditional_headers(url) if cache is not None else None
     while True:
+        if limiter is not None:
+            limiter.acquire()
+        start = time.perf_counter()
         try:
-            if page_number == 1:
-                url = base_url
-            else:
-                url = base_url_paged.format(page_number)
+            with metrics.timer("discover"):
+                response = get_session().get(url, headers=headers, timeout=get_timeout())
+        except requests.exceptions.RequestException as e:
+            if limiter is not None and isinstance(e, requests.exceptions.RetryError):
+                limiter.record(time.perf_counter() - start, throttled=True)
+            logger.warning("Probe %s gagal: %s", url, e)
+            return None, None, False
+        if limiter is not None:
+            _record_response(limiter, response, time.perf_counter() - start)
+
+        if response.status_code == 304 and cache is not None:
+            content = cache.revalidated(url)
+            if content is not None:
+                break
+            # Body sudah keluar dari cache sejak header dibuat, ulangi tanpa conditional header
+            headers = None
+            continue
+        if response.status_code == 404:
+            return False, None, False
+        if response.status_code != 200:
+            return None, None, False
+        content = response.content
+        if cache is not None:
+            # Disimpan agar scraping berikutnya cukup memvalidasi ulang halaman ini
+            cache.store(url, content, etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"))
+        break
+
+    products, has_next = parse_page_cached(url, content, cache, parser)
+    if not products:
+        return False, None, False
+    return True, content, has_next
+
+
+def discover_last_page(base_url, base_url_paged, cache=None, limiter=None, parser="auto", max_pages=10000,
+                       start_page=1, pages=None):
+    """
+    Mencari nomor halaman terakhir katalog sebelum scraping dimulai.
+
+    Dimulai dari halaman start_page (halaman 1, atau halaman lanjutan saat
+    --resume). Nomor terbesar pada widget pagination-nya diambil lebih dulu;
+    bila halaman itu tidak punya tombol next, itulah halaman terakhir. Bila
+    masih ada, halaman setelahnya diperiksa secara eksponensial (2x, 4x, ...)
+    hingga ditemukan halaman yang tidak ada, lalu batas pastinya dicari dengan
+    binary search. Halaman tanpa tombol next yang ditemukan di tengah jalan
+    langsung mengakhiri pencarian.
+
+    Args:
+        start_page (int): Halaman pertama yang akan di-scrape.
+        pages (dict): Bila diberikan, diisi {nomor_halaman: body} untuk setiap halaman yang
+            ditemukan, agar scraping tidak mengambilnya lagi. Request tambahan dari discovery
+            hanya probe ke halaman yang tidak ada (sekitar log2(jumlah halaman)).
+
+    Returns:
+        int | None: Nomor halaman terakhir, atau None bila tidak bisa dipastikan
+            sehingga pemanggil harus kembali menelusuri tombol next.
+    """
+    url = build_page_url(base_url, base_url_paged, start_page)
+    content = fetching_content(url, cache=cache, limiter=limiter)
+    if not content:
+        return None
+    products, has_next = parse_page_cached(url, content, cache, parser)
+    if not products:
+        return None
+    if pages is not None:
+        pages[start_page] = content
+    if not has_next:
+        return start_page
+
+    def probe(page_number):
+        found, body, page_has_next = _probe_page(build_page_url(base_url, base_url_paged, page_number),
+                                                 cache, limiter, parser)
+        if found and pages is not None:
+            pages[page_number] = body
+        return found, page_has_next
+
+    # Halaman terakhir menurut widget pagination; pada situs yang menampilkan semua nomor cukup satu request
+    low = max(pagination_numbers(content, base_url_paged) | {start_page + 1})
+    if low > max_pages:
+        return None
+    found, has_next = probe(low)
+    if not found:
+        return None
+    if not has_next:
+        logger.info("Discovery: katalog berisi %d halaman.", low)
+        return low
+
+    high = low * 2
+    while True:
+        if high > max_pages:
+            logger.warning("Katalog melebihi %d halaman, discovery dihentikan.", max_pages)
+            return None
+        found, has_next = probe(high)
+        if found is None:
+            return None
+        if not found:
+            break
+        if not has_next:
+            logger.info("Discovery: katalog berisi %d halaman.", high)
+            return high
+        low, high = high, high * 2
+
+    # Invarian: halaman low ada, halaman high tidak ada
+    while high - low > 1:
+        middle = (low + high) // 2
+        found, has_next = probe(middle)
+        if found is None:
+            return None
+        if found and not has_next:
+            low = middle
+            break
+        if found:
+            low = middle
+        else:
+            high = middle
+
+    logger.info("Discovery: katalog berisi %d halaman.", low)
+    return low
+
+
+def _mark_complete(checkpoint):
+    if checkpoint is not None:
+        checkpoint.mark_complete()
+
+
+def iter_scrape_pages(base_url, base_url_paged, start_page=1, delay=2, cache=None, parser="auto", checkpoint=None,
+                      limiter=None, archive=None):
+    """
+    Generator scraping sekuensial yang menghasilkan daftar produk per halaman begitu halaman selesai diproses.
+
+    Jeda antar halaman diatur oleh limiter (AdaptiveRateLimiter); tanpa limiter,
+    dibuat limiter dengan laju awal satu halaman per delay detik (delay=0 untuk
+    tanpa batas). Bila checkpoint (ScrapeCheckpoint) diberikan, halaman yang
+    sudah selesai di run sebelumnya diputar ulang tanpa request, scraping
+    dilanjutkan dari halaman berikutnya, dan setiap halaman baru dicatat ke checkpoint.
+    Bila archive (PageArchive) diberikan, body setiap halaman yang diambil ikut diarsipkan.
+    """
+    page_number = yield from resume_pages(checkpoint, start_page)
+    if page_number is None:
+        return
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(rate=1.0 / delay if delay else None)
+
+    while True:
+        try:
+            url = build_page_url(base_url, base_url_paged, page_number)
 
-            print(f"Scraping halaman: {url}")
+            logger.info("Scraping halaman: %s", url)
 
-            content = fetching_content(url)
+            content = fetching_content(url, cache=cache, limiter=limiter)
             if not content:
-                print("[INFO] Konten kosong atau gagal diambil.")
+                logger.info("Konten kosong atau gagal diambil.")
                 break
 
-            soup = BeautifulSoup(content, "html.parser")
-            cards_element = soup.find_all('div', class_='collection-card')
-            if not cards_element:
-                print("[INFO] Tidak ada produk ditemukan di halaman ini.")
+            products, has_next = parse_page_cached(url, content, cache, parser)
+            if archive is not None:
+                archive_page(archive, url, content, products)
+            if not products:
+                logger.info("Tidak ada produk ditemukan di halaman ini.")
+                _mark_complete(checkpoint)
                 break
 
-            for card in cards_element:
-                product = extract_product_data(card)
-                data.append(product)
+            if checkpoint is not None:
+                checkpoint.record_page(page_number, products, has_next)
+            yield products
 
-            next_button = soup.find('li', class_='next')
-            if next_button:
+            if has_next:
                 page_number += 1
-                time.sleep(delay)
             else:
+                _mark_complete(checkpoint)
                 break
         except Exception as e:
-            print(f"[ERROR SCRAPING PAGE {page_number}] {e}")
+            logger.error("[ERROR SCRAPING PAGE %s] %s", page_number, e)
             break
 
-    return data
\ No newline at end of file
+
+def scrape_product(base_url, base_url_paged, start_page=1, delay=2, cache=None, parser="auto", checkpoint=None,
+                   limiter=None, archive=None):
+    """Fungsi utama untuk scraping, dilengkapi dengan error handling tiap tahap."""
+    data = []
+    for products in iter_scrape_pages(base_url, base_url_paged, start_page, delay, cache, parser, checkpoint,
+                                      limiter, archive):
+        data.extend(products)
+    return data
+
+
+def iter_scrape_pages_concurrent(base_url, base_url_paged, start_page=1, max_workers=8, rate_limit=5,
+                                 cache=None, parser="auto", checkpoint=None, limiter=None, discover=False,
+                                 parse_pool=None, executor=None, archive=None):
+    """
+    Generator scraping konkuren yang menghasilkan daftar produk per halaman sesuai urutan halaman.
+
+    Halaman dijadwalkan dalam jendela geser berukuran max_workers. Hasil tetap
+    diproses berurutan sesuai nomor halaman, dan proses berhenti pada halaman
+    pertama yang gagal, kosong, atau tidak memiliki tombol next, sama seperti
+    jalur sekuensial.
+
+    Dengan discover=True, halaman terakhir dicari lebih dulu (discover_last_page)
+    sehingga tidak ada request spekulatif melewati halaman terakhir; halaman
+    yang sudah diambil discovery tidak diambil lagi. Bila
+    discovery gagal, atau halaman terakhir ternyata masih punya tombol next,
+    penjadwalan kembali mengikuti tombol next.
+
+    Args:
+        base_url (str): URL halaman pertama.
+        base_url_paged (str): Template URL halaman berikutnya, misal: '.../page{}.html'.
+        start_page (int): Nomor halaman awal.
+        max_workers (int): Jumlah halaman yang diambil bersamaan.
+        rate_limit (float): Laju awal request per detik bila limiter tidak diberikan, None untuk tanpa batas.
+        cache (PageCache): Cache halaman opsional untuk conditional request.
+        parser (str): Backend parser, "auto", "lxml", atau "bs4".
+        checkpoint (ScrapeCheckpoint): Checkpoint opsional untuk melanjutkan run yang terputus.
+        limiter (AdaptiveRateLimiter): Rate limiter bersama, misal yang juga dipakai jalur sekuensial.
+        discover (bool): Cari halaman terakhir sebelum menjadwalkan halaman.
+        parse_pool (ParsePool): Pool proses untuk parsing; halaman diparsing di thread fetch masing-masing
+            sehingga beberapa halaman diparsing paralel, sedangkan tanpa pool parsing berjalan di thread pemanggil.
+        executor (Executor): Thread pool bersama, misal milik scheduler beberapa katalog; max_workers tetap
+            membatasi jumlah halaman situs ini yang berjalan bersamaan. Bila None dibuat pool sendiri.
+        archive (PageArchive): Arsip body halaman mentah; halaman diarsipkan sesuai urutan halaman.
+    """
+    start_page = yield from resume_pages(checkpoint, start_page)
+    if start_page is None:
+        return
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(rate=rate_limit)
+
+    last_page = None
+    prefetched = {}
+    if discover:
+        last_page = discover_last_page(base_url, base_url_paged, cache, limiter, parser, start_page=start_page,
+                                       pages=prefetched)
+        if last_page is None:
+            logger.info("Discovery gagal, halaman ditelusuri lewat tombol next.")
+
+    def fetch(page_number):
+        url = build_page_url(base_url, base_url_paged, page_number)
+        content = prefetched.pop(page_number, None)
+        if content is None:
+            logger.info("Scraping halaman: %s", url)
+            content = fetching_content(url, cache=cache, limiter=limiter)
+        parsed = None
+        if content and parse_pool is not None:
+            parsed = parse_page_cached(url, content, cache, parser, parse_pool)
+        return url, content, parsed
+
+    pending = {}
+    next_to_submit = page_number = start_page
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        while True:
+            while len(pending) < max_workers and (last_page is None or next_to_submit <= last_page):
+                pending[next_to_submit] = executor.submit(fetch, next_to_submit)
+                next_to_submit += 1
+
+            try:
+                url, content, parsed = pending.pop(page_number).result()
+                if not content:
+                    logger.info("Konten kosong atau gagal diambil.")
+                    break
+
+                products, has_next = parsed or parse_page_cached(url, content, cache, parser)
+                if archive is not None:
+                    archive_page(archive, url, content, products)
+                if not products:
+                    logger.info("Tidak ada produk ditemukan di halaman ini.")
+                    _mark_complete(checkpoint)
+                    break
+
+                if checkpoint is not None:
+                    checkpoint.record_page(page_number, products, has_next)
+                yield products
+
+                if last_page is not None and page_number >= last_page and has_next:
+                    logger.info("Halaman %d masih punya tombol next, katalog bertambah sejak discovery.", page_number)
+                    last_page = None
+
+                if has_next:
+                    page_number += 1
+                else:
+                    _mark_complete(checkpoint)
+                    break
+            except Exception as e:
+                logger.error("[ERROR SCRAPING PAGE %s] %s", page_number, e)
+                break
+    finally:
+        # Halaman spekulatif setelah halaman terakhir tidak perlu ditunggu
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            # Pool bersama tetap hidup; hanya halaman milik scraping ini yang dibatalkan
+            for future in pending.values():
+                future.cancel()
+            wait(pending.values())
+
+
+def scrape_product_concurrent(base_url, base_url_paged, start_page=1, max_workers=8, rate_limit=5,
+                              cache=None, parser="auto", checkpoint=None, limiter=None, discover=False,
+                              parse_pool=None, executor=None, archive=None):
+    """Alternatif scrape_product yang mengambil beberapa halaman sekaligus (lihat iter_scrape_pages_concurrent)."""
+    data = []
+    for products in iter_scrape_pages_concurrent(
+        base_url, base_url_paged, start_page, max_workers, rate_limit, cache, parser, checkpoint, limiter, discover,
+        parse_pool, executor, archive,
+    ):
+        data.extend(products)
+    return data
@@ -0,0 +1,230 @@
+import logging
+
+import pandas as pd
+
+from utils.load import NATURAL_KEY, pooled_connection
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Kolom kunci ternormalisasi pada dimensi produk, sejajar dengan NATURAL_KEY
+KEY_COLUMNS = ('title_key', 'size_key', 'gender_key')
+
+# Batas jumlah parameter per query IN agar tetap di bawah batas SQLite
+LOOKUP_BATCH = 300
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def normalize_key(value):
+    """Bentuk kunci identitas: spasi dirapikan dan huruf disamakan, sehingga 'T-Shirt  2' sama dengan 't-shirt 2'."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return ' '.join(str(value).split()).casefold()
+
+
+def _schema(dialect):
+    """DDL tabel history; hanya kolom id yang berbeda antara PostgreSQL dan SQLite."""
+    product_id = 'BIGSERIAL PRIMARY KEY' if dialect == 'postgresql' else 'INTEGER PRIMARY KEY'
+    return [
+        f"""CREATE TABLE IF NOT EXISTS products (
+            product_id {product_id},
+            title_key TEXT NOT NULL,
+            size_key TEXT NOT NULL,
+            gender_key TEXT NOT NULL,
+            title TEXT NOT NULL,
+            size TEXT,
+            gender TEXT,
+            first_seen TIMESTAMP NOT NULL,
+            last_seen TIMESTAMP NOT NULL
+        )""",
+        # Identitas produk; sekaligus melayani pencarian per judul (kolom pertama index)
+        "CREATE UNIQUE INDEX IF NOT EXISTS products_identity ON products (title_key, size_key, gender_key)",
+        """CREATE TABLE IF NOT EXISTS observations (
+            product_id BIGINT NOT NULL REFERENCES products (product_id),
+            observed_at TIMESTAMP NOT NULL,
+            price DOUBLE PRECISION,
+            rating DOUBLE PRECISION,
+            colors INTEGER,
+            PRIMARY KEY (product_id, observed_at)
+        )""",
+        # Query rentang waktu lintas produk (misal snapshot per tanggal)
+        "CREATE INDEX IF NOT EXISTS observations_observed_at ON observations (observed_at)",
+    ]
+
+
+def _create_schema(conn):
+    """Membuat tabel products dan observations beserta index-nya bila belum ada."""
+    from sqlalchemy import text
+
+    for statement in _schema(conn.dialect.name):
+        conn.execute(text(statement))
+
+
+def _observations_frame(data):
+    """Satu baris per identitas produk dengan kunci ternormalisasi dan Timestamp terurai."""
+    frame = pd.DataFrame({
+        'title': data['Title'].astype(str),
+        'size': data['Size'].astype(object),
+        'gender': data['Gender'].astype(object),
+    })
+    for column, key_column in zip(NATURAL_KEY, KEY_COLUMNS):
+        frame[key_column] = data[column].map(normalize_key)
+    observed_at = pd.to_datetime(data['Timestamp'], errors='coerce')
+    frame['observed_at'] = observed_at.dt.strftime(TIMESTAMP_FORMAT)
+    frame['price'] = data['Price'].astype(float)
+    frame['rating'] = data['Rating'].astype(float)
+    frame['colors'] = data['Colors'].astype('Int64')
+    frame = frame[observed_at.notna().values]
+    return frame.drop_duplicates(subset=list(KEY_COLUMNS), keep='last')
+
+
+def _records(frame, columns):
+    """Baris sebagai dict parameter query: NaN/NA menjadi None dan nilai numpy menjadi tipe Python."""
+    values = frame[list(columns)].astype(object)
+    values = values.where(values.notna(), None)
+    return [dict(zip(columns, row)) for row in values.values.tolist()]
+
+
+def store_to_history(data, db_url, replace=False):
+    """
+    Menyimpan hasil transform_data sebagai time series harga/rating per produk.
+
+    Produk dicatat sekali di tabel products dengan identitas Title/Size/Gender
+    yang dinormalisasi, dan setiap run menambahkan satu observasi per produk
+    ke tabel observations dengan Timestamp sebagai waktu (bukan teks). Observasi
+    dengan produk dan waktu yang sama diabaikan, sehingga run yang diulang tidak
+    menggandakan data.
+
+    Args:
+        data (pd.DataFrame): Data hasil transform_data.
+        db_url (str): URL database SQLAlchemy.
+        replace (bool): Timpa observasi dengan produk dan waktu yang sama, misal saat
+            memutar ulang arsip halaman dengan aturan pembersihan yang baru.
+
+    Returns:
+        int: Jumlah observasi baru (atau yang ditimpa bila replace=True), atau None bila terjadi kesalahan.
+    """
+    # SQLAlchemy di-import saat dipakai, sejalan dengan backend sink di utils.load
+    from sqlalchemy import text
+
+    try:
+        with metrics.timer("load.history"):
+            frame = _observations_frame(data)
+            if frame.empty:
+                return 0
+
+            with pooled_connection(db_url, begin=True) as conn:
+                _create_schema(conn)
+
+                # Dimensi produk: first_seen/last_seen melebar ke observasi terlama/terbaru,
+                # sehingga data lama yang dimuat belakangan (misal replay arsip) tetap tercatat benar
+                conn.execute(text(
+                    "INSERT INTO products (title_key, size_key, gender_key, title, size, gender, first_seen, last_seen) "
+                    "VALUES (:title_key, :size_key, :gender_key, :title, :size, :gender, "
+                    ":observed_at, :observed_at) "
+                    "ON CONFLICT (title_key, size_key, gender_key) DO UPDATE SET "
+                    "title = excluded.title, size = excluded.size, gender = excluded.gender, "
+                    "first_seen = CASE WHEN excluded.first_seen < products.first_seen "
+                    "THEN excluded.first_seen ELSE products.first_seen END, "
+                    "last_seen = CASE WHEN excluded.last_seen > products.last_seen "
+                    "THEN excluded.last_seen ELSE products.last_seen END"
+                ), _records(frame, ('title_key', 'size_key', 'gender_key', 'title', 'size', 'gender', 'observed_at')))
+
+                product_ids = {}
+                keys = [tuple(row) for row in frame[list(KEY_COLUMNS)].itertuples(index=False)]
+                titles = sorted({key[0] for key in keys})
+                for offset in range(0, len(titles), LOOKUP_BATCH):
+                    batch = titles[offset:offset + LOOKUP_BATCH]
+                    placeholders = ', '.join(f":t{i}" for i in range(len(batch)))
+                    rows = conn.execute(text(
+                        f"SELECT product_id, title_key, size_key, gender_key FROM products "
+                        f"WHERE title_key IN ({placeholders})"
+                    ), {f"t{i}": title for i, title in enumerate(batch)})
+                    for product_id, *key in rows:
+                        product_ids[tuple(key)] = product_id
+
+                frame = frame.assign(product_id=[product_ids[key] for key in keys])
+                on_conflict = (
+                    "DO UPDATE SET price = excluded.price, rating = excluded.rating, colors = excluded.colors"
+                    if replace else "DO NOTHING"
+                )
+                result = conn.execute(text(
+                    "INSERT INTO observations (product_id, observed_at, price, rating, colors) "
+                    "VALUES (:product_id, :observed_at, :price, :rating, :colors) "
+                    f"ON CONFLICT (product_id, observed_at) {on_conflict}"
+                ), _records(frame, ('product_id', 'observed_at', 'price', 'rating', 'colors')))
+                inserted = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(frame)
+
+        logger.info("%d observasi baru disimpan ke history (%d produk).", inserted, len(frame))
+        return inserted
+
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat menyimpan history: %s", e)
+        return None
+
+
+def latest_snapshot(db_url):
+    """
+    Observasi terbaru setiap produk, dengan kolom seperti output transform_data.
+
+    Memakai products.last_seen sehingga setiap produk cukup satu lookup primary
+    key ke observations, tanpa memindai seluruh history.
+
+    Returns:
+        pd.DataFrame: Snapshot terbaru, atau None bila terjadi kesalahan.
+    """
+    from sqlalchemy import text
+
+    try:
+        with metrics.timer("history.latest_snapshot"):
+            with pooled_connection(db_url) as conn:
+                snapshot = pd.read_sql(text(
+                    'SELECT p.title AS "Title", o.price AS "Price", o.rating AS "Rating", o.colors AS "Colors", '
+                    'p.size AS "Size", p.gender AS "Gender", o.observed_at AS "Timestamp" '
+                    'FROM products p JOIN observations o '
+                    'ON o.product_id = p.product_id AND o.observed_at = p.last_seen '
+                    'ORDER BY p.title_key, p.size_key, p.gender_key'
+                ), conn, parse_dates=['Timestamp'])
+        return snapshot
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat membaca snapshot terbaru: %s", e)
+        return None
+
+
+def price_history(title, db_url, size=None, gender=None):
+    """
+    Riwayat harga dan rating satu judul produk, urut waktu.
+
+    Judul dicocokkan dalam bentuk ternormalisasi lewat index identitas produk;
+    size dan gender opsional untuk mempersempit ke satu varian.
+
+    Returns:
+        pd.DataFrame: Kolom Timestamp, Price, Rating, Colors, Size, Gender; None bila terjadi kesalahan.
+    """
+    from sqlalchemy import text
+
+    try:
+        conditions = ['p.title_key = :title_key']
+        params = {'title_key': normalize_key(title)}
+        if size is not None:
+            conditions.append('p.size_key = :size_key')
+            params['size_key'] = normalize_key(size)
+        if gender is not None:
+            conditions.append('p.gender_key = :gender_key')
+            params['gender_key'] = normalize_key(gender)
+
+        with metrics.timer("history.price_history"):
+            with pooled_connection(db_url) as conn:
+                history = pd.read_sql(text(
+                    'SELECT o.observed_at AS "Timestamp", o.price AS "Price", o.rating AS "Rating", '
+                    'o.colors AS "Colors", p.size AS "Size", p.gender AS "Gender" '
+                    'FROM products p JOIN observations o ON o.product_id = p.product_id '
+                    f'WHERE {" AND ".join(conditions)} '
+                    'ORDER BY o.observed_at, p.size_key, p.gender_key'
+                ), conn, params=params, parse_dates=['Timestamp'])
+        return history
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat membaca riwayat harga %s: %s", title, e)
+        return None
+
@@ -0,0 +1,158 @@
+import json
+import logging
+import sqlite3
+
+import pandas as pd
+
+from datetime import datetime
+
+from utils.load import NATURAL_KEY
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Kolom yang berubah setiap run dan tidak dianggap perubahan data
+EXCLUDED_COLUMNS = ('Timestamp',)
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_state (
+    key TEXT PRIMARY KEY,
+    key_values TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+class ChangeSet:
+    """Hasil perbandingan data run ini dengan state run sebelumnya."""
+
+    def __init__(self, new, changed, removed, unchanged, state_updates, removed_keys):
+        self.new = new
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+        # Baris state yang ditulis commit_state setelah sink berhasil
+        self.state_updates = state_updates
+        self.removed_keys = removed_keys
+
+    @property
+    def upserts(self):
+        """Baris baru dan berubah yang perlu ditulis ke sink."""
+        return pd.concat([self.new, self.changed], ignore_index=True)
+
+    @property
+    def is_empty(self):
+        return self.new.empty and self.changed.empty and self.removed.empty
+
+    def summary(self):
+        return {
+            'new': len(self.new),
+            'changed': len(self.changed),
+            'removed': len(self.removed),
+            'unchanged': self.unchanged,
+        }
+
+
+def fingerprint_rows(data, key=NATURAL_KEY, exclude=EXCLUDED_COLUMNS):
+    """
+    Menghitung kunci dan fingerprint setiap baris produk.
+
+    Nilai dinormalisasi menjadi string dan kolom diurutkan berdasarkan nama agar
+    fingerprint tetap sama antar run walaupun dtype atau urutan kolom berbeda.
+
+    Returns:
+        pd.DataFrame: Kolom 'key' dan 'fingerprint' (int64), index sama dengan data.
+    """
+    columns = sorted(column for column in data.columns if column not in exclude)
+    values = data[columns].astype(str)
+    keys = values[key[0]].str.cat([values[column] for column in key[1:]], sep='\x1f')
+    fingerprints = pd.util.hash_pandas_object(values, index=False).values.view('int64')
+    return pd.DataFrame({'key': keys, 'fingerprint': fingerprints}, index=data.index)
+
+
+def _connect(state_path):
+    conn = sqlite3.connect(state_path)
+    conn.execute(STATE_SCHEMA)
+    return conn
+
+
+def load_state(state_path):
+    """Membaca fingerprint run sebelumnya dari file SQLite."""
+    conn = _connect(state_path)
+    try:
+        return pd.read_sql_query('SELECT key, key_values, fingerprint FROM product_state', conn)
+    finally:
+        conn.close()
+
+
+def detect_changes(data, state_path, key=NATURAL_KEY, max_removed_ratio=0.5):
+    """
+    Membandingkan data hasil transform_data dengan state run sebelumnya.
+
+    Args:
+        data (pd.DataFrame): Data hasil transform_data.
+        state_path (str): Path file SQLite penyimpan state.
+        key (tuple): Kolom kunci alami produk.
+        max_removed_ratio (float): Bila proporsi produk yang hilang melebihi batas ini,
+            penghapusan diabaikan karena kemungkinan besar scraping berhenti di tengah jalan.
+
+    Returns:
+        ChangeSet: Baris baru, berubah, dan kunci yang terhapus.
+    """
+    with metrics.timer("incremental"):
+        data = data.drop_duplicates(subset=list(key), keep='last').reset_index(drop=True)
+        current = fingerprint_rows(data, key)
+        previous = load_state(state_path)
+
+        merged = current.merge(previous[['key', 'fingerprint']], on='key', how='left', suffixes=('', '_previous'))
+        is_new = merged['fingerprint_previous'].isna().values
+        is_changed = ~is_new & (merged['fingerprint'] != merged['fingerprint_previous']).values
+
+        removed_state = previous[~previous['key'].isin(current['key'])]
+        if len(previous) and len(removed_state) / len(previous) > max_removed_ratio:
+            logger.warning(
+                "%d dari %d produk tidak ditemukan; penghapusan dilewati karena melebihi batas %.0f%%.",
+                len(removed_state), len(previous), max_removed_ratio * 100,
+            )
+            removed_state = removed_state.iloc[0:0]
+        removed = pd.DataFrame(
+            [json.loads(values) for values in removed_state['key_values']], columns=list(key)
+        )
+
+        touched = is_new | is_changed
+        state_updates = current[touched].copy()
+        state_updates['key_values'] = [
+            json.dumps(list(values)) for values in data.loc[touched, list(key)].astype(str).itertuples(index=False)
+        ]
+
+        changes = ChangeSet(
+            new=data[is_new].reset_index(drop=True),
+            changed=data[is_changed].reset_index(drop=True),
+            removed=removed,
+            unchanged=int((~touched).sum()),
+            state_updates=state_updates,
+            removed_keys=removed_state['key'].tolist(),
+        )
+
+    logger.info("Perubahan data: %s", changes.summary())
+    return changes
+
+
+def commit_state(changes, state_path):
+    """Menyimpan fingerprint baris baru/berubah dan menghapus kunci yang hilang; dipanggil setelah sink berhasil."""
+    updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = _connect(state_path)
+    try:
+        with conn:
+            conn.executemany(
+                'INSERT INTO product_state (key, key_values, fingerprint, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET fingerprint = excluded.fingerprint, updated_at = excluded.updated_at',
+                [
+                    (row.key, row.key_values, int(row.fingerprint), updated_at)
+                    for row in changes.state_updates.itertuples(index=False)
+                ],
+            )
+            conn.executemany('DELETE FROM product_state WHERE key = ?', [(key,) for key in changes.removed_keys])
+    finally:
+        conn.close()
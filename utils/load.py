@@ -1,66 +1,717 @@
-from sqlalchemy import create_engine
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import atexit
+import importlib.util
+import io
+import logging
+import os
+import re
+import shutil
+import threading
+import time
 import pandas as pd
+
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.metrics import metrics
+
+# Backend sink (SQLAlchemy, Google API client, pyarrow) di-import di dalam fungsi
+# yang memakainya, bukan saat modul di-import, supaya run kecil (misal incremental
+# via cron) tidak membayar waktu import backend yang sink-nya tidak dipakai.
+
+# pyarrow opsional, hanya dibutuhkan sink Parquet/Feather; dicek tanpa meng-import-nya
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+logger = logging.getLogger(__name__)
+
+# Opsi pool default untuk setiap engine di registry
+ENGINE_OPTIONS = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+_engines = {}
+_engine_stats = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_url, **options):
+    """
+    Mengembalikan engine SQLAlchemy ber-pool untuk db_url; engine dibuat sekali lalu dipakai ulang.
+
+    Args:
+        db_url (str): URL database SQLAlchemy.
+        **options: Opsi create_engine yang menimpa ENGINE_OPTIONS (misal pool_size, pool_pre_ping).
+            Hanya dipakai saat engine untuk URL tersebut pertama kali dibuat.
+    """
+    from sqlalchemy import create_engine
+
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine_options = dict(ENGINE_OPTIONS, **options)
+            try:
+                engine = create_engine(db_url, **engine_options)
+            except TypeError:
+                # Pool tertentu (misal SQLite in-memory) tidak menerima opsi ukuran pool
+                engine_options.pop("pool_size", None)
+                engine_options.pop("max_overflow", None)
+                engine = create_engine(db_url, **engine_options)
+            _engines[db_url] = engine
+            _engine_stats[db_url] = {"checkouts": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+        return engine
+
+
+@contextmanager
+def pooled_connection(db_url, begin=False):
+    """
+    Meminjam koneksi dari engine di registry dan mencatat lama menunggu checkout.
+
+    Args:
+        db_url (str): URL database SQLAlchemy.
+        begin (bool): Bungkus koneksi dalam transaksi yang di-commit otomatis.
+    """
+    engine = get_engine(db_url)
+    start = time.perf_counter()
+    with (engine.begin() if begin else engine.connect()) as conn:
+        wait = time.perf_counter() - start
+        with _engines_lock:
+            stats = _engine_stats.get(db_url)
+            if stats is not None:
+                stats["checkouts"] += 1
+                stats["wait_seconds"] += wait
+                stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+        yield conn
+
+
+def engine_pool_stats():
+    """Statistik pool per URL: jumlah checkout, total/maks waktu tunggu, dan isi pool saat ini."""
+    report = {}
+    with _engines_lock:
+        for db_url, engine in _engines.items():
+            stats = dict(_engine_stats[db_url])
+            pool = engine.pool
+            for name in ("size", "checkedout", "overflow"):
+                method = getattr(pool, name, None)
+                if callable(method):
+                    stats[name] = method()
+            report[str(engine.url)] = stats
+    return report
+
+
+def dispose_engines():
+    """
+    Menutup semua engine di registry beserta koneksi di dalam pool-nya.
+
+    Engine yang koneksinya masih dipinjam (misal sink yang melewati timeout dan
+    masih berjalan di thread-nya) dilewati dan tetap di registry, agar koneksi
+    yang sedang dipakai tidak ditutup dari bawahnya.
+    """
+    with _engines_lock:
+        for db_url, engine in list(_engines.items()):
+            checkedout = getattr(engine.pool, "checkedout", None)
+            if callable(checkedout) and checkedout():
+                logger.warning("Engine %s masih memakai %d koneksi, tidak ditutup.", engine.url, checkedout())
+                continue
+            engine.dispose()
+            del _engines[db_url]
+            del _engine_stats[db_url]
+
+
+atexit.register(dispose_engines)
  
 def store_to_postgre(data, db_url):
     """Fungsi untuk menyimpan data ke dalam PostgreSQL."""
     try:
-        # Membuat engine database
-        engine = create_engine(db_url)
-        
-        # Menyimpan data ke tabel 'fashionstudio' jika tabel sudah ada, data akan ditambahkan (append)
-        with engine.connect() as con:
-            data.to_sql('fashionstudio', con=con, if_exists='append', index=False)
-            print("Data berhasil ditambahkan!")
+        with metrics.timer("load.postgre"):
+            # Menyimpan data ke tabel 'fashionstudio' jika tabel sudah ada, data akan ditambahkan (append)
+            with pooled_connection(db_url) as con:
+                data.to_sql('fashionstudio', con=con, if_exists='append', index=False)
+        logger.info("%d baris berhasil ditambahkan ke PostgreSQL.", len(data))
+        return len(data)
     
     except Exception as e:
-        print(f"Terjadi kesalahan saat menyimpan data: {e}")
-        
+        logger.error("Terjadi kesalahan saat menyimpan data: %s", e)
+        return None
+
+
+# Kunci alami produk: satu baris per kombinasi judul, ukuran, dan gender
+NATURAL_KEY = ('Title', 'Size', 'Gender')
+
+
+def _python_rows(data):
+    """Baris DataFrame sebagai nilai yang bisa di-bind driver DB-API: NaN/NA menjadi None, datetime menjadi teks."""
+    datetime_columns = [column for column in data.columns if pd.api.types.is_datetime64_any_dtype(data[column])]
+    if datetime_columns:
+        data = data.copy()
+        for column in datetime_columns:
+            data[column] = data[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+    return data.astype(object).where(data.notna(), None).values.tolist()
+
+
+def _copy_into(conn, table, columns, data):
+    """Memuat DataFrame ke tabel memakai COPY FROM STDIN (psycopg2), atau executemany untuk database lain."""
+    dbapi_conn = conn.connection.dbapi_connection
+    cursor = dbapi_conn.cursor()
+    try:
+        if conn.dialect.name == 'postgresql' and hasattr(cursor, 'copy_expert'):
+            buffer = io.StringIO()
+            data.to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        else:
+            placeholders = ', '.join(['?' if conn.dialect.paramstyle == 'qmark' else '%s'] * len(columns))
+            cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", _python_rows(data))
+    finally:
+        cursor.close()
+
+
+def _ensure_natural_key_index(conn, table, key):
+    """
+    Membuat unique index kunci alami pada tabel, sekali saja.
+
+    Tabel yang diisi loader append lama (store_to_postgre) menyimpan salinan
+    katalog dari setiap run, sehingga sebelum index pertama kali dibuat baris
+    dengan kunci sama dihapus dan hanya baris yang terakhir ditambahkan yang
+    disisakan.
+    """
+    from sqlalchemy import inspect, text
+
+    index = f'{table}_natural_key'
+    if any(existing['name'] == index for existing in inspect(conn).get_indexes(table)):
+        return
+
+    quote = conn.dialect.identifier_preparer.quote
+    # Urutan fisik baris; pada tabel yang hanya ditambah (append) sama dengan urutan penulisan
+    row_id = 'ctid' if conn.dialect.name == 'postgresql' else 'rowid'
+    same_key = ' AND '.join(f"newer.{quote(column)} = old.{quote(column)}" for column in key)
+    removed = conn.execute(text(
+        f"DELETE FROM {quote(table)} AS old WHERE EXISTS ("
+        f"SELECT 1 FROM {quote(table)} AS newer WHERE {same_key} AND newer.{row_id} > old.{row_id})"
+    )).rowcount
+    if removed:
+        logger.warning("%d baris duplikat kunci alami dihapus dari %s sebelum membuat unique index.",
+                       removed, table)
+    conn.execute(text(f"CREATE UNIQUE INDEX {quote(index)} ON {quote(table)} "
+                      f"({', '.join(quote(column) for column in key)})"))
+
+
+def store_to_postgre_upsert(data, db_url, table='fashionstudio', key=NATURAL_KEY):
+    """
+    Menyimpan data ke PostgreSQL secara bulk dengan semantik upsert.
+
+    Data dimuat ke tabel staging lewat COPY FROM STDIN, lalu digabung ke tabel
+    tujuan dengan INSERT ... ON CONFLICT pada kunci alami, semuanya dalam satu
+    transaksi. Tabel tujuan dan unique index pada kunci dibuat bila belum ada
+    (lihat _ensure_natural_key_index untuk tabel lama yang berisi duplikat).
+
+    Args:
+        data (pd.DataFrame): Data hasil transform_data.
+        db_url (str): URL database SQLAlchemy.
+        table (str): Nama tabel tujuan.
+        key (tuple): Kolom kunci alami.
+
+    Returns:
+        dict: {'inserted': baris baru, 'updated': baris yang nilainya berubah,
+        'unchanged': baris yang sudah ada dan hanya diperbarui Timestamp-nya},
+        atau None bila terjadi kesalahan.
+    """
+    from sqlalchemy import text
+
+    try:
+        with metrics.timer("load.postgre"):
+            # Kunci yang sama dalam satu batch akan ditolak ON CONFLICT, ambil yang terakhir
+            data = data.drop_duplicates(subset=list(key), keep='last')
+
+            with pooled_connection(db_url, begin=True) as conn:
+                quote = conn.dialect.identifier_preparer.quote
+                target = quote(table)
+                staging = quote(f"{table}_staging")
+                columns = [quote(column) for column in data.columns]
+                key_columns = [quote(column) for column in key]
+                value_columns = [quote(column) for column in data.columns if column not in key]
+                compared_columns = [quote(column) for column in data.columns
+                                    if column not in key and column != 'Timestamp']
+                distinct = 'IS DISTINCT FROM' if conn.dialect.name == 'postgresql' else 'IS NOT'
+
+                # Tabel tujuan dibuat dari skema DataFrame bila belum ada
+                data.head(0).to_sql(table, con=conn, if_exists='append', index=False)
+                _ensure_natural_key_index(conn, table, key)
+                if conn.dialect.name == 'postgresql':
+                    conn.execute(text(
+                        f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS SELECT * FROM {target} WHERE 1 = 0"
+                    ))
+                else:
+                    # SQLite tidak mengenal ON COMMIT DROP; staging dihapus eksplisit, selalu dari skema temp
+                    conn.execute(text(f"DROP TABLE IF EXISTS temp.{staging}"))
+                    conn.execute(text(f"CREATE TEMPORARY TABLE {staging} AS SELECT * FROM {target} WHERE 1 = 0"))
+
+                _copy_into(conn, staging, columns, data)
+
+                join = ' AND '.join(f"s.{column} = t.{column}" for column in key_columns)
+                existing = conn.execute(text(f"SELECT COUNT(*) FROM {staging} s JOIN {target} t ON {join}")).scalar()
+                changed = 0
+                if compared_columns:
+                    differs = ' OR '.join(f"s.{column} {distinct} t.{column}" for column in compared_columns)
+                    changed = conn.execute(text(
+                        f"SELECT COUNT(*) FROM {staging} s JOIN {target} t ON {join} WHERE {differs}"
+                    )).scalar()
+
+                if value_columns:
+                    conflict_action = "DO UPDATE SET " + ', '.join(
+                        f"{column} = excluded.{column}" for column in value_columns
+                    )
+                else:
+                    conflict_action = "DO NOTHING"
+                # WHERE true diperlukan SQLite agar ON CONFLICT tidak dibaca sebagai bagian dari SELECT
+                conn.execute(text(
+                    f"INSERT INTO {target} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(columns)} FROM {staging} WHERE true "
+                    f"ON CONFLICT ({', '.join(key_columns)}) {conflict_action}"
+                ))
+                if conn.dialect.name != 'postgresql':
+                    conn.execute(text(f"DROP TABLE temp.{staging}"))
+
+        result = {'inserted': len(data) - existing, 'updated': changed, 'unchanged': existing - changed}
+        logger.info("Upsert %s: %d baru, %d berubah, %d tidak berubah.",
+                    table, result['inserted'], result['updated'], result['unchanged'])
+        return result
+
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat upsert data ke %s: %s", table, e)
+        return None
+
+
+def delete_from_postgre(keys, db_url, table='fashionstudio', key=NATURAL_KEY):
+    """
+    Menghapus baris berdasarkan kunci alami, misal produk yang sudah tidak ada di katalog.
+
+    Args:
+        keys (pd.DataFrame): Kolom kunci alami dari baris yang dihapus.
+        db_url (str): URL database SQLAlchemy.
+
+    Returns:
+        int: Jumlah baris yang dihapus, atau None bila terjadi kesalahan.
+    """
+    if keys.empty:
+        return 0
+    from sqlalchemy import text
+
+    try:
+        with metrics.timer("load.postgre"):
+            with pooled_connection(db_url, begin=True) as conn:
+                quote = conn.dialect.identifier_preparer.quote
+                condition = ' AND '.join(f"{quote(column)} = :k{i}" for i, column in enumerate(key))
+                params = [
+                    {f"k{i}": value for i, value in enumerate(row)}
+                    for row in keys[list(key)].itertuples(index=False)
+                ]
+                result = conn.execute(text(f"DELETE FROM {quote(table)} WHERE {condition}"), params)
+        logger.info("%d baris dihapus dari %s.", result.rowcount, table)
+        return result.rowcount
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat menghapus data dari %s: %s", table, e)
+        return None
+
+
 # to csv and to google sheet
-def store_to_csv(data, filename="products.csv"):
+def _temp_path(path):
+    """Path sementara di direktori yang sama dengan path, sehingga os.replace bersifat atomik."""
+    return f"{path}.tmp"
+
+
+def _remove_temp(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def store_to_csv(data, filename="products.csv", append=False):
+    """
+    Menyimpan data ke CSV; dengan append=True baris ditambahkan tanpa menulis ulang header.
+
+    Data ditulis ke file sementara lalu dipindahkan dengan os.replace (append
+    menyalin file lama lebih dulu), sehingga penulisan yang terhenti, misal
+    thread sink yang timeout saat proses keluar, tidak meninggalkan CSV terpotong.
+
+    Returns:
+        str | None: Nama file bila berhasil, None bila terjadi error.
+    """
+    tmp_path = _temp_path(filename)
     try:
-        data.to_csv(filename, index=False)
-        print(f"Data berhasil disimpan ke {filename}")
+        with metrics.timer("load.csv"):
+            if append and os.path.exists(filename):
+                shutil.copyfile(filename, tmp_path)
+                data.to_csv(tmp_path, index=False, mode='a', header=False)
+            else:
+                data.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, filename)
+        logger.info("Data berhasil disimpan ke %s", filename)
+        return filename
     except Exception as e:
-        print(f"Terjadi kesalahan saat menyimpan data ke CSV: {e}")
+        _remove_temp(tmp_path)
+        logger.error("Terjadi kesalahan saat menyimpan data ke CSV: %s", e)
+        return None
         
-def store_to_google_sheets(data, spreadsheet_id, range_name, creds_path):
+# Format kolumnar yang didukung store_to_columnar beserta kompresi yang valid
+COLUMNAR_COMPRESSION = {
+    'parquet': ('zstd', 'snappy', 'gzip', 'lz4', 'none'),
+    'feather': ('zstd', 'lz4', 'none'),
+}
+
+# Kolom partisi yang diturunkan dari Timestamp
+PARTITION_COLUMN = 'scrape_date'
+
+
+def product_schema(partitioned=False):
+    """Schema Arrow eksplisit untuk output transform_data."""
+    import pyarrow as pa
+
+    fields = [
+        ('Title', pa.string()),
+        ('Price', pa.float64()),
+        ('Rating', pa.float64()),
+        ('Colors', pa.int64()),
+        ('Size', pa.dictionary(pa.int32(), pa.string())),
+        ('Gender', pa.dictionary(pa.int32(), pa.string())),
+        ('Timestamp', pa.timestamp('s')),
+    ]
+    if partitioned:
+        fields.append((PARTITION_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+def _to_arrow(data, partitioned=False):
+    import pyarrow as pa
+
+    frame = data.copy()
+    frame['Timestamp'] = pd.to_datetime(frame['Timestamp'])
+    if partitioned:
+        frame[PARTITION_COLUMN] = frame['Timestamp'].dt.strftime('%Y-%m-%d')
+    schema = product_schema(partitioned)
+    if frame['Rating'].dtype == 'float32':
+        # Rating float32 (compact_dtypes) disimpan apa adanya agar nilainya tidak melebar
+        schema = schema.set(schema.get_field_index('Rating'), pa.field('Rating', pa.float32()))
+    return pa.Table.from_pandas(frame[schema.names], schema=schema, preserve_index=False)
+
+
+def _publish_partitions(staging, path, replace=False):
+    """
+    Memindahkan file partisi dari direktori staging ke dataset dengan os.replace.
+
+    Dengan replace=True file lama di partisi yang ditulis dihapus setelah file
+    baru terpasang, sehingga partisi tidak pernah kosong atau terpotong.
+    """
+    stale = []
+    for root, _, files in os.walk(staging):
+        if not files:
+            continue
+        target = os.path.join(path, os.path.relpath(root, staging))
+        os.makedirs(target, exist_ok=True)
+        if replace:
+            stale.extend(os.path.join(target, name) for name in os.listdir(target)
+                         if os.path.isfile(os.path.join(target, name)))
+        for name in files:
+            os.replace(os.path.join(root, name), os.path.join(target, name))
+    for stale_path in stale:
+        os.remove(stale_path)
+
+
+def store_to_columnar(data, path, format='parquet', compression='zstd', partition_by_date=False, append=False):
+    """
+    Menyimpan data ke Parquet atau Feather (Arrow IPC) dengan schema eksplisit.
+
+    Dengan partition_by_date=True, path berupa direktori dataset berpartisi Hive
+    (scrape_date=YYYY-MM-DD). Tanpa append, partisi tanggal yang ditulis diganti
+    sedangkan partisi tanggal lain tetap ada; dengan append=True file baru
+    ditambahkan ke partisi yang sama (dipakai mode --stream).
+
+    File ditulis ke lokasi sementara lalu dipindahkan dengan os.replace, sehingga
+    penulisan yang terhenti tidak meninggalkan file terpotong di dataset.
+
+    Args:
+        data (pd.DataFrame): Data hasil transform_data.
+        path (str): File tujuan, atau direktori bila partition_by_date=True.
+        format (str): 'parquet' atau 'feather'.
+        compression (str): Kompresi, lihat COLUMNAR_COMPRESSION.
+        partition_by_date (bool): Partisi berdasarkan tanggal scraping.
+        append (bool): Tambahkan file ke partisi yang ada; butuh partition_by_date=True.
+
+    Returns:
+        str | None: Path tujuan bila berhasil, None bila terjadi error.
+    """
+    if not PYARROW_AVAILABLE:
+        logger.error("pyarrow belum terpasang; sink %s dilewati.", format)
+        return None
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+
+    try:
+        if compression not in COLUMNAR_COMPRESSION.get(format, ()):
+            raise ValueError(f"Kombinasi format/kompresi tidak didukung: {format}/{compression}")
+        if append and not partition_by_date:
+            raise ValueError("append hanya didukung untuk dataset berpartisi (partition_by_date=True)")
+        # Arrow IPC memakai None untuk tanpa kompresi
+        codec = None if compression == 'none' else compression
+
+        with metrics.timer(f"load.{format}"):
+            table = _to_arrow(data, partitioned=partition_by_date)
+            if partition_by_date:
+                if format == 'parquet':
+                    file_format = pa_dataset.ParquetFileFormat()
+                    file_options = file_format.make_write_options(compression=compression)
+                else:
+                    file_format = pa_dataset.IpcFileFormat()
+                    file_options = file_format.make_write_options(compression=codec)
+                run_id = datetime.now().strftime('%Y%m%d%H%M%S%f')
+                # Direktori berawalan titik diabaikan pembaca dataset pyarrow
+                staging = os.path.join(path, f".tmp-{run_id}")
+                try:
+                    pa_dataset.write_dataset(
+                        table,
+                        staging,
+                        format=file_format,
+                        file_options=file_options,
+                        partitioning=pa_dataset.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]),
+                                                             flavor='hive'),
+                        basename_template=f"part-{run_id}-{{i}}.{format}",
+                    )
+                    _publish_partitions(staging, path, replace=not append)
+                finally:
+                    _remove_temp(staging)
+            else:
+                tmp_path = _temp_path(path)
+                try:
+                    if format == 'parquet':
+                        pa_parquet.write_table(table, tmp_path, compression=compression)
+                    else:
+                        pa_feather.write_feather(table, tmp_path, compression=codec or 'uncompressed')
+                    os.replace(tmp_path, path)
+                finally:
+                    _remove_temp(tmp_path)
+        logger.info("%d baris berhasil disimpan ke %s (%s, %s).", len(data), path, format, compression)
+        return path
+    except Exception as e:
+        logger.error("Terjadi kesalahan saat menyimpan data ke %s: %s", format, e)
+        return None
+
+
+def read_columnar(path, format='parquet', columns=None):
+    """
+    Membaca output store_to_columnar ke DataFrame.
+
+    File tunggal dibaca dengan memory map; direktori dibaca sebagai dataset
+    berpartisi Hive sehingga kolom scrape_date ikut tersedia.
+    """
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+
+    if os.path.isdir(path):
+        file_format = 'parquet' if format == 'parquet' else 'ipc'
+        dataset = pa_dataset.dataset(path, format=file_format, partitioning='hive')
+        return dataset.to_table(columns=columns).to_pandas()
+    if format == 'parquet':
+        return pa_parquet.read_table(path, columns=columns, memory_map=True).to_pandas()
+    return pa_feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
+# Jumlah baris maksimum per request batchUpdate/append ke Google Sheets
+SHEETS_BATCH_ROWS = 500
+
+_sheets_services = {}
+_sheets_lock = threading.Lock()
+
+
+def get_sheets_service(creds_path):
+    """Mengembalikan service Google Sheets untuk creds_path; dibangun sekali lalu dipakai ulang."""
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
+    with _sheets_lock:
+        service = _sheets_services.get(creds_path)
+        if service is None:
+            creds = service_account.Credentials.from_service_account_file(creds_path, scopes=SHEETS_SCOPES)
+            service = build('sheets', 'v4', credentials=creds)
+            _sheets_services[creds_path] = service
+        return service
+
+
+def clear_sheets_services():
+    """Menghapus cache service Google Sheets."""
+    with _sheets_lock:
+        _sheets_services.clear()
+
+
+def _execute_with_retry(request, retries=5, backoff=1.0):
+    """Menjalankan request Google API dan mengulanginya dengan backoff eksponensial saat kena 429/5xx."""
+    from googleapiclient.errors import HttpError
+
+    for attempt in range(retries + 1):
+        try:
+            return request.execute()
+        except HttpError as e:
+            status = getattr(e.resp, 'status', None)
+            if int(status or 0) not in (429, 500, 503) or attempt == retries:
+                raise
+            wait = backoff * (2 ** attempt)
+            logger.warning("Google Sheets menjawab %s, mencoba lagi dalam %.1f detik.", status, wait)
+            time.sleep(wait)
+
+
+def _parse_a1(range_name):
+    """Memecah 'Sheet1!B2' menjadi ('Sheet1!', 'B', 2)."""
+    match = re.match(r'^(?:(.+)!)?([A-Za-z]+)(\d+)$', range_name)
+    if not match:
+        raise ValueError(f"Range harus berupa sel awal, misal 'Sheet1!A1': {range_name}")
+    sheet, column, row = match.groups()
+    return (f"{sheet}!" if sheet else ''), column.upper(), int(row)
+
+
+def _column_letter(index):
+    """Mengubah indeks kolom berbasis 1 menjadi huruf kolom (1 -> A, 27 -> AA)."""
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index
+
+
+def _changed_blocks(values, current):
+    """Mencari blok baris berurutan yang berbeda dari isi sheet saat ini; hasilnya [(indeks_awal, baris)]."""
+    width = len(values[0]) if values else 0
+    blocks = []
+    start = None
+    for i, row in enumerate(values):
+        existing = current[i] if i < len(current) else []
+        existing = (list(existing) + [''] * width)[:width]
+        if row != existing:
+            if start is None:
+                start = i
+        elif start is not None:
+            blocks.append((start, values[start:i]))
+            start = None
+    if start is not None:
+        blocks.append((start, values[start:]))
+    return blocks
+
+
+def _batch_blocks(blocks, batch_rows):
+    """Membagi blok baris menjadi kelompok request yang masing-masing berisi paling banyak batch_rows baris."""
+    batch, size = [], 0
+    for start, rows in blocks:
+        for offset in range(0, len(rows), batch_rows):
+            piece = rows[offset:offset + batch_rows]
+            if size + len(piece) > batch_rows and batch:
+                yield batch
+                batch, size = [], 0
+            batch.append((start + offset, piece))
+            size += len(piece)
+    if batch:
+        yield batch
+
+
+def store_to_google_sheets(data, spreadsheet_id, range_name, creds_path, append=False, diff=False,
+                           batch_rows=SHEETS_BATCH_ROWS):
     """
     Upload DataFrame ke Google Sheets via Google Sheets API.
 
+    Baris dikirim lewat values().batchUpdate dalam beberapa request berukuran
+    paling banyak batch_rows baris, dan setiap request diulang dengan backoff
+    bila kena rate limit (429).
+
     Args:
         data (pd.DataFrame): Data yang akan diupload.
         spreadsheet_id (str): ID dari Google Sheet.
         range_name (str): Range tujuan, misal: 'Sheet1!A1'.
         creds_path (str): Path ke service account JSON.
+        append (bool): Tambahkan baris di bawah data yang ada tanpa header.
+        diff (bool): Bandingkan dengan isi sheet saat ini dan hanya tulis blok baris yang berubah;
+            baris lama di bawah data baru dikosongkan.
+        batch_rows (int): Jumlah baris maksimum per request.
+
+    Returns:
+        int: Jumlah sel yang ditulis.
     """
     try:
-        # Autentikasi
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-        creds = service_account.Credentials.from_service_account_file(creds_path, scopes=SCOPES)
-        service = build('sheets', 'v4', credentials=creds)
+        with metrics.timer("load.google_sheets"):
+            service = get_sheets_service(creds_path)
+            values_api = service.spreadsheets().values()
+            rows = data.astype(str).values.tolist()
 
-        # Format data: header + isi
-        values = [data.columns.tolist()] + data.astype(str).values.tolist()
-        body = {'values': values}
+            if append:
+                # Hanya isi, ditambahkan setelah baris terakhir tabel yang ada
+                updated_cells = 0
+                for offset in range(0, len(rows), batch_rows):
+                    result = _execute_with_retry(values_api.append(
+                        spreadsheetId=spreadsheet_id,
+                        range=range_name,
+                        valueInputOption='RAW',
+                        insertDataOption='INSERT_ROWS',
+                        body={'values': rows[offset:offset + batch_rows]}
+                    ))
+                    updated_cells += result.get('updates', {}).get('updatedCells', 0) or 0
+                logger.info("%s cells appended to Google Sheets.", updated_cells)
+                return updated_cells
 
-        # Kirim data ke Google Sheets
-        result = service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range=range_name,
-            valueInputOption='RAW',
-            body=body
-        ).execute()
+            # Format data: header + isi
+            values = [[str(column) for column in data.columns]] + rows
+            sheet, column, first_row = _parse_a1(range_name)
+            last_column = _column_letter(_column_index(column) + len(data.columns) - 1)
 
-        print(f"{result.get('updatedCells')} cells updated to Google Sheets.")
+            current = []
+            if diff:
+                current = _execute_with_retry(values_api.get(
+                    spreadsheetId=spreadsheet_id,
+                    range=f"{sheet}{column}{first_row}:{last_column}",
+                )).get('values', [])
+                blocks = _changed_blocks(values, current)
+            else:
+                blocks = [(0, values)]
+
+            # Kirim data ke Google Sheets
+            updated_cells = 0
+            for batch in _batch_blocks(blocks, batch_rows):
+                result = _execute_with_retry(values_api.batchUpdate(
+                    spreadsheetId=spreadsheet_id,
+                    body={
+                        'valueInputOption': 'RAW',
+                        'data': [
+                            {'range': f"{sheet}{column}{first_row + start}", 'values': block}
+                            for start, block in batch
+                        ],
+                    }
+                ))
+                updated_cells += result.get('totalUpdatedCells', 0) or 0
+
+            if len(current) > len(values):
+                _execute_with_retry(values_api.batchClear(
+                    spreadsheetId=spreadsheet_id,
+                    body={'ranges': [f"{sheet}{column}{first_row + len(values)}:{last_column}"]}
+                ))
+
+            logger.info("%s cells updated to Google Sheets (%d blok berubah).", updated_cells, len(blocks))
+            return updated_cells
 
     except FileNotFoundError:
-        print(f"File JSON untuk autentikasi tidak ditemukan di path: {creds_path}")
+        logger.error("File JSON untuk autentikasi tidak ditemukan di path: %s", creds_path)
         raise
     except KeyError as e:
-        print(f"Kunci yang hilang dalam file JSON: {e}")
+        logger.error("Kunci yang hilang dalam file JSON: %s", e)
         raise
     except Exception as e:
-        print(f"Terjadi kesalahan saat menyimpan data ke Google Sheets: {e}")
-        raise
\ No newline at end of file
+        logger.error("Terjadi kesalahan saat menyimpan data ke Google Sheets: %s", e)
+        raise
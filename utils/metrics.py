@@ -0,0 +1,80 @@
+import functools
+import json
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def configure_logging(level="INFO"):
+    """Mengatur format dan level logging untuk seluruh pipeline."""
+    logging.basicConfig(level=getattr(logging, str(level).upper(), logging.INFO), format=LOG_FORMAT)
+
+
+class Metrics:
+    """Kumpulan metrik run: durasi per tahap dan jumlah baris masuk/keluar per langkah pembersihan."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timings = {}
+            self.rows = []
+            self.values = {}
+
+    @contextmanager
+    def timer(self, stage):
+        """Mengukur durasi blok kode dan menjumlahkannya ke tahap yang sama."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Dekorator untuk mengukur durasi setiap pemanggilan fungsi."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            timing = self.timings.setdefault(stage, {"calls": 0, "seconds": 0.0})
+            timing["calls"] += 1
+            timing["seconds"] += seconds
+
+    def record_rows(self, step, rows_in, rows_out):
+        """Mencatat jumlah baris sebelum dan sesudah satu langkah pembersihan."""
+        with self._lock:
+            self.rows.append({"step": step, "rows_in": int(rows_in), "rows_out": int(rows_out)})
+
+    def set_value(self, name, value):
+        """Menyimpan nilai bebas (misal statistik cache) agar ikut tertulis di dump JSON."""
+        with self._lock:
+            self.values[name] = value
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "timings": {stage: dict(timing) for stage, timing in self.timings.items()},
+                "rows": [dict(entry) for entry in self.rows],
+                "values": dict(self.values),
+            }
+
+    def dump_json(self, path):
+        """Menulis metrik ke file JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+# Registry metrik global yang diisi oleh extract, transform, dan load
+metrics = Metrics()
@@ -0,0 +1,85 @@
+import itertools
+import logging
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.extract import parse_page
+
+logger = logging.getLogger(__name__)
+
+# Urutan kolom batch hasil parsing, sama dengan key dict produk
+PRODUCT_COLUMNS = ("Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp")
+
+# Worker tidak di-fork langsung dari proses utama yang sudah berisi banyak thread
+# (fetch, sink): fork bisa mewarisi lock (logging, Metrics) yang sedang dipegang
+# thread lain dan membuat worker macet. forkserver/spawn memulai worker dari
+# proses yang bersih.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def parse_page_columns(content, parser="auto"):
+    """
+    Parsing satu halaman di proses worker; hasilnya batch kolom (dict berisi list) dan penanda halaman berikutnya.
+
+    Batch kolom lebih ringkas untuk dikirim antar proses dibanding list dict
+    karena nama kolom hanya di-pickle sekali per halaman.
+    """
+    products, has_next = parse_page(content, parser)
+    columns = {column: [product[column] for product in products] for column in PRODUCT_COLUMNS}
+    return columns, has_next
+
+
+def rows_from_columns(columns):
+    """Mengubah batch kolom kembali menjadi list dict produk."""
+    return [dict(zip(PRODUCT_COLUMNS, values)) for values in zip(*(columns[column] for column in PRODUCT_COLUMNS))]
+
+
+class ParsePool:
+    """
+    Pool proses untuk tahap parsing HTML yang CPU-bound.
+
+    Executor dibuat sekali di konstruktor (dipanggil dari thread utama) dan
+    proses worker-nya dimulai lewat START_METHOD, lalu dipakai ulang untuk
+    semua halaman. parse() aman dipanggil dari banyak thread sekaligus (misal
+    thread fetch di iter_scrape_pages_concurrent), sehingga parsing beberapa
+    halaman berjalan paralel di core yang berbeda sementara urutan hasil tetap
+    ditentukan oleh pemanggil.
+
+    Args:
+        workers (int): Jumlah proses worker, default jumlah CPU.
+        parser (str): Backend parser, "auto", "lxml", atau "bs4".
+    """
+
+    def __init__(self, workers=None, parser="auto"):
+        self.workers = workers or os.cpu_count() or 1
+        self.parser = parser
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context(START_METHOD))
+
+    def submit(self, content):
+        """Mengirim satu halaman ke worker; hasil future berupa (batch kolom, ada_halaman_berikutnya)."""
+        return self._executor.submit(parse_page_columns, content, self.parser)
+
+    def parse(self, content):
+        """Parsing satu halaman di worker; hasilnya sama dengan parse_page (list dict produk, ada_halaman_berikutnya)."""
+        columns, has_next = self.submit(content).result()
+        return rows_from_columns(columns), has_next
+
+    def map(self, contents, chunksize=1):
+        """Parsing banyak halaman sekaligus; hasil dikembalikan sesuai urutan input."""
+        for columns, has_next in self._executor.map(
+            parse_page_columns, contents, itertools.repeat(self.parser), chunksize=chunksize
+        ):
+            yield rows_from_columns(columns), has_next
+
+    def close(self):
+        """Menghentikan semua proses worker."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,134 @@
+import logging
+
+from datetime import datetime
+
+from bs4 import UnicodeDammit
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml opsional, extract akan memakai BeautifulSoup
+    etree = lxml_html = None
+
+LXML_AVAILABLE = lxml_html is not None
+
+logger = logging.getLogger(__name__)
+
+
+def _has_class(name):
+    """Predikat XPath yang setara dengan pencocokan class_ pada BeautifulSoup."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if LXML_AVAILABLE:
+    # Selector dikompilasi sekali saat modul dimuat, bukan per kartu
+    CARDS_XPATH = etree.XPath(f"//div[{_has_class('collection-card')}]")
+    NEXT_XPATH = etree.XPath(f"//li[{_has_class('next')}]")
+    TITLE_XPATH = etree.XPath(f".//h3[{_has_class('product-title')}]")
+    PRICE_CONTAINER_XPATH = etree.XPath(f".//div[{_has_class('price-container')}]")
+    PRICE_SPAN_XPATH = etree.XPath(f".//span[{_has_class('price')}]")
+    PRICE_P_XPATH = etree.XPath(f".//p[{_has_class('price')}]")
+    P_XPATH = etree.XPath(".//p")
+
+
+def _text(element):
+    """Setara dengan element.text pada BeautifulSoup (tanpa komentar)."""
+    return "".join(element.itertext())
+
+
+def _stripped_text(element):
+    """Setara dengan element.get_text(strip=True) pada BeautifulSoup."""
+    return "".join(part.strip() for part in element.itertext() if part.strip())
+
+
+def _first(xpath, element):
+    result = xpath(element)
+    return result[0] if result else None
+
+
+def extract_product_data_lxml(card):
+    """Ekstraksi data produk dari elemen lxml dengan hasil yang sama persis seperti extract_product_data."""
+    try:
+        product_title = _first(TITLE_XPATH, card)
+        product_title = _text(product_title).strip() if product_title is not None else 'N/A'
+
+        price_container = _first(PRICE_CONTAINER_XPATH, card)
+        if price_container is not None:
+            price_span = _first(PRICE_SPAN_XPATH, price_container)
+            price = _text(price_span).strip() if price_span is not None else 'N/A'
+        else:
+            price_p = _first(PRICE_P_XPATH, card)
+            price = _text(price_p).strip() if price_p is not None else 'N/A'
+
+        rating = colors = size = gender = None
+
+        for p in P_XPATH(card):
+            text = _stripped_text(p)
+            if text.startswith('Rating:'):
+                rating = text.split('Rating:')[1].strip()
+            elif 'Colors' in text:
+                colors = text.split(' ')[0].strip()
+            elif text.startswith('Size:'):
+                size = text.split('Size:')[1].strip()
+            elif text.startswith('Gender:'):
+                gender = text.split('Gender:')[1].strip()
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        return {
+            "Title": product_title,
+            "Price": price,
+            "Rating": rating,
+            "Colors": colors,
+            "Size": size,
+            "Gender": gender,
+            "Timestamp": timestamp,
+        }
+    except Exception as e:
+        logger.error("[ERROR EXTRACTING PRODUCT] %s", e)
+        return {
+            "Title": "N/A",
+            "Price": "N/A",
+            "Rating": None,
+            "Colors": None,
+            "Size": None,
+            "Gender": None,
+            "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+def decode_html(content):
+    """
+    Mendekode body halaman dengan deteksi encoding yang sama seperti BeautifulSoup.
+
+    Urutannya BOM, charset yang dideklarasikan halaman (<meta charset>), lalu
+    tebakan, sehingga halaman non-UTF-8 menghasilkan teks yang sama di kedua
+    backend parser.
+    """
+    if isinstance(content, str):
+        return content
+    return UnicodeDammit(content, is_html=True).unicode_markup
+
+
+def parse_page_lxml(content):
+    """
+    Parsing satu halaman katalog memakai lxml; hasilnya (produk, ada_halaman_berikutnya).
+
+    Untuk HTML yang valid hasilnya sama persis dengan parse_page_bs4. Pada markup
+    rusak kedua parser bisa membangun pohon berbeda: libxml2 menutup <p> yang
+    tidak ditutup saat bertemu <p> berikutnya (seperti browser), sedangkan
+    "html.parser" menyarangkannya, misal '<p>Size: M<p>Gender: Men</p>' memberi
+    Size 'M' di lxml dan 'MGender: Men' di bs4. Karena itu lxml hanya dipakai
+    bila diminta dengan parser="lxml"; default "auto" tetap BeautifulSoup.
+    """
+    content = decode_html(content)
+    if not content.strip():
+        return [], False
+    try:
+        root = lxml_html.document_fromstring(content)
+    except etree.ParserError:
+        return [], False
+
+    products = [extract_product_data_lxml(card) for card in CARDS_XPATH(root)]
+    has_next = bool(NEXT_XPATH(root))
+    return products, has_next
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP yang menandakan server meminta kita memperlambat request
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Mengubah header Retry-After (detik atau tanggal HTTP) menjadi jumlah detik, None bila tidak valid."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket yang lajunya menyesuaikan kondisi server, aman dipakai bersama antar thread.
+
+    Setiap request mengambil satu token lewat acquire(). Setelah response
+    diterima, record() menaikkan laju sedikit demi sedikit selama server sehat
+    (latensi di bawah target_latency), menurunkannya bila latensi naik, dan
+    memotongnya setengah saat server menjawab 429/503. Header Retry-After
+    menahan semua request hingga waktu yang diminta server.
+
+    Args:
+        rate (float): Laju awal (request per detik); None untuk tanpa batas laju.
+        min_rate (float): Laju minimum, default rate / 10.
+        max_rate (float): Laju maksimum, default rate * 4.
+        burst (int): Jumlah token maksimum yang boleh terkumpul.
+        target_latency (float): Latensi (detik) yang masih dianggap sehat.
+    """
+
+    def __init__(self, rate=None, min_rate=None, max_rate=None, burst=1, target_latency=1.0):
+        self.rate = rate
+        self.min_rate = min_rate or (rate / 10 if rate else None)
+        self.max_rate = max_rate or (rate * 4 if rate else None)
+        self.burst = burst
+        self.target_latency = target_latency
+
+        self.requests = 0
+        self.backoffs = 0
+        self.throttled_seconds = 0.0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._first_request = None
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Menunggu hingga token tersedia dan jeda Retry-After (bila ada) sudah lewat."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def reserve(self):
+        """
+        Mengambil satu token tanpa menunggu dan mengembalikan lama tunggu (detik) sebelum request boleh dikirim.
+
+        Dipakai jalur async yang menunggu dengan asyncio.sleep agar event loop tidak terblokir.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._first_request is None:
+                self._first_request = now
+            self.requests += 1
+
+            ready = now
+            if self.rate:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    ready = now + (1 - self._tokens) / self.rate
+                # Token boleh negatif: slot berikutnya sudah dipesan thread ini
+                self._tokens -= 1
+            ready = max(ready, self._blocked_until)
+            wait = ready - now
+            if wait > 0:
+                self.throttled_seconds += wait
+            return max(wait, 0.0)
+
+    def record(self, latency, status=200, retry_after=None, throttled=False):
+        """
+        Menyesuaikan laju berdasarkan hasil satu request.
+
+        Args:
+            latency (float): Durasi request dalam detik.
+            status (int): Status HTTP akhir.
+            retry_after (float): Detik dari header Retry-After.
+            throttled (bool): Server sempat menjawab 429/503 walau request akhirnya berhasil.
+        """
+        with self._lock:
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+            if throttled or status in THROTTLE_STATUSES:
+                self.backoffs += 1
+                self._set_rate(0.5)
+                logger.warning("Server meminta request diperlambat (status %s), laju menjadi %s req/s.",
+                               status, self._format_rate())
+            elif latency > self.target_latency:
+                self._set_rate(0.8)
+            elif status < 400:
+                self._set_rate(1.1)
+
+    def _set_rate(self, factor):
+        if self.rate:
+            self.rate = min(self.max_rate, max(self.min_rate, self.rate * factor))
+
+    def _format_rate(self):
+        return f"{self.rate:.2f}" if self.rate else "tanpa batas"
+
+    def stats(self):
+        """Statistik laju: request, laju tercapai, waktu tertahan, laju saat ini, dan jumlah backoff."""
+        with self._lock:
+            elapsed = time.monotonic() - self._first_request if self._first_request is not None else 0.0
+            return {
+                "requests": self.requests,
+                "achieved_rps": self.requests / elapsed if elapsed > 0 else 0.0,
+                "throttled_seconds": self.throttled_seconds,
+                "rate": self.rate,
+                "backoffs": self.backoffs,
+            }
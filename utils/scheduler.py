@@ -0,0 +1,234 @@
+import json
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import Metrics, metrics
+
+logger = logging.getLogger(__name__)
+
+# Jumlah thread fetch bersama untuk semua job bila konfigurasi tidak menentukan
+DEFAULT_MAX_WORKERS = 16
+
+# Opsi job beserta nilai default-nya; sink tanpa tujuan (None) tidak dijalankan untuk job tersebut.
+# Kunci upsert dan identitas history tidak memuat nama situs, jadi setiap job
+# butuh tujuan sendiri (lihat job_destinations).
+JOB_DEFAULTS = {
+    'exchange_rate': 16000,
+    'concurrency': 4,
+    'rate': 0.5,
+    'start_delay': None,
+    'db_url': None,
+    'table': 'fashionstudio',
+    'csv_file': None,
+    'parquet_dir': None,
+    'spreadsheet_id': None,
+    'range_name': 'Sheet1!A1',
+    'creds_path': None,
+    'history': False,
+    'state_path': None,
+    'checkpoint_path': None,
+    'archive_dir': None,
+}
+
+SCHEDULER_OPTIONS = ('max_workers', 'stagger', 'defaults', 'jobs')
+
+
+class CatalogJob:
+    """
+    Satu katalog (storefront) yang di-scrape, ditransformasi, dan disimpan oleh scheduler.
+
+    Args:
+        name (str): Nama unik job, dipakai di log, laporan, dan nama file state default.
+        base_url (str): URL halaman pertama katalog.
+        page_url (str): Template URL halaman berikutnya, misal: '.../page{}.html'.
+        exchange_rate (float): Kurs konversi harga ke Rupiah.
+        concurrency (int): Jumlah halaman situs ini yang diambil bersamaan dari pool bersama.
+        rate (float): Laju awal request per detik untuk situs ini, None untuk tanpa batas.
+        start_delay (float): Jeda (detik) sebelum job dimulai; None mengikuti stagger scheduler.
+        db_url, table: Tujuan sink PostgreSQL (upsert) dan history; tanpa db_url sink tersebut dilewati.
+            Job yang memakai db_url sama harus memakai table berbeda.
+        csv_file, parquet_dir, spreadsheet_id, range_name, creds_path: Tujuan sink lainnya.
+        history (bool): Catat juga observasi harga/rating ke tabel history di db_url; tabel history
+            satu database hanya boleh diisi satu job (pakai database atau schema lain untuk situs lain).
+        state_path, checkpoint_path, archive_dir: File state incremental, checkpoint scraping, dan direktori
+            arsip halaman mentah; default per nama job.
+    """
+
+    def __init__(self, name, base_url, page_url, **options):
+        unknown = set(options) - set(JOB_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opsi job {name} tidak dikenal: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.base_url = base_url
+        self.page_url = page_url
+        for option, default in JOB_DEFAULTS.items():
+            setattr(self, option, options.get(option, default))
+        if self.state_path is None:
+            self.state_path = f'.etl_state.{name}.sqlite'
+        if self.checkpoint_path is None:
+            self.checkpoint_path = f'.scrape_checkpoint.{name}.jsonl'
+        if self.archive_dir is None:
+            self.archive_dir = f'page_archive.{name}'
+
+    def __repr__(self):
+        return f"CatalogJob({self.name!r}, {self.base_url!r})"
+
+
+def job_destinations(job):
+    """
+    Tujuan tulis job yang tidak boleh dipakai bersama job lain.
+
+    Kunci upsert (Title, Size, Gender) dan identitas produk di tabel history
+    tidak memuat nama situs, sehingga dua situs yang menjual produk dengan
+    judul, ukuran, dan gender sama akan saling menimpa bila berbagi tabel.
+    """
+    destinations = {
+        'state_path': job.state_path,
+        'checkpoint_path': job.checkpoint_path,
+        'archive_dir': job.archive_dir,
+        'csv_file': job.csv_file,
+        'parquet_dir': job.parquet_dir,
+    }
+    if job.db_url:
+        destinations['table'] = (job.db_url, job.table)
+        if job.history:
+            destinations['history'] = job.db_url
+    if job.spreadsheet_id:
+        destinations['google_sheets'] = (job.spreadsheet_id, job.range_name)
+    return {option: target for option, target in destinations.items() if target is not None}
+
+
+def check_destinations(jobs):
+    """Memastikan tidak ada dua job yang menulis ke tujuan yang sama; ValueError bila ada."""
+    owners = {}
+    for job in jobs:
+        for option, target in job_destinations(job).items():
+            owner = owners.setdefault((option, target), job.name)
+            if owner != job.name:
+                raise ValueError(f"Job {owner} dan {job.name} memakai {option} yang sama: {target}")
+
+
+def load_jobs(path):
+    """
+    Membaca file konfigurasi JSON berisi daftar job katalog.
+
+    Format::
+
+        {
+            "max_workers": 16,
+            "stagger": 2.0,
+            "defaults": {"db_url": "postgresql+psycopg2://...", "exchange_rate": 16000},
+            "jobs": [
+                {"name": "fashion-studio", "base_url": "https://...", "page_url": "https://.../page{}.html",
+                 "table": "fashionstudio", "csv_file": "fashion_data.csv"}
+            ]
+        }
+
+    Opsi pada "defaults" berlaku untuk semua job dan bisa ditimpa per job (lihat CatalogJob).
+    Setiap job harus punya tujuan sink sendiri (lihat check_destinations).
+
+    Returns:
+        tuple: (list CatalogJob, dict berisi max_workers dan stagger untuk run_jobs).
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    unknown = set(config) - set(SCHEDULER_OPTIONS)
+    if unknown:
+        raise ValueError(f"Opsi scheduler tidak dikenal: {', '.join(sorted(unknown))}")
+    defaults = config.get('defaults', {})
+    jobs = [CatalogJob(**{**defaults, **job}) for job in config.get('jobs', [])]
+    if not jobs:
+        raise ValueError(f"Tidak ada job di {path}")
+    names = [job.name for job in jobs]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Nama job ganda: {', '.join(sorted(duplicates))}")
+    check_destinations(jobs)
+
+    options = {
+        'max_workers': config.get('max_workers', DEFAULT_MAX_WORKERS),
+        'stagger': config.get('stagger', 0.0),
+    }
+    return jobs, options
+
+
+def _run_job(job, pipeline, executor, delay, scheduler_start):
+    """Menjalankan satu job di thread koordinatornya setelah jeda mulai; mengembalikan laporan job."""
+    if delay:
+        time.sleep(delay)
+    job_metrics = Metrics()
+    report = {'name': job.name, 'status': 'ok', 'started': time.perf_counter() - scheduler_start,
+              'seconds': 0.0, 'stages': {}, 'values': {}, 'error': None, 'result': None}
+    logger.info("Job %s dimulai (%.2f detik setelah scheduler mulai).", job.name, report['started'])
+
+    start = time.perf_counter()
+    try:
+        report['result'] = pipeline(job, executor, job_metrics)
+        if report['result'] is None:
+            report['status'] = 'failed'
+            report['error'] = 'pipeline mengembalikan None (lihat log error)'
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = str(e)
+        logger.error("Job %s gagal: %s", job.name, e)
+
+    report['seconds'] = time.perf_counter() - start
+    summary = job_metrics.to_dict()
+    report['stages'] = {stage: timing['seconds'] for stage, timing in summary['timings'].items()}
+    report['values'] = summary['values']
+    metrics.add_time(f"job.{job.name}", report['seconds'])
+    return report
+
+
+def run_jobs(jobs, pipeline, max_workers=DEFAULT_MAX_WORKERS, stagger=0.0):
+    """
+    Menjalankan semua job bersamaan dalam satu proses dengan thread pool fetch bersama.
+
+    Setiap job berjalan di thread koordinatornya sendiri dan memanggil
+    pipeline(job, executor, job_metrics). Request halaman semua job dikirim ke
+    executor bersama berukuran max_workers, sedangkan job.concurrency membatasi
+    halaman satu situs yang berjalan bersamaan. Job dimulai bertahap: job ke-i
+    menunggu start_delay-nya, atau i x stagger detik bila start_delay kosong,
+    sehingga tidak semua situs dibuka serentak. Total waktu mengikuti job paling
+    lambat, bukan jumlah waktu semua job.
+
+    job_metrics adalah Metrics milik job itu sendiri; tahap yang diukur dengan
+    job_metrics.timer dan nilai dari job_metrics.set_value masuk ke laporan job.
+    Pipeline yang mengembalikan None atau melempar exception dianggap gagal
+    tanpa menghentikan job lain.
+
+    Returns:
+        list: Satu dict per job (urutan sama dengan jobs) berisi name, status ('ok'/'failed'),
+            started (detik sejak scheduler mulai), seconds, stages, values, error, dan result pipeline.
+    """
+    scheduler_start = time.perf_counter()
+    fetch_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+    coordinators = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="job")
+    try:
+        futures = []
+        for index, job in enumerate(jobs):
+            delay = job.start_delay if job.start_delay is not None else index * stagger
+            futures.append(coordinators.submit(_run_job, job, pipeline, fetch_pool, delay, scheduler_start))
+        return [future.result() for future in futures]
+    finally:
+        coordinators.shutdown(wait=True)
+        fetch_pool.shutdown(wait=True, cancel_futures=True)
+
+
+def log_job_report(reports, wall_seconds=None):
+    """Mencetak durasi setiap job beserta tahapnya, dan perbandingan total waktu dengan jumlah waktu job."""
+    for report in reports:
+        stages = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in report['stages'].items())
+        if report['status'] == 'ok':
+            logger.info("Job %s: ok, mulai +%.2f detik, %.2f detik (%s)",
+                        report['name'], report['started'], report['seconds'], stages or '-')
+        else:
+            logger.error("Job %s: %s setelah %.2f detik - %s",
+                         report['name'], report['status'], report['seconds'], report['error'])
+    if wall_seconds is not None and reports:
+        logger.info("%d job selesai dalam %.2f detik (jumlah durasi job %.2f detik, job terlama %.2f detik)",
+                    len(reports), wall_seconds, sum(report['seconds'] for report in reports),
+                    max(report['seconds'] for report in reports))
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Sink:
+    """
+    Satu tujuan penyimpanan yang dijalankan oleh run_sinks.
+
+    func dipanggil dengan args/kwargs yang diberikan. Loader di utils.load
+    mencatat error lalu mengembalikan None, sehingga hasil None dianggap gagal,
+    sama seperti exception.
+
+    Sink dengan key yang sama (default: name) tidak pernah berjalan tumpang
+    tindih antar panggilan run_sinks; key membedakan tujuan yang sama jenisnya,
+    misal CSV milik job yang berbeda.
+    """
+
+    def __init__(self, name, func, *args, critical=False, timeout=None, key=None, **kwargs):
+        self.name = name
+        self.key = name if key is None else key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.critical = critical
+        self.timeout = timeout
+
+    def __call__(self):
+        return self.func(*self.args, **self.kwargs)
+
+
+# Thread terakhir per key sink, agar tulisan berikutnya menunggu tulisan sebelumnya selesai
+_sink_threads = {}
+_sink_threads_lock = threading.Lock()
+
+
+def _timed_call(sink, future, previous=None):
+    if previous is not None and previous.is_alive():
+        logger.info("Sink %s menunggu penulisan sebelumnya selesai.", sink.name)
+        previous.join()
+    start = time.perf_counter()
+    try:
+        result = sink()
+    except BaseException as e:
+        future.set_exception(e)
+    else:
+        future.set_result((result, time.perf_counter() - start))
+
+
+def run_sinks(sinks):
+    """
+    Menjalankan semua sink secara bersamaan, masing-masing di thread daemon sendiri.
+
+    Kegagalan satu sink tidak menghentikan sink lain. Sink yang melewati
+    timeout-nya ditandai 'timeout'; thread-nya tidak bisa dihentikan paksa,
+    tetapi sebagai thread daemon ia tidak menahan proses keluar (thread pool
+    biasa tetap di-join saat interpreter berhenti). Karena itu sink file menulis
+    ke file sementara lalu os.replace, sehingga thread yang terhenti saat keluar
+    tidak meninggalkan file terpotong.
+
+    Sink yang thread sebelumnya (key sama) masih berjalan, misal chunk --stream
+    sebelumnya yang timeout, baru mulai setelah thread itu selesai; waktu
+    tunggunya ikut dihitung dalam timeout.
+
+    Returns:
+        list: Satu dict per sink berisi name, status ('ok', 'failed', 'timeout'),
+            seconds, critical, dan error.
+    """
+    if not sinks:
+        return []
+
+    start = time.perf_counter()
+    futures = []
+    for sink in sinks:
+        future = Future()
+        with _sink_threads_lock:
+            thread = threading.Thread(target=_timed_call, args=(sink, future, _sink_threads.get(sink.key)),
+                                      name=f"sink-{sink.name}", daemon=True)
+            _sink_threads[sink.key] = thread
+        thread.start()
+        futures.append((sink, future))
+
+    results = []
+    for sink, future in futures:
+        report = {'name': sink.name, 'status': 'ok', 'seconds': 0.0, 'critical': sink.critical, 'error': None}
+        remaining = None
+        if sink.timeout is not None:
+            remaining = max(0.0, sink.timeout - (time.perf_counter() - start))
+        try:
+            value, report['seconds'] = future.result(timeout=remaining)
+            if value is None:
+                report['status'] = 'failed'
+                report['error'] = 'sink mengembalikan None (lihat log error)'
+        except FutureTimeoutError:
+            report['status'] = 'timeout'
+            report['seconds'] = time.perf_counter() - start
+            report['error'] = f'melewati batas {sink.timeout} detik'
+        except Exception as e:
+            report['status'] = 'failed'
+            report['seconds'] = time.perf_counter() - start
+            report['error'] = str(e)
+        metrics.add_time(f"sink.{sink.name}", report['seconds'])
+        results.append(report)
+    return results
+
+
+def log_sink_report(results):
+    """Mencetak status dan durasi setiap sink."""
+    for report in results:
+        if report['status'] == 'ok':
+            logger.info("Sink %s: ok (%.3f detik)", report['name'], report['seconds'])
+        else:
+            log = logger.error if report['critical'] else logger.warning
+            log("Sink %s: %s setelah %.3f detik - %s",
+                report['name'], report['status'], report['seconds'], report['error'])
+
+
+def failed_critical(results):
+    """Nama sink kritis yang tidak berhasil."""
+    return [report['name'] for report in results if report['critical'] and report['status'] != 'ok']
@@ -1,10 +1,35 @@
+import logging
+import numpy as np
 import pandas as pd
 import re
 
-dirty_patterns = {
-    "Title": ["Unknown Product"],
-    "Rating": ["Not Rated"],
-    "Price": ["Price Unavailable", None],
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Regex harus match keseluruhan string yang valid seperti '⭐ 4.5 / 5'
+RATING_PATTERN = re.compile(r'^⭐\s*(\d+(\.\d+)?)\s*/\s*5$')
+COLORS_PATTERN = re.compile(r'(\d+)')
+
+# Aturan pembersihan per kolom, diterapkan transform_data sesuai urutan tabel:
+#   invalid   nilai mentah yang membuat baris dibuang
+#   strip     regex bagian teks yang dihapus (label, simbol mata uang)
+#   pattern   regex pengambil angka dari teks (grup pertama)
+#   numbers   nilai numerik non-teks diterima apa adanya (bersama pattern)
+#   truncate  angka dibulatkan ke arah nol seperti int()
+#   valid     rentang (min, max) atau himpunan nilai yang diterima setelah parsing
+#   empty     hasil parsing (tanpa membedakan huruf besar/kecil) yang dianggap kosong
+#   required  baris yang gagal di-parse atau tidak valid dibuang
+#   currency  hasil parsing dikalikan kurs exchange_rate
+#   dtype     tipe kolom hasil; float/int berarti hasil parsing berupa angka
+CLEANING_RULES = {
+    "Title": {"invalid": ["Unknown Product"], "dtype": "object"},
+    "Rating": {"invalid": ["Not Rated"], "pattern": RATING_PATTERN, "valid": (0, 5), "required": True,
+               "dtype": "float64"},
+    "Price": {"invalid": ["Price Unavailable", None], "strip": r'[$,]', "currency": True, "dtype": "float64"},
+    "Colors": {"pattern": COLORS_PATTERN, "numbers": True, "truncate": True, "required": True, "dtype": "int64"},
+    "Size": {"strip": r'^Size:\s*', "empty": ["", "none"], "required": True, "dtype": "object"},
+    "Gender": {"strip": r'^Gender:\s*', "dtype": "object"},
 }
 
 def transform_to_DataFrame(data):
@@ -13,7 +38,7 @@ def transform_to_DataFrame(data):
         df = pd.DataFrame(data)
         return df
     except Exception as e:
-        print(f"Error saat mengubah data menjadi DataFrame: {e}")
+        logger.error("Error saat mengubah data menjadi DataFrame: %s", e)
         return pd.DataFrame()
 
 def clean_rating(value):
@@ -21,118 +46,289 @@ def clean_rating(value):
         if isinstance(value, str):
             if value in ["Not Rated", "No rating", None]:
                 return None
-            
-            # Regex harus match keseluruhan string yang valid seperti '⭐ 4.5 / 5'
-            pattern = r'^⭐\s*(\d+(\.\d+)?)\s*/\s*5$'
-            match = re.match(pattern, value)
+
+            match = RATING_PATTERN.match(value)
             if match:
                 val = float(match.group(1))
                 if 0 <= val <= 5:
                     return val
         return None
     except Exception as e:
-        print(f"Error saat membersihkan rating '{value}': {e}")
+        logger.error("Error saat membersihkan rating '%s': %s", value, e)
         return None
 
-def transform_data(data, exchange_rate):
-    """Menggabungkan semua transformasi data menjadi satu fungsi dengan error handling."""
-    try:
-        # Menghapus data yang tidak valid
-        for column, invalid_values in dirty_patterns.items():
-            if column in data.columns:
-                data = data[~data[column].isin(invalid_values)]
-            else:
-                print(f"Peringatan: Kolom '{column}' tidak ditemukan di data")
+def map_unique(series, func):
+    """
+    Menerapkan transformasi kolom hanya pada nilai unik lalu memetakannya kembali ke
+    seluruh baris lewat kode hasil pd.factorize.
 
-        data.reset_index(drop=True, inplace=True)
-    except Exception as e:
-        print(f"Error saat menghapus data tidak valid: {e}")
-        return data
+    Operasi .str pandas pada kolom object tetap berjalan per elemen di Python,
+    sehingga untuk kolom berkardinalitas rendah (Rating, Colors, Size, Gender)
+    cara ini jauh lebih cepat. Baris kosong (NaN/None) diproses terpisah agar
+    hasilnya sama persis dengan memanggil func pada seluruh kolom.
+    """
+    codes, uniques = pd.factorize(series)
+    missing = codes < 0
+    if missing.all():
+        return func(series)
 
-    try:
-        # Transformasi Price
-        if 'Price' in data.columns:
-            data['Price'] = data['Price'].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
-            data['Price'] = pd.to_numeric(data['Price'], errors='coerce')  # pakai to_numeric agar bisa handle error parsing
-            data['Price'] = data['Price'] * exchange_rate
-        else:
-            print("Peringatan: Kolom 'Price' tidak ditemukan di data")
-    except Exception as e:
-        print(f"Error saat transformasi Price: {e}")
+    mapped = func(pd.Series(uniques)).to_numpy()
+    result = pd.Series(mapped[np.where(missing, 0, codes)], index=series.index)
+    if missing.any():
+        fill = func(series[missing])
+        if fill.dtype != result.dtype:
+            result = result.astype(object)
+        result[missing] = fill.to_numpy()
+    return result
 
-    try:
-        # Transformasi Rating
-        # if 'Rating' in data.columns:
-        #     data['Rating'] = data['Rating'].apply(clean_rating)
-        #     data = data[data['Rating'].notnull()]
-        if 'Rating' in data.columns:
-            data['Rating'] = data['Rating'].apply(clean_rating)
-            print("Setelah clean_rating dan filtering:")
-            print(data)
-            data = data[data['Rating'].notnull()]
-            print("Setelah filtering rating not null:")
-            print(data)
-        else:
-            print("Peringatan: Kolom 'Rating' tidak ditemukan di data")
-    except Exception as e:
-        print(f"Error saat transformasi Rating: {e}")
 
-    try:
-        # Transformasi kolom 'Colors' menjadi angka saja
-        if 'Colors' in data.columns:
-            def extract_colors(x):
-                try:
-                    if pd.isna(x):
-                        return None
-                    if isinstance(x, (int, float)):
-                        return int(x)
-                    if isinstance(x, str):
-                        match = re.search(r'\d+', x)
-                        if match:
-                            return int(match.group())
-                    return None
-                except Exception as ex:
-                    print(f"Error mengkonversi Colors '{x}': {ex}")
-                    return None
-            data['Colors'] = data['Colors'].apply(extract_colors)
-            data = data[data['Colors'].notna()]
-        else:
-            print("Peringatan: Kolom 'Colors' tidak ditemukan di data")
-    except Exception as e:
-        print(f"Error saat transformasi Colors: {e}")
+def _is_text_series(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
 
-    try:
-        # Transformasi kolom 'Size' menjadi 1 huruf saja
-        if 'Size' in data.columns:
-            data['Size'] = data['Size'].astype(str).str.replace(r'^Size:\s*', '', regex=True)
-            data = data[data['Size'].notna() & (data['Size'] != '') & (data['Size'].str.lower() != 'none')]
+
+class CleaningRule:
+    """
+    Satu entri CLEANING_RULES yang sudah dikompilasi: regex dan himpunan nilai
+    disiapkan sekali saat modul dimuat, bukan setiap kali transform_data dipanggil.
+    """
+
+    def __init__(self, column, invalid=None, strip=None, pattern=None, numbers=False, truncate=False,
+                 valid=None, empty=None, required=False, currency=False, dtype=None):
+        self.column = column
+        self.invalid = list(invalid) if invalid else None
+        self.strip = re.compile(strip) if isinstance(strip, str) else strip
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.numbers = numbers
+        self.truncate = truncate
+        self.valid_range = valid if isinstance(valid, tuple) else None
+        self.valid_set = frozenset(valid) if valid is not None and not isinstance(valid, tuple) else None
+        self.empty = frozenset(value.lower() for value in empty) if empty else None
+        self.required = required
+        self.currency = currency
+        self.dtype = dtype
+        self.numeric = bool(dtype) and dtype.startswith(("float", "int"))
+
+    @property
+    def parses(self):
+        return self.strip is not None or self.pattern is not None
+
+    def invalid_mask(self, series):
+        """Baris dengan nilai mentah yang terdaftar sebagai invalid."""
+        return series.isin(self.invalid).to_numpy()
+
+    def parse(self, series):
+        """Parsing satu kolom; nilai yang gagal di-parse atau di luar valid menjadi NaN."""
+        if self.pattern is not None:
+            if _is_text_series(series):
+                # .str hanya memproses string, nilai non-string otomatis menjadi NaN
+                values = pd.to_numeric(series.str.extract(self.pattern)[0], errors='coerce')
+                if self.numbers:
+                    # Nilai numerik di kolom campuran tidak tersentuh .str sehingga diisi dari to_numeric
+                    values = values.fillna(pd.to_numeric(series.where(values.isna()), errors='coerce'))
+            elif self.numbers:
+                values = pd.to_numeric(series, errors='coerce').astype(float)
+            else:
+                values = pd.Series(np.nan, index=series.index, dtype=float)
         else:
-            print("Peringatan: Kolom 'Size' tidak ditemukan di data")
-    except Exception as e:
-        print(f"Error saat transformasi Size: {e}")
+            values = series.astype(str)
+            if self.strip is not None:
+                values = values.str.replace(self.strip, '', regex=True)
+            if self.numeric:
+                # to_numeric agar teks yang gagal di-parse menjadi NaN, bukan error
+                values = pd.to_numeric(values, errors='coerce')
+
+        if self.truncate:
+            values = np.trunc(values.where(np.isfinite(values)))
+        if self.valid_range is not None:
+            values = values.where(values.between(*self.valid_range))
+        if self.valid_set is not None:
+            values = values.where(values.isin(self.valid_set))
+        return values
+
+    def rejected_mask(self, values):
+        """Baris yang hasil parsingnya kosong atau tidak valid."""
+        rejected = values.isna()
+        if self.empty is not None:
+            rejected |= values.str.lower().isin(self.empty)
+        return rejected.to_numpy()
+
+
+def compile_rules(rules):
+    """Mengompilasi tabel aturan {kolom: opsi} menjadi list CleaningRule sesuai urutan tabel."""
+    return [CleaningRule(column, **options) for column, options in rules.items()]
+
+
+COMPILED_RULES = compile_rules(CLEANING_RULES)
+_RULES_BY_COLUMN = {rule.column: rule for rule in COMPILED_RULES}
 
+
+def clean_rating_series(series):
+    """Versi vektor dari clean_rating untuk satu kolom; nilai tidak valid menjadi NaN."""
+    return _RULES_BY_COLUMN["Rating"].parse(series)
+
+
+def extract_colors_series(series):
+    """
+    Mengambil jumlah warna sebagai angka; string memakai angka pertama di dalamnya,
+    nilai numerik dibulatkan ke arah nol seperti int(). Nilai tidak valid menjadi NaN.
+    """
+    return _RULES_BY_COLUMN["Colors"].parse(series)
+
+
+def _reject(keep, rejected, step):
+    """Menggabungkan mask penolakan satu aturan ke mask validitas dan mencatat jumlah barisnya."""
+    rows_in = int(keep.sum())
+    keep &= ~rejected
+    metrics.record_rows(step, rows_in, int(keep.sum()))
+    return keep
+
+
+@metrics.timed("transform")
+def transform_data(data, exchange_rate, rules=COMPILED_RULES):
+    """
+    Membersihkan data mentah dengan tabel aturan CLEANING_RULES.
+
+    Setiap kolom di-parse sekali (per nilai unik, lihat map_unique) dan semua
+    aturan digabung menjadi satu mask validitas, sehingga baris yang lolos
+    diambil dalam satu langkah tanpa salinan frame di antara aturan. Jumlah
+    baris yang ditolak tiap aturan dicatat ke metrik (invalid_<kolom> untuk
+    nilai invalid, <kolom> untuk hasil parsing yang tidak valid), dihitung
+    berurutan seolah aturan diterapkan satu per satu.
+    """
     try:
-        # Transformasi kolom 'Gender'
-        if 'Gender' in data.columns:
-            data['Gender'] = data['Gender'].astype(str).str.replace(r'^Gender:\s*', '', regex=True)
-        else:
-            print("Peringatan: Kolom 'Gender' tidak ditemukan di data")
+        keep = np.ones(len(data), dtype=bool)
+        present = []
+        for rule in rules:
+            if rule.column in data.columns:
+                present.append(rule)
+            else:
+                logger.warning("Kolom '%s' tidak ditemukan di data", rule.column)
+
+        # Nilai invalid diperiksa lebih dulu untuk semua kolom, lalu hasil parsing
+        for rule in present:
+            if rule.invalid:
+                keep = _reject(keep, rule.invalid_mask(data[rule.column]), f"invalid_{rule.column.lower()}")
+
+        parsed = {}
+        for rule in present:
+            if not rule.parses:
+                continue
+            try:
+                values = map_unique(data[rule.column], rule.parse)
+            except Exception as e:
+                logger.error("Error saat transformasi %s: %s", rule.column, e)
+                continue
+            if rule.required:
+                keep = _reject(keep, rule.rejected_mask(values), rule.column.lower())
+            if rule.currency:
+                values = values * exchange_rate
+            parsed[rule.column] = values
+
+        dtypes = {rule.column: rule.dtype for rule in present if rule.dtype}
+        data = pd.DataFrame({
+            column: parsed.get(column, data[column]).array[keep]
+            for column in data.columns
+        }).astype(dtypes)
     except Exception as e:
-        print(f"Error saat transformasi Gender: {e}")
+        logger.error("Error saat membersihkan data: %s", e)
+        return data
 
     try:
         # Menghapus nilai redundan (duplikat)
+        rows_in = len(data)
         data = data.drop_duplicates(keep='first').reset_index(drop=True)
+        metrics.record_rows("duplicates", rows_in, len(data))
     except Exception as e:
-        print(f"Error saat menghapus duplikat: {e}")
+        logger.error("Error saat menghapus duplikat: %s", e)
+
+    return data
+
 
+# Schema output compact_dtypes; Rating bisa diturunkan ke float32 lewat argumen
+OUTPUT_DTYPES = {
+    "Title": "category",
+    "Price": "float64",
+    "Rating": "float64",
+    "Colors": "Int16",
+    "Size": "category",
+    "Gender": "category",
+    "Timestamp": "datetime64[ns]",
+}
+
+
+def memory_usage(data):
+    """Total memori DataFrame dalam bytes, termasuk isi kolom object."""
+    return int(data.memory_usage(deep=True).sum())
+
+
+def compact_dtypes(data, float32_rating=False):
+    """
+    Mengubah output transform_data ke schema OUTPUT_DTYPES yang hemat memori.
+
+    Title, Size, dan Gender menjadi categorical, Colors menjadi integer nullable
+    16-bit, dan Timestamp di-parse menjadi datetime64. Pemakaian memori sebelum
+    dan sesudah dicatat ke metrik "memory".
+
+    Args:
+        data (pd.DataFrame): Data hasil transform_data.
+        float32_rating (bool): Simpan Rating sebagai float32.
+    """
+    before = memory_usage(data)
     try:
-        # Transformasi Tipe Data
-        if 'Title' in data.columns:
-            data['Title'] = data['Title'].astype(object)
-        if 'Gender' in data.columns:
-            data['Gender'] = data['Gender'].astype(object)
+        with metrics.timer("compact"):
+            dtypes = dict(OUTPUT_DTYPES, Rating="float32" if float32_rating else "float64")
+            data = data.copy()
+            for column, dtype in dtypes.items():
+                if column not in data.columns:
+                    continue
+                if dtype.startswith("datetime"):
+                    data[column] = pd.to_datetime(data[column], errors="coerce")
+                else:
+                    data[column] = data[column].astype(dtype)
     except Exception as e:
-        print(f"Error saat transformasi tipe data: {e}")
+        logger.error("Error saat mengubah tipe data output: %s", e)
+        return data
+
+    after = memory_usage(data)
+    metrics.set_value("memory", {"before_bytes": before, "after_bytes": after})
+    logger.info("Memori DataFrame: %.2f MB -> %.2f MB", before / 1e6, after / 1e6)
+    return data
+
+
+def transform_stream(pages, exchange_rate, chunk_size=1000):
+    """
+    Transformasi bertahap: produk dari generator halaman dikumpulkan per chunk lalu
+    ditransformasi dan dikembalikan satu per satu sebagai DataFrame.
+
+    Baris duplikat dihapus lintas chunk sehingga hasil gabungannya sama dengan
+    transform_data pada seluruh data sekaligus.
+
+    Args:
+        pages (iterable): Iterable berisi daftar produk per halaman.
+        exchange_rate (float): Kurs konversi harga.
+        chunk_size (int): Jumlah minimal produk mentah per chunk.
+    """
+    seen = set()
+    buffer = []
+
+    def flush(products):
+        chunk = transform_data(transform_to_DataFrame(products), exchange_rate)
+        if chunk.empty:
+            return chunk
+        row_hashes = pd.util.hash_pandas_object(chunk, index=False)
+        is_new = ~row_hashes.isin(seen)
+        seen.update(row_hashes[is_new])
+        return chunk[is_new.values].reset_index(drop=True)
+
+    for products in pages:
+        buffer.extend(products)
+        if len(buffer) >= chunk_size:
+            chunk = flush(buffer)
+            buffer = []
+            if not chunk.empty:
+                yield chunk
 
-    return data
\ No newline at end of file
+    if buffer:
+        chunk = flush(buffer)
+        if not chunk.empty:
+            yield chunk